@@ -0,0 +1,46 @@
+"""
+Compare minting capability-style tokens with jwt.encode against a reusable
+jwt.Encoder.
+
+Run from the root of the repository:
+
+    $ python benchmarks/jwt_encode.py
+"""
+from __future__ import print_function
+
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio import jwt  # noqa
+
+KEY = "1c892n40nd03kdnc0112slzkl3091j20"
+
+
+def payload():
+    return {
+        "scope": "scope:client:incoming?clientName=agent42 "
+                 "scope:client:outgoing?appSid=AP123&clientName=agent42",
+        "iss": "AC123",
+        "exp": int(time.time() + 3600),
+    }
+
+
+def main(number=50000):
+    encoder = jwt.Encoder(KEY)
+    assert jwt.decode(encoder.encode(payload()), KEY)["iss"] == "AC123"
+
+    print("%-12s %14s" % ("encoder", "tokens"))
+    for name, encode in [
+        ("jwt.encode", lambda: jwt.encode(payload(), KEY)),
+        ("Encoder", lambda: encoder.encode(payload())),
+    ]:
+        seconds = min(timeit.repeat(encode, number=number, repeat=3))
+        print("%-12s %12.1f/s" % (name, number / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare RequestValidator.validate against the implementation it replaced,
+which rebuilt the HMAC key and the signing string piece by piece for every
+request and compared signatures in Python.
+
+Run from the root of the repository:
+
+    $ python benchmarks/request_validation.py
+"""
+from __future__ import print_function
+
+import base64
+import hmac
+import os
+import sys
+import timeit
+from hashlib import sha1
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio.util import RequestValidator  # noqa
+
+TOKEN = "1c892n40nd03kdnc0112slzkl3091j20"
+URI = "https://example.com/twilio/voice?tenant=42"
+PARAMS = {
+    "AccountSid": "AC9a9f9392lad99kla0sklakjs90j092j3",
+    "ApiVersion": "2010-04-01",
+    "CallSid": "CAd800bb12c0426a7ea4230e492fef2a4f",
+    "CallStatus": "ringing",
+    "Called": "+15306384866",
+    "CalledCity": "OAKLAND",
+    "CalledCountry": "US",
+    "CalledState": "CA",
+    "CalledZip": "94612",
+    "Caller": "+15306666666",
+    "CallerCity": "SOUTH LAKE TAHOE",
+    "CallerCountry": "US",
+    "CallerState": "CA",
+    "CallerZip": "89449",
+    "Direction": "inbound",
+    "From": "+15306666666",
+    "To": "+15306384866",
+}
+
+
+def legacy_validate(uri, params, signature):
+    s = uri
+    if len(params) > 0:
+        for k, v in sorted(params.items()):
+            s += k + v
+    mac = hmac.new(TOKEN.encode("utf-8"), s.encode("utf-8"), sha1)
+    computed = base64.b64encode(mac.digest()).decode("utf-8").strip()
+    if len(computed) != len(signature):
+        return False
+    result = True
+    for c1, c2 in zip(computed, signature):
+        result &= c1 == c2
+    return result
+
+
+def main(number=100000):
+    validator = RequestValidator(TOKEN)
+    rotating = RequestValidator(["0" * 32, TOKEN])
+    signature = validator.compute_signature(URI, PARAMS, utf=True)
+    assert legacy_validate(URI, PARAMS, signature)
+
+    print("%-20s %14s" % ("validator", "requests"))
+    for name, validate in [
+        ("legacy", legacy_validate),
+        ("RequestValidator", validator.validate),
+        ("two tokens", rotating.validate),
+    ]:
+        assert validate(URI, PARAMS, signature)
+        seconds = min(timeit.repeat(
+            lambda: validate(URI, PARAMS, signature),
+            number=number, repeat=3))
+        print("%-20s %12.1f/s" % (name, number / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Measure how many TwiML responses can be built and serialized per second on
+one core.
+
+Run from the root of the repository:
+
+    $ python benchmarks/twiml_build.py
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twiml_serialize import (  # noqa
+    say_response, gather_response, dial_response,
+)
+
+
+def main(number=10000):
+    print("%-10s %14s %14s" % ("response", "build", "build + toxml"))
+    for name, build in [("say", say_response), ("gather", gather_response),
+                        ("dial", dial_response)]:
+        built = min(timeit.repeat(build, number=number, repeat=3))
+        serialized = min(timeit.repeat(lambda: build().tobytes(),
+                                       number=number, repeat=3))
+        print("%-10s %11.1f/s %11.1f/s" % (
+            name, number / built, number / serialized))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare parsing TwiML into Verb objects with twiml.parse against parsing it
+with ElementTree, alone and followed by mapping the elements onto verbs.
+
+Run from the root of the repository:
+
+    $ python benchmarks/twiml_parse.py
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio import twiml  # noqa
+from twiml_serialize import (  # noqa
+    say_response, gather_response, dial_response,
+)
+
+
+def elementtree_parse(source):
+    return ET.fromstring(source)
+
+
+def elementtree_verbs(source):
+    def build(el):
+        cls = twiml.VERBS[el.tag]
+        verb = cls.__new__(cls)
+        twiml.Verb.__init__(verb)
+        verb.attrs.update(el.attrib)
+        if el.text and el.text.strip():
+            verb.body = el.text
+        for child in el:
+            verb.append(build(child))
+        return verb
+    return build(ET.fromstring(source))
+
+
+def main(number=20000):
+    print("%-10s %14s %14s %14s" % ("response", "ElementTree",
+                                    "ET + verbs", "parse"))
+    for name, build in [("say", say_response), ("gather", gather_response),
+                        ("dial", dial_response)]:
+        source = build().tobytes()
+        assert twiml.parse(source).tobytes() == source
+        assert elementtree_verbs(source).tobytes() == source
+
+        rates = []
+        for func in (elementtree_parse, elementtree_verbs, twiml.parse):
+            seconds = min(timeit.repeat(lambda: func(source),
+                                        number=number, repeat=3))
+            rates.append(number / seconds)
+        print("%-10s %11.1f/s %11.1f/s %11.1f/s" % ((name,) + tuple(rates)))
+
+
+if __name__ == "__main__":
+    main()
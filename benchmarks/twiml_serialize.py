@@ -0,0 +1,74 @@
+"""
+Compare serializing TwiML with Verb.toxml against the ElementTree path it
+replaced.
+
+Run from the root of the repository:
+
+    $ python benchmarks/twiml_serialize.py
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio import twiml  # noqa
+
+
+def say_response():
+    r = twiml.Response()
+    r.say("Thanks for calling. Please hold.", voice="alice", language="en")
+    r.play("https://example.com/hold-music.mp3", loop=0)
+    return r
+
+
+def gather_response():
+    r = twiml.Response()
+    with r.gather(action="/menu?step=1&lang=en", numDigits=1,
+                  timeout=5, finishOnKey="#", method="POST") as g:
+        for n, option in enumerate(["sales", "support", "billing",
+                                    "returns", "an operator"]):
+            g.say("For %s, press %d." % (option, n + 1), voice="alice")
+        g.pause(length=1)
+    r.redirect("/menu?repeat=true", method="POST")
+    return r
+
+
+def dial_response():
+    r = twiml.Response()
+    d = r.dial(callerId="+15558675309", record=True, timeout=20,
+               action="/after-dial", hangupOnStar=False)
+    for n in range(10):
+        d.number("+1555000%04d" % n, sendDigits="ww%d" % n)
+    d.client("support-agent")
+    d.sip("sip:agent@example.com")
+    r.say("Sorry, nobody is available. Goodbye.")
+    r.hangup()
+    return r
+
+
+def elementtree_toxml(verb):
+    return ('<?xml version="1.0" encoding="UTF-8"?>' +
+            ET.tostring(verb.xml()).decode("utf-8"))
+
+
+def main(number=20000):
+    print("%-10s %14s %14s %8s" % ("response", "ElementTree", "toxml",
+                                   "speedup"))
+    for name, build in [("say", say_response), ("gather", gather_response),
+                        ("dial", dial_response)]:
+        verb = build()
+        assert elementtree_toxml(verb) == verb.toxml()
+
+        old = min(timeit.repeat(lambda: elementtree_toxml(verb),
+                                number=number, repeat=3))
+        new = min(timeit.repeat(verb.toxml, number=number, repeat=3))
+        print("%-10s %11.1f/s %11.1f/s %7.1fx" % (
+            name, number / old, number / new, old / new))
+
+
+if __name__ == "__main__":
+    main()
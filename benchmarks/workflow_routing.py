@@ -0,0 +1,83 @@
+"""
+Measure how many synthetic tasks a WorkflowEvaluator routes per second,
+with target expressions which are resolved up front and with ones that
+depend on each task.
+
+Run from the root of the repository:
+
+    $ python benchmarks/workflow_routing.py
+"""
+from __future__ import print_function
+
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from twilio.task_router.workflow import WorkflowEvaluator  # noqa
+
+LANGUAGES = ["en", "es", "fr", "de"]
+SKILLS = ["billing", "sales", "support", "legal"]
+
+
+def configuration(target_expression):
+    filters = []
+    for language in LANGUAGES:
+        filters.append({
+            "filter_friendly_name": language,
+            "expression": "language == '%s' AND priority > 1" % language,
+            "targets": [
+                {"queue": "WQ" + language, "expression": target_expression},
+                {"queue": "WQ" + language},
+            ],
+        })
+    return json.dumps({
+        "task_routing": {
+            "filters": filters,
+            "default_filter": {"queue": "WQen"},
+        },
+    })
+
+
+def workers(count):
+    rng = random.Random(0)
+    return [{
+        "sid": "WK%d" % i,
+        "available": rng.random() < 0.5,
+        "attributes": json.dumps({
+            "languages": rng.sample(LANGUAGES, 2),
+            "skills": rng.sample(SKILLS, 2),
+            "level": rng.randint(1, 5),
+        }),
+    } for i in range(count)]
+
+
+def tasks(count):
+    rng = random.Random(1)
+    return [{
+        "language": rng.choice(LANGUAGES),
+        "skill": rng.choice(SKILLS),
+        "priority": rng.randint(0, 3),
+    } for _ in range(count)]
+
+
+def main(number=100000, worker_count=200):
+    queues = dict(("WQ" + language, "languages HAS '%s'" % language)
+                  for language in LANGUAGES)
+    sample = tasks(number)
+
+    print("%-14s %14s" % ("targets", "tasks"))
+    for name, expression in [
+        ("static", "level >= 3"),
+        ("per task", "skills HAS task.skill"),
+    ]:
+        evaluator = WorkflowEvaluator(configuration(expression),
+                                      workers(worker_count), queues)
+        evaluator.simulate(sample)
+        print("%-14s %12.1f/s" % (name, evaluator.rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import patch
+from nose.tools import assert_equal, assert_true, raises
+
+from tests.tools import create_mock_json
+from twilio.rest.exceptions import TwilioRestException
+from twilio.rest.resources.lookups.cache import (
+    DEFAULT_TTL,
+    LookupCache,
+    SqliteLookupCache,
+)
+from twilio.rest.resources.lookups.phone_numbers import PhoneNumbers
+
+
+AUTH = ('AC123', 'foobar')
+TIMEOUT = 30
+
+
+class LookupCacheTest(unittest.TestCase):
+
+    def make_cache(self, ttl=None):
+        return LookupCache(ttl)
+
+    def test_get_set(self):
+        cache = self.make_cache()
+        assert_equal(cache.get('+15108675309?'), None)
+        cache.set('+15108675309?', {'phone_number': '+15108675309'})
+        assert_equal(cache.get('+15108675309?'),
+                     {'phone_number': '+15108675309'})
+        assert_equal(len(cache), 1)
+
+    def test_hit_rate(self):
+        cache = self.make_cache()
+        assert_equal(cache.hit_rate, 0.0)
+        cache.set('a', {})
+        cache.get('a')
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        assert_equal(cache.hits, 3)
+        assert_equal(cache.misses, 1)
+        assert_equal(cache.hit_rate, 0.75)
+
+    @patch('twilio.rest.resources.lookups.cache.time')
+    def test_ttl(self, mock_time):
+        cache = self.make_cache(ttl=60)
+        mock_time.time.return_value = 1000
+        cache.set('a', {'phone_number': '+1'})
+        mock_time.time.return_value = 1059
+        assert_equal(cache.get('a'), {'phone_number': '+1'})
+        mock_time.time.return_value = 1060
+        assert_equal(cache.get('a'), None)
+
+    def test_clear(self):
+        cache = self.make_cache()
+        cache.set('a', {})
+        cache.clear()
+        assert_equal(cache.get('a'), None)
+        assert_equal(len(cache), 0)
+
+
+class LookupCacheDefaultsTest(unittest.TestCase):
+
+    @patch('twilio.rest.resources.lookups.cache.time')
+    def test_default_ttl(self, mock_time):
+        cache = LookupCache()
+        mock_time.time.return_value = 1000
+        cache.set('a', {})
+        mock_time.time.return_value = 1000 + DEFAULT_TTL
+        assert_equal(cache.get('a'), None)
+        assert_equal(len(cache), 0)
+
+    def test_maxsize(self):
+        cache = LookupCache(maxsize=2)
+        cache.set('a', {'n': 1})
+        cache.set('b', {'n': 2})
+        cache.get('a')
+        cache.set('c', {'n': 3})
+        assert_equal(len(cache), 2)
+        assert_equal(cache.get('b'), None)
+        assert_equal(cache.get('a'), {'n': 1})
+
+
+class SqliteLookupCacheTest(LookupCacheTest):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'lookups.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_cache(self, ttl=None):
+        return SqliteLookupCache(self.path, ttl=ttl)
+
+    def test_shared_between_instances(self):
+        self.make_cache().set('a', {'phone_number': '+1'})
+        assert_equal(self.make_cache().get('a'), {'phone_number': '+1'})
+
+    @patch('twilio.rest.resources.lookups.cache.time')
+    def test_purge(self, mock_time):
+        cache = self.make_cache(ttl=60)
+        mock_time.time.return_value = 1000
+        cache.set('a', {})
+        mock_time.time.return_value = 1030
+        cache.set('b', {})
+        mock_time.time.return_value = 1070
+        cache.purge()
+        assert_equal(len(cache), 1)
+        cache.close()
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_uses_cache(request):
+    request.return_value = create_mock_json(
+        "tests/resources/lookups/phone_number_instance.json",
+    )
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT, cache=LookupCache())
+    pn = phone_numbers.get('+15108675309', include_carrier_info=True)
+    assert_equal(pn.carrier['name'], 'verizon')
+    pn = phone_numbers.get('+1 510 867 5309', include_carrier_info=True)
+    assert_equal(pn.carrier['name'], 'verizon')
+
+    assert_equal(request.call_count, 1)
+    assert_equal(phone_numbers.cache.hits, 1)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_many_shares_cache(request):
+    request.return_value = create_mock_json(
+        "tests/resources/lookups/phone_number_instance.json",
+    )
+
+    cache = LookupCache()
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT, cache=cache)
+    list(phone_numbers.get_many(['+15108675309']))
+    phone_numbers.get('+15108675309')
+    assert_equal(request.call_count, 1)
+    assert_true(phone_numbers.cache is cache)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+@raises(TwilioRestException)
+def test_get_cached_not_found(request):
+    request.side_effect = TwilioRestException(404, '/v1/PhoneNumbers/+1')
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT, cache=LookupCache())
+    try:
+        phone_numbers.get('+1')
+    except TwilioRestException:
+        pass
+    request.side_effect = AssertionError("Should have used the cache")
+    phone_numbers.get('+1')
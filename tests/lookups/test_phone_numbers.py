@@ -1,9 +1,16 @@
-from mock import patch
+import json
 
-from nose.tools import assert_equal
+from mock import Mock, patch
+
+from nose.tools import assert_equal, raises
 
 from tests.tools import create_mock_json
-from twilio.rest.resources.lookups.phone_numbers import PhoneNumbers
+from twilio.rest.exceptions import TwilioRestException
+from twilio.rest.resources.lookups.cache import LookupCache
+from twilio.rest.resources.lookups.phone_numbers import (
+    PhoneNumbers,
+    normalize_number,
+)
 
 
 AUTH = ('AC123', 'foobar')
@@ -55,3 +62,91 @@ def test_get_with_country_code(request):
                                auth=AUTH, timeout=TIMEOUT,
                                params={'CountryCode': 'US'},
                                use_json_extension=False)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_many_deduplicates(request):
+    resp = create_mock_json(
+        "tests/resources/lookups/phone_number_instance.json",
+    )
+    request.return_value = resp
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT)
+    numbers = ['+1 510-867-5309', '+15108675309', '+1 (510) 867.5309']
+    results = list(phone_numbers.get_many(numbers, concurrency=2))
+
+    assert_equal(len(results), 3)
+    assert_equal([pn.phone_number for pn in results], ['+15108675309'] * 3)
+    request.assert_called_once_with('GET', '/v1/PhoneNumbers/+15108675309',
+                                    auth=AUTH, timeout=TIMEOUT, params={},
+                                    use_json_extension=False)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_many_caches_across_batches(request):
+    resp = create_mock_json(
+        "tests/resources/lookups/phone_number_instance.json",
+    )
+    request.return_value = resp
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT, cache=LookupCache())
+    list(phone_numbers.get_many(['+15108675309'], include_carrier_info=True))
+    list(phone_numbers.get_many(['+15108675309'], include_carrier_info=True))
+    assert_equal(request.call_count, 1)
+
+    # Different lookup options are cached separately
+    list(phone_numbers.get_many(['+15108675309']))
+    assert_equal(request.call_count, 2)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_many_without_cache_keeps_nothing(request):
+    resp = create_mock_json(
+        "tests/resources/lookups/phone_number_instance.json",
+    )
+    request.return_value = resp
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT)
+    list(phone_numbers.get_many(['+15108675309', '+15108675309']))
+    list(phone_numbers.get_many(['+15108675309']))
+    assert_equal(request.call_count, 2)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_many_preserves_order(request):
+    def respond(method, uri, **kwargs):
+        number = uri.rsplit('/', 1)[1]
+        resp = Mock()
+        resp.content = json.dumps({'phone_number': number})
+        return resp
+
+    request.side_effect = respond
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT)
+    numbers = ['+1%d' % n for n in range(20)] + ['+10', '+15']
+    results = phone_numbers.get_many(numbers, concurrency=4)
+    assert_equal([pn.phone_number for pn in results], numbers)
+    assert_equal(request.call_count, 20)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_get_many_not_found(request):
+    request.side_effect = TwilioRestException(404, '/v1/PhoneNumbers/+1')
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT)
+    assert_equal(list(phone_numbers.get_many(['+1', '+1'])), [None, None])
+    assert_equal(request.call_count, 1)
+
+
+@patch("twilio.rest.resources.base.make_twilio_request")
+@raises(TwilioRestException)
+def test_get_many_error(request):
+    request.side_effect = TwilioRestException(500, '/v1/PhoneNumbers/+1')
+
+    phone_numbers = PhoneNumbers('/v1', AUTH, TIMEOUT)
+    list(phone_numbers.get_many(['+1']))
+
+
+def test_normalize_number():
+    assert_equal(normalize_number(' (510) 867-5309 '), '5108675309')
+    assert_equal(normalize_number('+1 510.867.5309'), '+15108675309')
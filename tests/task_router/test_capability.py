@@ -1,9 +1,11 @@
 import time
 import unittest
 
+from six import u
+
 from twilio import jwt
 
-from twilio.task_router import TaskRouterCapability
+from twilio.task_router import TaskRouterCapability, generate_worker_tokens
 
 
 class TaskRouterCapabilityTest(unittest.TestCase):
@@ -143,3 +145,41 @@ class TaskRouterCapabilityTest(unittest.TestCase):
             'post_filter': {'ReservationStatus': {'required': True}},
         }
         self.assertEqual(expected, decoded['policies'][-1])
+
+
+class GenerateWorkerTokensTest(unittest.TestCase):
+
+    def expected(self, worker_sid, permissions):
+        cap = TaskRouterCapability("AC123", "foobar", "WS456", worker_sid)
+        for permission in permissions:
+            getattr(cap, permission)()
+        payload = jwt.decode(cap.generate_token(ttl=600), "foobar")
+        del payload['exp']
+        return payload
+
+    def check(self, tokens, worker_sids, permissions):
+        self.assertEqual(sorted(tokens), sorted(worker_sids))
+        for worker_sid in worker_sids:
+            payload = jwt.decode(tokens[worker_sid], "foobar")
+            self.assertTrue(payload.pop('exp') >= int(time.time()) + 599)
+            self.assertEqual(payload, self.expected(worker_sid, permissions))
+
+    def test_default_permissions(self):
+        worker_sids = ["WK1", "WK2", "WK3"]
+        tokens = generate_worker_tokens("AC123", "foobar", "WS456",
+                                        iter(worker_sids), ttl=600)
+        self.check(tokens, worker_sids, [])
+
+    def test_all_permissions(self):
+        worker_sids = ["WK%d" % n for n in range(20)] + [u('WK"\xe9')]
+        tokens = generate_worker_tokens("AC123", "foobar", "WS456",
+                                        worker_sids, ttl=600,
+                                        fetch_attributes=True,
+                                        activity_updates=True,
+                                        reservation_updates=True,
+                                        concurrency=4)
+        self.check(tokens, worker_sids, [
+            'allow_worker_fetch_attributes',
+            'allow_worker_activity_updates',
+            'allow_task_reservation_updates',
+        ])
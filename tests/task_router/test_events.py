@@ -1,9 +1,18 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
-from mock import patch
+import pytz
+from six.moves.urllib.parse import parse_qs
+from mock import Mock, patch
+from nose.tools import assert_equal, assert_raises
 
 from tests.tools import create_mock_json
-from twilio.rest.resources.task_router.events import Events
+from twilio.compat import urlparse
+from twilio.rest.resources.task_router.events import EventCheckpoint, Events
 
 
 AUTH = ("AC123", "token")
@@ -35,3 +44,150 @@ class EventTest(unittest.TestCase):
         list_resource.list()
         request.assert_called_with("GET", uri, params={}, auth=AUTH,
                                    use_json_extension=False)
+
+
+class StopTail(Exception):
+    pass
+
+
+def make_page(*events):
+    resp = Mock()
+    resp.status_code = 200
+    resp.content = json.dumps({
+        "meta": {"key": "events", "next_page_url": None},
+        "events": [{"sid": sid, "event_date": date,
+                    "event_type": "worker.activity"}
+                   for sid, date in events],
+    })
+    return resp
+
+
+class EventTailTest(unittest.TestCase):
+
+    def setUp(self):
+        self.events = Events(BASE_URI, AUTH)
+        self.since = datetime.datetime(2015, 2, 7, 0, 30, tzinfo=pytz.utc)
+        self.sleeps = []
+
+    def tail(self, since, polls, **kwargs):
+        """Return the sids of the events yielded over a number of polls"""
+        def sleep(interval):
+            self.sleeps.append(interval)
+            if len(self.sleeps) == polls:
+                raise StopTail()
+
+        sids = []
+        try:
+            for event in self.events.tail(since, sleep=sleep, **kwargs):
+                sids.append(event.sid)
+        except StopTail:
+            pass
+        return sids
+
+    @patch('twilio.rest.resources.base.make_twilio_request')
+    def test_tail(self, request):
+        request.side_effect = [
+            # Newest first, as the API returns them
+            make_page(("EV2", "2015-02-07T00:31:00Z"),
+                      ("EV1", "2015-02-07T00:30:30Z")),
+            make_page(),
+            make_page(("EV3", "2015-02-07T00:32:00Z"),
+                      ("EV2", "2015-02-07T00:31:00Z")),
+            make_page(("EV4", "2015-02-07T00:32:00Z"),
+                      ("EV3", "2015-02-07T00:32:00Z")),
+        ]
+
+        sids = self.tail(self.since, 4, overlap=30, event_type="worker.activity")
+        assert_equal(sids, ["EV1", "EV2", "EV3", "EV4"])
+        assert_equal(self.sleeps, [1, 2, 1, 1])
+
+        params = [parse_qs(urlparse(c[0][1]).query)
+                  for c in request.call_args_list]
+        assert_equal(params[0], {"StartDate": ["2015-02-07T00:29:30Z"],
+                                 "EventType": ["worker.activity"]})
+        assert_equal(params[1]["StartDate"], ["2015-02-07T00:30:30Z"])
+        assert_equal(params[3]["StartDate"], ["2015-02-07T00:31:30Z"])
+
+    @patch('twilio.rest.resources.base.make_twilio_request')
+    def test_checkpoint(self, request):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "events.json")
+
+        request.side_effect = [
+            make_page(("EV2", "2015-02-07T00:31:00Z"),
+                      ("EV1", "2015-02-07T00:30:30Z")),
+            make_page(),
+        ]
+        checkpoint = EventCheckpoint.load(path)
+        checkpoint.since = self.since
+        assert_equal(self.tail(checkpoint, 2), ["EV1", "EV2"])
+
+        self.sleeps = []
+        resumed = EventCheckpoint.load(path)
+        assert_equal(resumed.since,
+                     datetime.datetime(2015, 2, 7, 0, 31, tzinfo=pytz.utc))
+        assert_equal(sorted(resumed.seen), ["EV1", "EV2"])
+
+        request.side_effect = [
+            make_page(("EV3", "2015-02-07T00:31:20Z"),
+                      ("EV2", "2015-02-07T00:31:00Z"),
+                      ("EV1", "2015-02-07T00:30:30Z")),
+        ]
+        assert_equal(self.tail(resumed, 1, overlap=60), ["EV3"])
+        assert_equal(EventCheckpoint.load(path).since,
+                     datetime.datetime(2015, 2, 7, 0, 31, 20, tzinfo=pytz.utc))
+
+    @patch('twilio.rest.resources.base.make_twilio_request')
+    def test_tail_naive_since(self, request):
+        request.side_effect = [
+            make_page(("EV1", "2015-02-07T00:30:30Z")),
+        ]
+        since = self.since.replace(tzinfo=None)
+        assert_equal(self.tail(since, 1), ["EV1"])
+
+        params = parse_qs(urlparse(request.call_args[0][1]).query)
+        assert_equal(params["StartDate"], ["2015-02-07T00:29:30Z"])
+
+    def test_checkpoint_since_in_utc(self):
+        eastern = pytz.timezone("US/Eastern")
+        since = eastern.localize(datetime.datetime(2015, 2, 6, 19, 30))
+        assert_equal(EventCheckpoint(since).since, self.since)
+        assert_equal(EventCheckpoint(self.since.replace(tzinfo=None)).since,
+                     self.since)
+
+    @patch('twilio.rest.resources.base.make_twilio_request')
+    def test_unrecognized_event_date(self, request):
+        request.side_effect = [
+            make_page(("EV1", "Sat, 07 Feb 2015 00:30:30 +0000")),
+        ]
+        assert_raises(ValueError, self.tail, self.since, 1)
+
+    def test_prune(self):
+        checkpoint = EventCheckpoint(self.since, {
+            "EV1": self.since - datetime.timedelta(seconds=31),
+            "EV2": self.since - datetime.timedelta(seconds=30),
+        })
+        checkpoint.prune(30)
+        assert_equal(list(checkpoint.seen), ["EV2"])
+
+    def test_save_twice(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "events.json")
+        rename = os.rename
+
+        def windows_rename(src, dst):
+            if os.path.exists(dst):
+                raise OSError(17, "File exists")
+            rename(src, dst)
+
+        checkpoint = EventCheckpoint(self.since, path=path)
+        with patch.object(os, "replace", None, create=True):
+            with patch.object(os, "rename", windows_rename):
+                checkpoint.save()
+                checkpoint.since += datetime.timedelta(seconds=1)
+                checkpoint.save()
+
+        assert_equal(EventCheckpoint.load(path).since, checkpoint.since)
+        assert_equal(os.listdir(directory), ["events.json"])
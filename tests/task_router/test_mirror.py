@@ -0,0 +1,185 @@
+import json
+import unittest
+
+from mock import Mock
+
+from twilio.rest.exceptions import TwilioRestException
+from twilio.rest.resources.task_router.events import Events
+from twilio.rest.resources.task_router.mirror import (
+    Index,
+    WorkspaceMirror,
+    WORKER_FIELDS,
+)
+from twilio.rest.resources.task_router.tasks import Tasks
+from twilio.rest.resources.task_router.workers import Workers
+
+AUTH = ("AC123", "token")
+BASE_URI = "https://taskrouter.twilio.com/v1/Workspaces/WSaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+WORKERS = Workers(BASE_URI, AUTH, 30)
+TASKS = Tasks(BASE_URI, AUTH, 30)
+EVENTS = Events(BASE_URI, AUTH, 30)
+
+
+def make_worker(sid, activity="Idle", available=True, **attributes):
+    return WORKERS.load_instance({
+        "sid": sid,
+        "activity_sid": "WA" + activity,
+        "activity_name": activity,
+        "available": available,
+        "attributes": json.dumps(attributes),
+    })
+
+
+def make_task(sid, queue="WQ1", status="pending", **attributes):
+    return TASKS.load_instance({
+        "sid": sid,
+        "task_queue_sid": queue,
+        "workflow_sid": "WF1",
+        "assignment_status": status,
+        "attributes": json.dumps(attributes),
+    })
+
+
+def make_event(event_type, resource_type, resource_sid, **data):
+    return EVENTS.load_instance({
+        "sid": "EV" + resource_sid,
+        "event_type": event_type,
+        "resource_type": resource_type,
+        "resource_sid": resource_sid,
+        "event_date": "2015-02-07T00:32:41Z",
+        "event_data": data,
+    })
+
+
+class IndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = Index(WORKER_FIELDS, ["languages", "level"])
+        self.index.add(make_worker("WK1", languages=["en", "es"], level=3))
+        self.index.add(make_worker("WK2", languages=["en"], level=3))
+        self.index.add(make_worker("WK3", "Offline", False,
+                                   languages=["es"], level=1,
+                                   team="support"))
+
+    def sids(self, *args, **kwargs):
+        return sorted(item.sid for item in self.index.find(*args, **kwargs))
+
+    def test_find_fields(self):
+        self.assertEqual(self.sids(available=True), ["WK1", "WK2"])
+        self.assertEqual(self.sids(activity_name="Offline"), ["WK3"])
+        self.assertEqual(self.sids(activity_name="Busy"), [])
+        self.assertEqual(self.sids(), ["WK1", "WK2", "WK3"])
+
+    def test_find_attributes(self):
+        self.assertEqual(self.sids({"languages": "es"}), ["WK1", "WK3"])
+        self.assertEqual(self.sids({"languages": "es"}, available=True),
+                         ["WK1"])
+        self.assertEqual(self.sids({"level": 3, "languages": "en"}),
+                         ["WK1", "WK2"])
+
+    def test_find_unindexed(self):
+        self.assertEqual(self.sids({"team": "support"}), ["WK3"])
+        self.assertEqual(self.sids(friendly_name=None, available=False),
+                         ["WK3"])
+
+    def test_replace_and_remove(self):
+        self.index.add(make_worker("WK1", "Busy", False, languages=["fr"]))
+        self.assertEqual(self.sids({"languages": "es"}), ["WK3"])
+        self.assertEqual(self.sids(activity_name="Busy"), ["WK1"])
+
+        self.index.remove("WK1")
+        self.index.remove("WK9")
+        self.assertEqual(self.sids(activity_name="Busy"), [])
+        self.assertEqual(self.index.get("WK1"), None)
+        self.assertEqual(len(self.index), 2)
+        self.assertFalse(("field", "activity_name", "Busy") in
+                         self.index.index)
+
+    def test_unhashable_attributes(self):
+        self.index.add(make_worker("WK4", level={"nested": True}))
+        self.assertEqual(self.sids({"level": {"nested": True}}), ["WK4"])
+        self.assertEqual(self.index.count(available=True), 3)
+
+
+class WorkspaceMirrorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workers = Mock()
+        self.workers.iter.return_value = [
+            make_worker("WK1", languages=["es"]),
+            make_worker("WK2", "Offline", False, languages=["en"]),
+        ]
+        self.tasks = Mock()
+        self.tasks.iter.return_value = [
+            make_task("WT1", "WQ1"),
+            make_task("WT2", "WQ2", "assigned", type="call"),
+        ]
+        self.events = Mock()
+        self.mirror = WorkspaceMirror(self.workers, self.tasks, self.events,
+                                      worker_attributes=["languages"],
+                                      concurrency=1)
+        self.mirror.sync()
+
+    def worker_sids(self, *args, **kwargs):
+        return sorted(w.sid for w in self.mirror.find_workers(*args, **kwargs))
+
+    def task_sids(self, *args, **kwargs):
+        return sorted(t.sid for t in self.mirror.find_tasks(*args, **kwargs))
+
+    def test_sync(self):
+        self.assertEqual(self.worker_sids(available=True,
+                                          attributes={"languages": "es"}),
+                         ["WK1"])
+        self.assertEqual(self.task_sids(task_queue_sid="WQ2"), ["WT2"])
+        self.assertEqual(self.task_sids(attributes={"type": "call"}),
+                         ["WT2"])
+        self.assertEqual(self.mirror.worker("WK2").activity_name, "Offline")
+        self.assertEqual(self.mirror.task("WT9"), None)
+        self.assertTrue(self.mirror.checkpoint.since is not None)
+
+    def test_apply_worker_event(self):
+        self.workers.get.return_value = make_worker("WK2", "Idle", True,
+                                                    languages=["en"])
+        self.mirror.apply(make_event("worker.activity", "worker", "WK2"))
+
+        self.workers.get.assert_called_with("WK2")
+        self.assertEqual(self.worker_sids(available=True), ["WK1", "WK2"])
+
+    def test_apply_reservation_event(self):
+        self.workers.get.return_value = make_worker("WK1", "Busy", False)
+        self.tasks.get.return_value = make_task("WT1", "WQ1", "assigned")
+        self.mirror.apply(make_event("reservation.accepted", "reservation",
+                                     "WR1", worker_sid="WK1",
+                                     task_sid="WT1"))
+
+        self.assertEqual(self.worker_sids(activity_name="Busy"), ["WK1"])
+        self.assertEqual(self.task_sids(assignment_status="assigned"),
+                         ["WT1", "WT2"])
+
+    def test_apply_deleted_event(self):
+        self.mirror.apply(make_event("task.deleted", "task", "WT1"))
+
+        self.assertFalse(self.tasks.get.called)
+        self.assertEqual(self.task_sids(), ["WT2"])
+
+    def test_refresh_missing(self):
+        self.workers.get.side_effect = TwilioRestException(404, "uri")
+        self.mirror.refresh(worker_sids=["WK1"])
+        self.assertEqual(self.worker_sids(), ["WK2"])
+
+        self.workers.get.side_effect = TwilioRestException(500, "uri")
+        self.assertRaises(TwilioRestException, self.mirror.refresh, ["WK2"])
+        self.assertEqual(self.worker_sids(), ["WK2"])
+
+    def test_follow(self):
+        self.events.tail.return_value = iter([
+            make_event("task.deleted", "task", "WT2"),
+        ])
+
+        events = list(self.mirror.follow(min_interval=2))
+
+        self.assertEqual(len(events), 1)
+        self.events.tail.assert_called_with(self.mirror.checkpoint,
+                                            min_interval=2)
+        self.assertEqual(self.task_sids(), ["WT1"])
@@ -1,6 +1,14 @@
+import time
+import unittest
+
 from mock import patch
 from tests.tools import create_mock_json
 
+from twilio.rest.exceptions import TwilioRestException
+from twilio.rest.resources.task_router.statistics import (
+    StatisticsCollector,
+    TimeSeries,
+)
 from twilio.rest.resources.task_router.workers import Workers, Worker
 from twilio.rest.resources.task_router.task_queues import TaskQueues, TaskQueue
 from twilio.rest.resources.task_router.workflows import Workflows, Workflow
@@ -87,3 +95,163 @@ def test_fetch_task_workflow_statistics(request):
     request.assert_called_with('GET',
                                '{0}/Workflows/WF123/Statistics'.format(BASE_URI),
                                params={}, auth=AUTH, use_json_extension=False)
+
+
+def statistics_response(method, uri, **kwargs):
+    if uri.endswith('/Workers/Statistics'):
+        path = 'workers_statistics_instance.json'
+    elif uri.endswith('/TaskQueues/Statistics'):
+        path = 'task_queues_statistics_list.json'
+    else:
+        path = 'task_queues_statistics_instance.json'
+    resp = create_mock_json('tests/resources/task_router/' + path)
+    resp.status_code = 200
+    return resp
+
+
+class TimeSeriesTest(unittest.TestCase):
+
+    def test_empty(self):
+        series = TimeSeries(3)
+        self.assertEqual(len(series), 0)
+        self.assertEqual(series.latest(), None)
+        self.assertEqual(series.samples(), [])
+        self.assertEqual(series.aggregate(), None)
+
+    def test_wraps_around(self):
+        series = TimeSeries(3)
+        for i in range(5):
+            series.append(i, i * 10)
+
+        self.assertEqual(len(series), 3)
+        self.assertEqual(series.latest(), (4, 40))
+        self.assertEqual(series.samples(), [(2, 20), (3, 30), (4, 40)])
+        self.assertEqual(series.samples(since=3), [(3, 30), (4, 40)])
+
+    def test_aggregate(self):
+        series = TimeSeries(10)
+        for i, value in enumerate([4, 1, 7]):
+            series.append(i, value)
+
+        self.assertEqual(series.aggregate(),
+                         {"count": 3, "min": 1, "max": 7, "mean": 4.0})
+        self.assertEqual(series.aggregate(since=1),
+                         {"count": 2, "min": 1, "max": 7, "mean": 4.0})
+
+
+class StatisticsCollectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workers = Workers(BASE_URI, AUTH, TIMEOUT)
+        self.task_queues = TaskQueues(BASE_URI, AUTH, TIMEOUT)
+
+    @patch("twilio.rest.resources.base.make_twilio_request")
+    def test_poll_list(self, request):
+        request.side_effect = statistics_response
+
+        collector = StatisticsCollector(self.workers, self.task_queues,
+                                        concurrency=1, minutes=60)
+        collector.poll(now=100)
+
+        uris = sorted(call[0][1] for call in request.call_args_list)
+        self.assertEqual(uris, [
+            '{0}/TaskQueues/Statistics'.format(BASE_URI),
+            '{0}/Workers/Statistics'.format(BASE_URI),
+        ])
+        for call in request.call_args_list:
+            self.assertEqual(call[1]['params'], {'Minutes': 60})
+
+        self.assertEqual(
+            collector.latest("workers.cumulative.reservations_accepted"), 0)
+        self.assertEqual(collector.latest(
+            "workers.cumulative.activity_durations."
+            "WA79bcc984ca4fe04a31f2f91807a53ca0.avg"), 0.0)
+        queue_metrics = [name for name in collector.metrics()
+                         if name.endswith(".realtime.total_eligible_workers")]
+        self.assertTrue(queue_metrics)
+        self.assertTrue(all(name.startswith("task_queues.WQ")
+                            for name in queue_metrics))
+        self.assertEqual(collector.polls, 1)
+        self.assertEqual(collector.errors, 0)
+
+    @patch("twilio.rest.resources.base.make_twilio_request")
+    def test_poll_queue_sids(self, request):
+        request.side_effect = statistics_response
+
+        collector = StatisticsCollector(self.workers, self.task_queues,
+                                        queue_sids=["WQ1", "WQ2"],
+                                        concurrency=3)
+        collector.poll(now=100)
+
+        uris = sorted(call[0][1] for call in request.call_args_list)
+        self.assertEqual(uris, [
+            '{0}/TaskQueues/WQ1/Statistics'.format(BASE_URI),
+            '{0}/TaskQueues/WQ2/Statistics'.format(BASE_URI),
+            '{0}/Workers/Statistics'.format(BASE_URI),
+        ])
+        for call in request.call_args_list:
+            self.assertEqual(call[1]['timeout'], TIMEOUT)
+
+        self.assertEqual(
+            collector.latest("task_queues.WQ1.realtime.total_tasks"), 1)
+        self.assertEqual(collector.latest(
+            "task_queues.WQ2.realtime.tasks_by_status.assigned"), 1)
+        self.assertEqual(collector.latest(
+            "task_queues.WQ2.realtime.activity_statistics."
+            "WA7bace730cef6eb1d1e9861874d040f8e.workers"), 1)
+        self.assertEqual(collector.latest("task_queues.WQ3.missing", -1), -1)
+        self.assertEqual(collector.latest("workers.account_sid"), None)
+
+    @patch("twilio.rest.resources.base.make_twilio_request")
+    def test_aggregates(self, request):
+        request.side_effect = statistics_response
+
+        collector = StatisticsCollector(self.workers, self.task_queues,
+                                        queue_sids=["WQ1"], size=2,
+                                        concurrency=1)
+        for now in (100, 105, 110):
+            collector.poll(now=now)
+
+        metric = "task_queues.WQ1.realtime.total_eligible_workers"
+        self.assertEqual(collector.samples(metric), [(105, 3), (110, 3)])
+        self.assertEqual(collector.samples(metric, window=2), [(110, 3)])
+        self.assertEqual(collector.aggregate(metric),
+                         {"count": 2, "min": 3, "max": 3, "mean": 3.0})
+        self.assertEqual(collector.aggregate("missing"), None)
+        self.assertEqual(collector.snapshot()[metric], 3)
+
+    @patch("twilio.rest.resources.base.make_twilio_request")
+    def test_failed_endpoint(self, request):
+        def respond(method, uri, **kwargs):
+            if "WQ2" in uri:
+                raise TwilioRestException(500, uri, "Server error")
+            return statistics_response(method, uri, **kwargs)
+
+        request.side_effect = respond
+
+        collector = StatisticsCollector(self.workers, self.task_queues,
+                                        queue_sids=["WQ1", "WQ2"],
+                                        concurrency=1)
+        collector.poll(now=100)
+
+        self.assertEqual(collector.errors, 1)
+        self.assertTrue(isinstance(collector.last_error, TwilioRestException))
+        self.assertEqual(
+            collector.latest("task_queues.WQ1.realtime.total_tasks"), 1)
+        self.assertEqual(
+            collector.latest("task_queues.WQ2.realtime.total_tasks"), None)
+
+    @patch("twilio.rest.resources.base.make_twilio_request")
+    def test_start_stop(self, request):
+        request.side_effect = statistics_response
+
+        collector = StatisticsCollector(self.workers, self.task_queues,
+                                        interval=60, concurrency=1)
+        collector.start()
+        deadline = time.time() + 5
+        while not collector.polls and time.time() < deadline:
+            time.sleep(0.01)
+        collector.stop()
+
+        self.assertEqual(collector.polls, 1)
+        self.assertEqual(collector.thread, None)
@@ -0,0 +1,198 @@
+import json
+import unittest
+
+from twilio.exceptions import TwilioException
+from twilio.task_router.workflow import (
+    Expression,
+    Route,
+    TASK,
+    WORKER,
+    WorkflowEvaluator,
+)
+from twilio.rest.resources.task_router.task_queues import TaskQueues
+from twilio.rest.resources.task_router.workers import Workers
+
+BASE_URI = "https://taskrouter.twilio.com/v1/Workspaces/WSaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+AUTH = ("AC123", "token")
+
+CONFIGURATION = json.dumps({
+    "task_routing": {
+        "filters": [
+            {
+                "filter_friendly_name": "Spanish",
+                "expression": "language == 'es'",
+                "targets": [
+                    {"queue": "WQspanish", "priority": 5},
+                ],
+            },
+            {
+                "friendly_name": "Gold",
+                "expression": "customer_value == 'gold' AND type IN "
+                              "['call', 'chat']",
+                "targets": [
+                    {"queue": "WQsupport",
+                     "expression": "level >= 3"},
+                    {"queue": "WQsupport"},
+                ],
+            },
+            {
+                "friendly_name": "Skilled",
+                "expression": "skill != null",
+                "targets": [
+                    {"queue": "WQsupport",
+                     "expression": "skills HAS task.skill"},
+                ],
+            },
+        ],
+        "default_filter": {"task_queue_sid": "WQsupport"},
+    },
+})
+
+WORKERS = [
+    {"sid": "WK1", "available": True,
+     "attributes": json.dumps({"languages": ["en", "es"], "level": 3,
+                               "skills": ["billing"]})},
+    {"sid": "WK2", "available": True,
+     "attributes": json.dumps({"languages": ["en"], "level": 1,
+                               "skills": ["sales"]})},
+    {"sid": "WK3", "available": False,
+     "attributes": json.dumps({"languages": ["en"], "level": 5,
+                               "skills": ["sales"]})},
+]
+
+TASK_QUEUES = {
+    "WQspanish": "languages HAS 'es'",
+    "WQsupport": "languages HAS 'en'",
+}
+
+
+def check(expression, task=None, worker=None, scope=TASK):
+    return Expression(expression, scope)((task or {}, worker or {}))
+
+
+class ExpressionTest(unittest.TestCase):
+
+    def test_comparisons(self):
+        task = {"type": "call", "age": 30, "tags": ["vip", "new"],
+                "note": "urgent reply", "nested": {"tier": "gold"}}
+        self.assertTrue(check("type == 'call'", task))
+        self.assertTrue(check('type != "chat"', task))
+        self.assertTrue(check("age > 29 and age >= 30", task))
+        self.assertTrue(check("age < 31 AND age <= 30", task))
+        self.assertTrue(check("type IN ['call', 'sms']", task))
+        self.assertTrue(check("type NOT IN ['chat']", task))
+        self.assertTrue(check("tags HAS 'vip'", task))
+        self.assertTrue(check("note CONTAINS 'urgent'", task))
+        self.assertTrue(check("tags CONTAINS 'new'", task))
+        self.assertTrue(check("nested.tier == 'gold'", task))
+        self.assertTrue(check("age == 30.0", task))
+        self.assertFalse(check("tags HAS 'old'", task))
+
+    def test_logic(self):
+        task = {"a": 1, "b": 2}
+        self.assertTrue(check("a == 2 OR b == 2", task))
+        self.assertFalse(check("a == 1 AND b == 1", task))
+        self.assertTrue(check("NOT (a == 1 AND b == 1)", task))
+        self.assertTrue(check("(a == 2 OR a == 1) AND b == 2", task))
+        self.assertTrue(check("a == 2 OR a == 1 AND b == 2", task))
+
+    def test_constants(self):
+        self.assertTrue(check("1 == 1"))
+        self.assertFalse(check("1 == 2"))
+        self.assertTrue(check("true"))
+        self.assertFalse(check("false"))
+
+    def test_missing_attributes(self):
+        self.assertFalse(check("missing == 'x'"))
+        self.assertFalse(check("missing != 'x'"))
+        self.assertFalse(check("missing > 1"))
+        self.assertFalse(check("missing"))
+        self.assertFalse(check("nested.tier == 'gold'", {"nested": 1}))
+
+    def test_mismatched_types(self):
+        self.assertFalse(check("age > 'old'", {"age": 30}))
+
+    def test_scopes(self):
+        task = {"skill": "billing"}
+        worker = {"skills": ["billing"], "level": 2}
+        expression = Expression("skills HAS task.skill", WORKER)
+        self.assertEqual(expression.scopes, set([TASK, WORKER]))
+        self.assertTrue(expression((task, worker)))
+        self.assertTrue(check("worker.level == 2", task, worker))
+        self.assertEqual(Expression("level > 1", WORKER).scopes,
+                         set([WORKER]))
+
+    def test_invalid(self):
+        for expression in ("", "a ==", "a == 'b", "(a == 1", "a == 1 b",
+                           "a IN [b]", "a NOT 1"):
+            self.assertRaises(TwilioException, Expression, expression)
+
+
+class WorkflowEvaluatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluator = WorkflowEvaluator(CONFIGURATION, WORKERS,
+                                           TASK_QUEUES)
+
+    def test_route(self):
+        route = self.evaluator.route
+        self.assertEqual(route({"language": "es"}),
+                         Route("Spanish", "WQspanish", 5, ["WK1"]))
+        self.assertEqual(route({"customer_value": "gold", "type": "chat"}),
+                         Route("Gold", "WQsupport", None, ["WK1"]))
+        self.assertEqual(route({"skill": "sales"}).workers, ["WK2"])
+        self.assertEqual(route({"skill": "billing"}).workers, ["WK1"])
+        self.assertEqual(route({"type": "sms"}).filter, None)
+        self.assertEqual(sorted(route({"type": "sms"}).workers),
+                         ["WK1", "WK2"])
+
+    def test_route_waits_in_first_target(self):
+        self.assertEqual(self.evaluator.route({"skill": "legal"}),
+                         Route("Skilled", "WQsupport", None, []))
+
+    def test_route_falls_through_targets(self):
+        workers = [dict(WORKERS[1])]
+        evaluator = WorkflowEvaluator(CONFIGURATION, workers, TASK_QUEUES)
+        route = evaluator.route({"customer_value": "gold", "type": "call"})
+        self.assertEqual(route, Route("Gold", "WQsupport", None, ["WK2"]))
+
+    def test_no_default_filter(self):
+        configuration = json.loads(CONFIGURATION)
+        del configuration["task_routing"]["default_filter"]
+        evaluator = WorkflowEvaluator(configuration, WORKERS, TASK_QUEUES)
+        self.assertEqual(evaluator.route({"type": "sms"}), None)
+
+    def test_simulate(self):
+        tasks = [{"language": "es"}, {"language": "es"}, {"skill": "legal"},
+                 {"type": "sms"}]
+        outcomes = self.evaluator.simulate(tasks)
+
+        self.assertEqual(outcomes, {
+            ("Spanish", "WQspanish"): 2,
+            ("Skilled", "WQsupport"): 1,
+            (None, "WQsupport"): 1,
+        })
+        self.assertEqual(self.evaluator.evaluated, 4)
+        self.assertEqual(self.evaluator.unassigned, 1)
+        self.assertTrue(self.evaluator.rate >= 0)
+
+    def test_resources(self):
+        workers = Workers(BASE_URI, AUTH, 30)
+        task_queues = TaskQueues(BASE_URI, AUTH, 30)
+        evaluator = WorkflowEvaluator(
+            CONFIGURATION,
+            [workers.load_instance(worker) for worker in WORKERS],
+            [task_queues.load_instance({"sid": sid, "target_workers": target})
+             for sid, target in TASK_QUEUES.items()],
+        )
+        self.assertEqual(evaluator.route({"language": "es"}).workers,
+                         ["WK1"])
+
+    def test_invalid_configuration(self):
+        self.assertRaises(TwilioException, WorkflowEvaluator, "task-routing:",
+                          WORKERS, TASK_QUEUES)
+        configuration = json.loads(CONFIGURATION)
+        configuration["task_routing"]["default_filter"]["task_queue_sid"] = \
+            "WQmissing"
+        self.assertRaises(TwilioException, WorkflowEvaluator, configuration,
+                          WORKERS, TASK_QUEUES)
@@ -0,0 +1,164 @@
+import sys
+import unittest
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_equal, assert_true
+from six import u
+
+if sys.version_info < (3, 5):
+    raise SkipTest("ASGI middleware needs Python 3.5 or later")
+
+from twilio import twiml  # noqa
+from twilio.asgi import ValidationMiddleware, request_url  # noqa
+from twilio.util import RequestValidator  # noqa
+
+TOKEN = "1c892n40nd03kdnc0112slzkl3091j20"
+
+
+class Result(object):
+    """An awaitable which completes at once with value"""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        raise StopIteration(self.value)
+
+
+def run(awaitable):
+    try:
+        next(awaitable.__await__())
+    except StopIteration as e:
+        return e.value
+    raise AssertionError("awaitable did not complete")
+
+
+def make_scope(path="/voice", query=b"", **headers):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "scheme": "https",
+        "path": path,
+        "root_path": "",
+        "query_string": query,
+        "server": ("localhost", 8000),
+        "headers": [
+            (b"host", b"example.com"),
+            (b"content-type", b"application/x-www-form-urlencoded"),
+        ],
+    }
+    for name, value in headers.items():
+        scope["headers"].append((name.replace("_", "-").encode("ascii"),
+                                 value.encode("ascii")))
+    return scope
+
+
+class RequestUrlTest(unittest.TestCase):
+
+    def test_host(self):
+        scope = make_scope("/voice", b"a=1")
+        assert_equal(request_url(scope, dict(scope["headers"])),
+                     "https://example.com/voice?a=1")
+
+    def test_server(self):
+        scope = make_scope(u("/caf\xe9"))
+        assert_equal(request_url(scope, {}),
+                     "https://localhost:8000/caf%C3%A9")
+
+    def test_path_characters(self):
+        scope = make_scope("/calls/a:b@c;d=e,f+g~h")
+        assert_equal(request_url(scope, {}),
+                     "https://localhost:8000/calls/a:b@c;d=e,f+g~h")
+
+    def test_raw_path(self):
+        scope = make_scope("/a b")
+        scope["raw_path"] = b"/a%20b"
+        assert_equal(request_url(scope, {}, "https://proxy.example.com/"),
+                     "https://proxy.example.com/a%20b")
+
+
+class ValidationMiddlewareTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.result = None
+        self.middleware = ValidationMiddleware(self.app, TOKEN)
+        self.validator = RequestValidator(TOKEN)
+
+    def app(self, scope, receive, send):
+        self.calls.append((scope, run(receive())))
+        return Result(self.result)
+
+    def request(self, scope, chunks, middleware=None):
+        messages = [{"type": "http.request", "body": chunk,
+                     "more_body": i < len(chunks) - 1}
+                    for i, chunk in enumerate(chunks)]
+        messages.append({"type": "http.disconnect"})
+        sent = []
+
+        def receive():
+            return Result(messages.pop(0))
+
+        def send(message):
+            sent.append(message)
+            return Result()
+
+        run((middleware or self.middleware)(scope, receive, send))
+        return sent
+
+    def sign(self, url, params):
+        return self.validator.compute_signature(url, params, utf=True)
+
+    def test_valid(self):
+        params = {"From": "+15555555555", "Body": u("caf\xe9")}
+        scope = make_scope("/voice", b"step=1", x_twilio_signature=self.sign(
+            "https://example.com/voice?step=1", params))
+
+        self.request(scope, [b"From=%2B15555555555", b"&Body=caf%C3%A9"])
+        assert_equal(len(self.calls), 1)
+        app_scope, message = self.calls[0]
+        assert_equal(app_scope["twilio.params"], params)
+        assert_equal(message["body"], b"From=%2B15555555555&Body=caf%C3%A9")
+        assert_true("twilio.params" not in scope)
+
+    def test_twiml_response(self):
+        self.result = twiml.Response()
+        self.result.say("Hello")
+        scope = make_scope(x_twilio_signature=self.sign(
+            "https://example.com/voice", {}))
+
+        start, body = self.request(scope, [b""])
+        assert_equal(start["status"], 200)
+        assert_equal(body["body"], self.result.tobytes())
+
+    def test_invalid(self):
+        scope = make_scope(x_twilio_signature=self.sign(
+            "https://example.com/voice", {"From": "+15555555556"}))
+
+        start, body = self.request(scope, [b"From=%2B15555555555"])
+        assert_equal(start["status"], 403)
+        assert_equal(self.calls, [])
+
+    def test_missing_signature(self):
+        start, body = self.request(make_scope(), [b"From=%2B15555555555"])
+        assert_equal(start["status"], 403)
+        assert_equal(self.calls, [])
+
+    def test_body_too_large(self):
+        middleware = ValidationMiddleware(self.app, self.validator,
+                                          max_body_size=10)
+        start, body = self.request(make_scope(), [b"From=", b"%2B15555555555"],
+                                   middleware)
+        assert_equal(start["status"], 413)
+        assert_equal(self.calls, [])
+
+    def test_other_scopes(self):
+        scope = {"type": "lifespan"}
+        self.request(scope, [])
+        assert_equal(self.calls, [(scope, {"type": "http.disconnect"})])
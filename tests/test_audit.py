@@ -0,0 +1,55 @@
+import unittest
+
+from nose.tools import assert_equal, assert_true
+
+from twilio.audit import SignatureAudit
+from twilio.util import RequestValidator
+
+TOKENS = {
+    "AC123": "1c892n40nd03kdnc0112slzkl3091j20",
+    "AC456": ["new-token", "old-token"],
+}
+
+
+def make_records(count):
+    records = []
+    for n in range(count):
+        account_sid = "AC123" if n % 2 else "AC456"
+        token = "old-token" if account_sid == "AC456" else TOKENS["AC123"]
+        url = "https://example.com/voice?n=%d" % n
+        params = {"AccountSid": account_sid, "CallSid": "CA%d" % n}
+        signature = RequestValidator(token).compute_signature(url, params)
+        records.append((url, params, signature))
+    return records
+
+
+class SignatureAuditTest(unittest.TestCase):
+
+    def setUp(self):
+        self.records = make_records(50)
+        # Tampered, and from an unknown account
+        url, params, signature = self.records[7]
+        self.records[7] = (url, dict(params, CallSid="CA0"), signature)
+        url, params, signature = self.records[30]
+        self.records[30] = (url, dict(params, AccountSid="AC789"), signature)
+
+    def test_serial(self):
+        audit = SignatureAudit(TOKENS, processes=1, chunk_size=8)
+        failures = list(audit.run(iter(self.records)))
+        assert_equal(failures, [self.records[7], self.records[30]])
+        assert_equal(audit.checked, 50)
+        assert_equal(audit.failed, 2)
+        assert_true(audit.rate > 0)
+
+    def test_parallel(self):
+        audit = SignatureAudit(TOKENS, processes=2, chunk_size=4)
+        failures = list(audit.run(iter(self.records)))
+        assert_equal(failures, [self.records[7], self.records[30]])
+        assert_equal(audit.checked, 50)
+
+    def test_single_token(self):
+        records = make_records(10)[1::2]
+        audit = SignatureAudit(TOKENS["AC123"], processes=1)
+        assert_equal(list(audit.run(records)), [])
+        audit = SignatureAudit("other-token", processes=1)
+        assert_equal(len(list(audit.run(records))), 5)
@@ -0,0 +1,75 @@
+import threading
+import unittest
+
+from nose.tools import assert_equal, assert_true, assert_false
+
+from twilio.cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = LRUCache(maxsize=2)
+        assert_equal(cache.get("a"), None)
+        assert_equal(cache.get("a", 1), 1)
+        cache.set("a", 2)
+        assert_equal(cache.get("a"), 2)
+        assert_true("a" in cache)
+        assert_equal(len(cache), 1)
+        assert_equal(cache.hits, 1)
+        assert_equal(cache.misses, 2)
+        assert_equal(cache.hit_rate, 1.0 / 3)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert_false("b" in cache)
+        assert_equal(cache.get("a"), 1)
+        assert_equal(cache.get("c"), 3)
+
+        cache.set("a", 4)
+        cache.set("d", 5)
+        assert_false("c" in cache)
+        assert_equal(cache.get("a"), 4)
+        assert_equal(len(cache), 2)
+
+    def test_pop_and_clear(self):
+        cache = LRUCache(maxsize=3)
+        for n in range(3):
+            cache.set(n, n)
+        assert_equal(cache.pop(1), 1)
+        assert_equal(cache.pop(1, "gone"), "gone")
+        cache.set(3, 3)
+        cache.set(4, 4)
+        assert_false(0 in cache)
+        cache.clear()
+        assert_equal(len(cache), 0)
+        cache.set(5, 5)
+        assert_equal(cache.get(5), 5)
+
+    def test_zero_maxsize(self):
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+        assert_equal(len(cache), 0)
+
+    def test_threads(self):
+        cache = LRUCache(maxsize=50)
+
+        def work(offset):
+            for n in range(1000):
+                key = (n + offset) % 100
+                if cache.get(key) is None:
+                    cache.set(key, key)
+
+        threads = [threading.Thread(target=work, args=(i,))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_equal(len(cache), 50)
+        assert_equal(cache.hits + cache.misses, 4000)
@@ -61,6 +61,49 @@ class RestClientTest(unittest.TestCase):
         request.assert_called_with("GET", uri, headers=ANY, params={}, auth=AUTH)
 
 
+class TaskRouterClientTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TwilioTaskRouterClient("ACCOUNT_SID", "AUTH_TOKEN",
+                                             timeout=sentinel.timeout)
+
+    def test_workspace_resources_are_reused(self):
+        workspace = self.client.workspace("WS123")
+        assert_true(workspace is self.client.workspace("WS123"))
+        assert_true(workspace.workers is self.client.workers("WS123"))
+        assert_true(workspace.tasks is self.client.tasks("WS123"))
+        assert_true(workspace.task_queues is self.client.task_queues("WS123"))
+        assert_true(workspace.activities is self.client.activities("WS123"))
+        assert_true(workspace.workflows is self.client.workflows("WS123"))
+        assert_true(workspace.events is self.client.events("WS123"))
+        assert_true(workspace is not self.client.workspace("WS456"))
+
+    def test_workspace_resources(self):
+        workspace = self.client.workspace("WS123")
+        base_uri = "https://taskrouter.twilio.com/v1/Workspaces/WS123"
+        assert_equal(workspace.workers.uri, base_uri + "/Workers")
+        assert_equal(workspace.workers.statistics.uri,
+                     base_uri + "/Workers/Statistics")
+        assert_equal(workspace.task_queues.uri, base_uri + "/TaskQueues")
+        assert_equal(workspace.workers.timeout, sentinel.timeout)
+        assert_equal(workspace.workers.auth, AUTH)
+
+        reservations = self.client.reservations("WS123", "WT123")
+        assert_true(isinstance(reservations, resources.Reservations))
+        assert_equal(reservations.uri,
+                     base_uri + "/Tasks/WT123/Reservations")
+
+    @patch("twilio.rest.resources.base.make_twilio_request")
+    def test_workspace_requests(self, mock_request):
+        resp = create_mock_json("tests/resources/task_router/workers_instance.json")
+        resp.status_code = 200
+        mock_request.return_value = resp
+        self.client.workspace("WS123").workers.get("WK123")
+        uri = "https://taskrouter.twilio.com/v1/Workspaces/WS123/Workers/WK123"
+        mock_request.assert_called_with("GET", uri, auth=AUTH,
+                                        timeout=sentinel.timeout,
+                                        use_json_extension=False)
+
+
 class RestClientTimeoutTest(unittest.TestCase):
     def setUp(self):
         self.client = TwilioRestClient("ACCOUNT_SID", "AUTH_TOKEN", timeout=sentinel.timeout)
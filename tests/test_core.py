@@ -72,6 +72,17 @@ def test_normalize_dates():
     assert_equal(d["before"], "2009-10-10")
 
 
+def test_normalize_dates_whole_words():
+
+    @normalize_dates
+    def foo(started_after=None, concurrency=None, phone_number=None):
+        return started_after, concurrency, phone_number
+
+    assert_equal(foo(started_after=date(2009, 10, 10), concurrency=4,
+                     phone_number=5108675309),
+                 ("2009-10-10", 4, 5108675309))
+
+
 def test_convert_case():
     assert_equal(convert_case("from_"), "From")
     assert_equal(convert_case("to"), "To")
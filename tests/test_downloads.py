@@ -0,0 +1,237 @@
+from __future__ import with_statement
+import os
+import re
+import shutil
+import ssl
+import tempfile
+import threading
+import unittest
+
+from mock import patch
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from six import BytesIO
+from six.moves import BaseHTTPServer, socketserver
+
+from twilio.rest.exceptions import TwilioRestException
+from twilio.rest.resources import DownloadManager
+from twilio.rest.resources.base import get_cert_file
+from twilio.rest.resources.downloads import (
+    ConnectionPool,
+    VerifiedHTTPSConnection,
+    match_hostname,
+    ssl_context,
+)
+
+AUTH = ("AC123", "token")
+BODY = os.urandom(200 * 1024)
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers.items())))
+
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/audio")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path == "/missing":
+            body = b'{"status": 404}'
+            self.send_response(404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        body = BODY
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes %d-%d/%d" % (
+                start, len(BODY) - 1, len(BODY)))
+            body = body[start:]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if self.path == "/short":
+            # Hang up before sending the whole body
+            self.wfile.write(body[:-100])
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class DownloadManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.requests = []
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={"poll_interval": 0.01})
+        self.thread.daemon = True
+        self.thread.start()
+        self.base = "http://127.0.0.1:%d" % self.server.server_port
+        self.directory = tempfile.mkdtemp()
+        self.manager = DownloadManager(AUTH, concurrency=2, chunk_size=4096)
+
+    def tearDown(self):
+        self.manager.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read(self, name):
+        with open(self.path(name), "rb") as f:
+            return f.read()
+
+    def test_download(self):
+        self.manager.download(self.base + "/audio", self.path("a.wav"))
+        assert_equal(self.read("a.wav"), BODY)
+        assert_false(os.path.exists(self.path("a.wav.part")))
+
+        headers = self.server.requests[0][1]
+        assert_true(headers["Authorization"].startswith("Basic "))
+
+    def test_download_file_object(self):
+        out = BytesIO()
+        self.manager.download(self.base + "/audio", out)
+        assert_equal(out.getvalue(), BODY)
+
+    def test_follows_redirects(self):
+        self.manager.download(self.base + "/redirect", self.path("a.wav"))
+        assert_equal(self.read("a.wav"), BODY)
+        assert_equal([r[0] for r in self.server.requests],
+                     ["/redirect", "/audio"])
+
+    def test_resume(self):
+        with open(self.path("a.wav.part"), "wb") as f:
+            f.write(BODY[:1000])
+
+        self.manager.download(self.base + "/audio", self.path("a.wav"))
+        assert_equal(self.read("a.wav"), BODY)
+        assert_equal(self.server.requests[0][1]["Range"], "bytes=1000-")
+
+    def test_skips_existing(self):
+        with open(self.path("a.wav"), "wb") as f:
+            f.write(b"done")
+
+        self.manager.download(self.base + "/audio", self.path("a.wav"))
+        assert_equal(self.read("a.wav"), b"done")
+        assert_equal(self.server.requests, [])
+
+    def test_overwrite(self):
+        with open(self.path("a.wav"), "wb") as f:
+            f.write(b"old")
+        rename = os.rename
+
+        def windows_rename(src, dst):
+            if os.path.exists(dst):
+                raise OSError(17, "File exists")
+            rename(src, dst)
+
+        with patch.object(os, "replace", None, create=True):
+            with patch.object(os, "rename", windows_rename):
+                self.manager.download(self.base + "/audio",
+                                      self.path("a.wav"), overwrite=True)
+        assert_equal(self.read("a.wav"), BODY)
+        assert_false(os.path.exists(self.path("a.wav.part")))
+
+    def test_verifies_length(self):
+        self.assertRaises(TwilioRestException, self.manager.download,
+                          self.base + "/short", self.path("a.wav"))
+        assert_false(os.path.exists(self.path("a.wav")))
+
+        # The partial download is kept, and resumed next time
+        self.manager.download(self.base + "/audio", self.path("a.wav"))
+        assert_equal(self.read("a.wav"), BODY)
+        assert_equal(self.server.requests[1][1]["Range"],
+                     "bytes=%d-" % (len(BODY) - 100))
+
+    @raises(TwilioRestException)
+    def test_error(self):
+        self.manager.download(self.base + "/missing", self.path("a.wav"))
+
+    def test_download_all_reuses_connections(self):
+        downloads = [(self.base + "/audio", self.path("%d.wav" % i))
+                     for i in range(6)]
+        paths = list(self.manager.download_all(downloads))
+
+        assert_equal(paths, [d[1] for d in downloads])
+        for i in range(6):
+            assert_equal(self.read("%d.wav" % i), BODY)
+        assert_true(sum(len(c) for c in self.manager.pool.idle.values()) <= 2)
+
+
+class VerificationTest(unittest.TestCase):
+
+    def test_context_verifies(self):
+        context = ssl_context()
+        if context is None:
+            raise SkipTest("No ssl.create_default_context")
+        assert_equal(context.verify_mode, ssl.CERT_REQUIRED)
+        assert_true(context.check_hostname)
+
+    def test_connect_uses_context(self):
+        context = ssl_context()
+        if context is None:
+            raise SkipTest("No ssl.create_default_context")
+        connection = ConnectionPool().connect("https", "api.twilio.com")
+        assert_equal(connection._context.verify_mode, ssl.CERT_REQUIRED)
+
+    @patch("twilio.rest.resources.downloads.ssl_context")
+    def test_connect_without_context_verifies(self, ssl_context):
+        ssl_context.return_value = None
+        connection = ConnectionPool().connect("https", "api.twilio.com")
+        assert_true(isinstance(connection, VerifiedHTTPSConnection))
+
+    @patch("twilio.rest.resources.downloads.ssl")
+    @patch("twilio.rest.resources.downloads.socket")
+    def test_verified_connection(self, mock_socket, mock_ssl):
+        mock_ssl.wrap_socket.return_value.getpeercert.return_value = {
+            "subjectAltName": (("DNS", "*.twilio.com"),),
+        }
+        mock_ssl.match_hostname = match_hostname
+        connection = VerifiedHTTPSConnection("api.twilio.com")
+        connection.connect()
+
+        mock_ssl.wrap_socket.assert_called_with(
+            mock_socket.create_connection.return_value,
+            cert_reqs=mock_ssl.CERT_REQUIRED, ca_certs=get_cert_file())
+
+    @patch("twilio.rest.resources.downloads.ssl")
+    @patch("twilio.rest.resources.downloads.socket")
+    def test_verified_connection_wrong_host(self, mock_socket, mock_ssl):
+        mock_ssl.SSLError = ssl.SSLError
+        mock_ssl.wrap_socket.return_value.getpeercert.return_value = {
+            "subject": ((("commonName", "example.com"),),),
+        }
+        mock_ssl.match_hostname = match_hostname
+        connection = VerifiedHTTPSConnection("api.twilio.com")
+        self.assertRaises(ssl.SSLError, connection.connect)
+        assert_true(mock_socket.create_connection.return_value.close.called)
+
+    def test_match_hostname(self):
+        cert = {"subjectAltName": (("DNS", "*.twilio.com"),
+                                   ("DNS", "twilio.com"))}
+        match_hostname(cert, "api.twilio.com")
+        match_hostname(cert, "TWILIO.com")
+        self.assertRaises(ssl.SSLError, match_hostname, cert, "a.b.twilio.com")
+        self.assertRaises(ssl.SSLError, match_hostname, cert, "twilio.com.evil")
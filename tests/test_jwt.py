@@ -1,10 +1,11 @@
 import time
 import unittest
 
+from mock import patch
 from nose.tools import assert_true, assert_equal
 
 from twilio import jwt
-from twilio.util import TwilioCapability
+from twilio.util import CapabilityTokenCache, TwilioCapability
 
 
 class JwtTest(unittest.TestCase):
@@ -115,3 +116,110 @@ class JwtTest(unittest.TestCase):
 
     def test_invalid_crypto_alg(self):
         self.assertRaises(NotImplementedError, jwt.encode, self.payload, "secret", "HS1024")
+
+    def test_encoder(self):
+        encoder = jwt.Encoder("secret")
+        token = encoder.encode(self.payload)
+        self.assertEqual(jwt.decode(token, "secret"), self.payload)
+        self.assertEqual(token.split(".")[0],
+                         jwt.base64url_encode(b'{"typ":"JWT","alg":"HS256"}'))
+        self.assertEqual(encoder.encode(self.payload), token)
+
+    def test_encoder_algorithms(self):
+        for algorithm in ("HS256", "HS384", "HS512"):
+            encoder = jwt.Encoder(b"secret", algorithm)
+            token = encoder.encode(self.payload)
+            self.assertEqual(jwt.decode(token, "secret"), self.payload)
+        self.assertRaises(NotImplementedError, jwt.Encoder, "secret", "HS1024")
+
+    def test_verifier(self):
+        verifier = jwt.Verifier("secret")
+        payload = dict(self.payload, exp=int(time.time()) + 60)
+        token = jwt.encode(payload, "secret")
+        self.assertEqual(verifier.decode(token), payload)
+        self.assertEqual(verifier.decode(token), payload)
+        self.assertEqual(verifier.cache.hits, 1)
+        self.assertEqual(verifier.cache.misses, 1)
+
+        token = jwt.Encoder("secret", "HS512").encode(payload)
+        self.assertEqual(verifier.decode(token), payload)
+
+    def test_verifier_rejects(self):
+        verifier = jwt.Verifier("secret")
+        token = jwt.encode(self.payload, "other")
+        self.assertRaises(jwt.DecodeError, verifier.decode, token)
+        self.assertRaises(jwt.DecodeError, verifier.decode, token)
+        self.assertEqual(len(verifier.cache), 0)
+
+        self.assertRaises(jwt.DecodeError, verifier.decode, "abc")
+        self.assertRaises(jwt.DecodeError, verifier.decode, "a.b.c")
+        header, payload, signature = jwt.encode(self.payload, "secret").split(".")
+        self.assertRaises(jwt.DecodeError, verifier.decode,
+                          ".".join([header, payload[:-2], signature]))
+        none = jwt.base64url_encode(b'{"typ":"JWT","alg":"none"}')
+        self.assertRaises(jwt.DecodeError, verifier.decode,
+                          ".".join([none, payload, ""]))
+
+    def test_verifier_expiry(self):
+        verifier = jwt.Verifier("secret")
+        token = jwt.encode(dict(self.payload, exp=int(time.time()) - 1),
+                           "secret")
+        self.assertRaises(jwt.DecodeError, verifier.decode, token)
+        self.assertEqual(len(verifier.cache), 0)
+
+        verifier = jwt.Verifier("secret", leeway=30)
+        self.assertEqual(verifier.decode(token)["exp"], int(time.time()) - 1)
+
+        token = jwt.encode(dict(self.payload, exp=time.time() + 0.1),
+                           "secret")
+        verifier = jwt.Verifier("secret")
+        verifier.decode(token)
+        time.sleep(0.15)
+        self.assertRaises(jwt.DecodeError, verifier.decode, token)
+
+
+class CapabilityTokenCacheTest(unittest.TestCase):
+
+    def capability(self, client_name="andy", app_sid="AP123"):
+        capability = TwilioCapability("AC123", "XXXXX")
+        capability.allow_client_incoming(client_name)
+        capability.allow_client_outgoing(app_sid, foo="bar")
+        return capability
+
+    def test_reuse(self):
+        cache = CapabilityTokenCache(expires=3600)
+        capability = self.capability()
+        token = cache.generate(capability)
+        assert_equal(cache.generate(capability), token)
+        assert_equal(cache.generate(self.capability()), token)
+        assert_equal(cache.mints, 1)
+        assert_equal(cache.reuses, 2)
+
+        payload = jwt.decode(token, "XXXXX")
+        assert_equal(payload["scope"], self.capability().payload()["scope"])
+        assert_true(payload["exp"] >= int(time.time()) + 3599)
+
+    def test_different_capabilities(self):
+        cache = CapabilityTokenCache()
+        tokens = set([
+            cache.generate(self.capability()),
+            cache.generate(self.capability("bob")),
+            cache.generate(self.capability(app_sid="AP456")),
+            cache.generate(TwilioCapability("AC123", "XXXXX")),
+        ])
+        assert_equal(len(tokens), 4)
+        assert_equal(cache.mints, 4)
+
+    def test_refresh(self):
+        cache = CapabilityTokenCache(expires=3600, refresh=0.5)
+        now = time.time()
+        with patch("time.time") as mock_time:
+            mock_time.return_value = now
+            token = cache.generate(self.capability())
+            mock_time.return_value = now + 1799
+            assert_equal(cache.generate(self.capability()), token)
+            mock_time.return_value = now + 1800
+            refreshed = cache.generate(self.capability())
+
+        assert_equal(cache.mints, 2)
+        assert_equal(jwt.decode(refreshed, "XXXXX")["exp"], int(now + 5400))
@@ -1,10 +1,11 @@
 from datetime import date
 import unittest
 
-from mock import Mock
-from nose.tools import assert_equal
+from mock import Mock, patch
+from nose.tools import assert_equal, assert_true
 
 from twilio.rest.resources import MediaList
+from twilio.rest.resources.media import Media, guess_extension
 
 DEFAULT = {
     'DateCreated<': None,
@@ -41,3 +42,58 @@ class MediaTest(unittest.TestCase):
         base_uri = self.resource.base_uri
         message_media = self.resource('MM123')
         assert_equal(message_media.base_uri, "%s/Messages/%s" % (base_uri, 'MM123'))
+
+    @patch("twilio.rest.resources.media.DownloadManager")
+    def test_download_all(self, manager):
+        media_list = self.resource("MM123")
+        media_list.iter = Mock()
+        media_list.iter.return_value = [
+            self.media(media_list, "ME1", "image/jpeg"),
+            self.media(media_list, "ME2", "video/mp4"),
+        ]
+        downloads = manager.return_value.download_all
+        downloads.side_effect = lambda d: (p for u, p in d)
+
+        paths = list(media_list.download_all("/dest", concurrency=2))
+
+        assert_equal(paths, ["/dest/ME1.jpg", "/dest/ME2.mp4"])
+        manager.assert_called_with(("sid", "token"), 2,
+                                   timeout=media_list.timeout)
+        assert_true(manager.return_value.close.called)
+
+    @patch("twilio.rest.resources.media.DownloadManager")
+    def test_download_all_filters(self, manager):
+        media_list = self.resource("MM123")
+        media_list.request = Mock()
+        media_list.request.return_value = (Mock(), {"media_list": []})
+        manager.return_value.download_all.side_effect = list
+
+        list(media_list.download_all("/dest", after=date(2015, 1, 1),
+                                     before="2015-02-01"))
+
+        media_list.request.assert_called_with(
+            "GET", "foo/Messages/MM123/Media",
+            params={"DateCreated>": "2015-01-01",
+                    "DateCreated<": "2015-02-01"})
+
+    @patch("twilio.rest.resources.media.DownloadManager")
+    def test_stream(self, manager):
+        media = self.media(self.resource("MM123"), "ME1", "image/png")
+        response = manager.return_value.stream.return_value
+        response.iter_content.return_value = iter([b"ab", b"cd"])
+
+        assert_equal(b"".join(media.stream(2)), b"abcd")
+        manager.return_value.stream.assert_called_with(
+            "foo/Messages/MM123/Media/ME1")
+        response.iter_content.assert_called_with(2)
+
+    def media(self, parent, sid, content_type):
+        media = Media(parent, sid)
+        media.load({"sid": sid, "content_type": content_type})
+        return media
+
+
+def test_guess_extension():
+    assert_equal(guess_extension("image/jpeg"), ".jpg")
+    assert_equal(guess_extension("text/plain"), ".txt")
+    assert_equal(guess_extension(None), "")
@@ -4,6 +4,7 @@ import unittest
 
 from mock import Mock
 
+from twilio.rest.exceptions import TwilioRestException
 from twilio.rest.resources import PhoneNumbers
 from twilio.rest.resources import PhoneNumber
 
@@ -128,3 +129,80 @@ class IncomingPhoneNumbersTest(unittest.TestCase):
 
         uri = "http://api.twilio.com/IncomingPhoneNumbers/TollFree"
         request.assert_called_with("GET", uri, params={})
+
+
+class BulkUpdateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = PhoneNumbers("http://api.twilio.com",
+                                     ("user", "pass"))
+        with open("tests/resources/incoming_phone_numbers_list.json") as f:
+            page = json.load(f)
+        self.resource.request = Mock()
+        self.resource.request.return_value = (Mock(), page)
+        self.resource.update_instance = Mock()
+
+    def test_skips_matching_numbers(self):
+        url = "http://voiceforms4000.appspot.com/twiml"
+        self.resource.bulk_update(voice_url=url, concurrency=1)
+
+        calls = self.resource.update_instance.call_args_list
+        self.assertEqual(sorted(c[0][0] for c in calls), [
+            "PN81d4ed70ed59a5733d2c1c1c69a83a28",
+            "PNd2ae06cced59a5733d2c1c1c69a83a28",
+        ])
+        self.resource.update_instance.assert_called_with(
+            "PNd2ae06cced59a5733d2c1c1c69a83a28", {"voice_url": url})
+
+    def test_filters(self):
+        self.resource.bulk_update(filters={"friendly_name": "Demo"},
+                                  voice_url="http://example.com")
+        self.resource.request.assert_called_with(
+            "GET", "http://api.twilio.com/IncomingPhoneNumbers",
+            params={"FriendlyName": "Demo"})
+
+    def test_predicate_and_progress(self):
+        progress = Mock()
+        updated, failed = self.resource.bulk_update(
+            predicate=lambda number: not number.voice_caller_id_lookup,
+            progress=progress,
+            status_callback_url="http://example.com/status",
+        )
+
+        self.assertEqual(len(updated), 2)
+        self.assertEqual(progress.call_count, 2)
+        self.assertEqual(progress.call_args[0][1:], (2, 2))
+        self.resource.update_instance.assert_called_with(
+            "PNd2ae06cced59a5733d2c1c1c69a83a28",
+            {"status_callback": "http://example.com/status"})
+
+    def test_nothing_to_do(self):
+        result = self.resource.bulk_update(
+            predicate=lambda number: number.sms_method == "GET",
+            sms_method="GET",
+        )
+        self.assertEqual(result, ([], []))
+        self.assertFalse(self.resource.update_instance.called)
+
+    def test_failures_are_collected(self):
+        error = TwilioRestException(500, "uri", "Server error")
+
+        def update_instance(sid, changes):
+            if sid == "PN81d4ed70ed59a5733d2c1c1c69a83a28":
+                raise error
+            return sid
+
+        self.resource.update_instance.side_effect = update_instance
+        progress = Mock()
+        updated, failed = self.resource.bulk_update(
+            progress=progress, voice_url="http://example.com", concurrency=2)
+
+        self.assertEqual(sorted(updated), [
+            "PN995e2937ed59a5733d2c1c1c69a83a28",
+            "PNd2ae06cced59a5733d2c1c1c69a83a28",
+        ])
+        self.assertEqual(failed,
+                         [("PN81d4ed70ed59a5733d2c1c1c69a83a28", error)])
+        self.assertEqual(sorted(c[0][0] for c in progress.call_args_list),
+                         sorted(updated))
+        self.assertTrue(all(c[0][2] == 3 for c in progress.call_args_list))
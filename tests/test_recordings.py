@@ -1,4 +1,5 @@
 from datetime import date
+import json
 from mock import patch
 from nose.tools import raises, assert_equals, assert_true
 
@@ -78,3 +79,22 @@ def test_create():
 @raises(AttributeError)
 def test_update():
     recordings.update
+
+
+@patch("twilio.rest.resources.recordings.DownloadManager")
+@patch("twilio.rest.resources.base.make_twilio_request")
+def test_download_all(mock, manager):
+    resp = create_mock_json("tests/resources/recordings_instance.json")
+    resp.content = json.dumps({"recordings": [json.loads(resp.content)]})
+    mock.return_value = resp
+    manager.return_value.download_all.side_effect = lambda d: (p for u, p in d)
+
+    paths = list(recordings.download_all("/archive", format="mp3",
+                                         after=date(2010, 12, 5)))
+
+    uri = "%s/Recordings" % (BASE_URI)
+    mock.assert_called_with("GET", uri, params={'DateCreated>': '2010-12-05'},
+                            auth=AUTH, use_json_extension=True)
+    assert_equals(paths[0], "/archive/%s.mp3" % RE_SID)
+    manager.assert_called_with(AUTH, 4, timeout=recordings.timeout)
+    assert_true(manager.return_value.close.called)
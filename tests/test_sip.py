@@ -0,0 +1,76 @@
+import unittest
+
+from mock import Mock
+from nose.tools import assert_equal
+
+from twilio.rest.resources import Sip
+
+BASE_URI = "https://api.twilio.com/2010-04-01/Accounts/AC123"
+AUTH = ("AC123", "token")
+
+
+def page(key, entries):
+    return Mock(), {key: entries, "next_page_uri": None}
+
+
+class CredentialsSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = Sip(BASE_URI, AUTH, None).credentials("CL123")
+        self.resource.request = Mock()
+        self.resource.request.return_value = page("credentials", [
+            {"sid": "CR1", "username": "alice"},
+            {"sid": "CR2", "username": "bob"},
+        ])
+        self.resource.create_instance = Mock()
+        self.resource.delete_instance = Mock()
+
+    def test_sync(self):
+        created, deleted = self.resource.sync({
+            "alice": "secret",
+            "carol": "password",
+        }, concurrency=1)
+
+        self.resource.create_instance.assert_called_once_with(
+            {"username": "carol", "password": "password"})
+        self.resource.delete_instance.assert_called_once_with("CR2")
+        assert_equal(len(created), 1)
+        assert_equal(deleted, ["CR2"])
+
+    def test_sync_unchanged(self):
+        created, deleted = self.resource.sync({"alice": "x", "bob": "y"})
+        assert_equal((created, deleted), ([], []))
+        self.assertFalse(self.resource.create_instance.called)
+        self.assertFalse(self.resource.delete_instance.called)
+
+
+class IpAddressesSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = Sip(BASE_URI, AUTH, None).ip_addresses("AL123")
+        self.resource.request = Mock()
+        self.resource.request.return_value = page("ip_addresses", [
+            {"sid": "IP1", "ip_address": "10.0.0.1"},
+            {"sid": "IP2", "ip_address": "10.0.0.2"},
+        ])
+        self.resource.create_instance = Mock()
+        self.resource.delete_instance = Mock()
+
+    def test_sync(self):
+        created, deleted = self.resource.sync(
+            ["10.0.0.1", "10.0.0.3", "10.0.0.4"])
+
+        calls = self.resource.create_instance.call_args_list
+        assert_equal(sorted(c[0][0]["ip_address"] for c in calls),
+                     ["10.0.0.3", "10.0.0.4"])
+        self.resource.create_instance.assert_any_call(
+            {"friendly_name": "10.0.0.3", "ip_address": "10.0.0.3"})
+        self.resource.delete_instance.assert_called_once_with("IP2")
+        assert_equal(deleted, ["IP2"])
+
+    def test_sync_friendly_names(self):
+        self.resource.sync({"10.0.0.1": "Office", "10.0.0.2": "Lab",
+                            "10.0.0.9": "Datacenter"}, concurrency=1)
+        self.resource.create_instance.assert_called_once_with(
+            {"friendly_name": "Datacenter", "ip_address": "10.0.0.9"})
+        self.assertFalse(self.resource.delete_instance.called)
@@ -574,3 +574,280 @@ class TestGather(TwilioTest):
         self.assertRaises(TwimlException, verb.append, twiml.Dial())
         self.assertRaises(TwimlException, verb.append, twiml.Conference(""))
         self.assertRaises(TwimlException, verb.append, twiml.Sms(""))
+
+
+class TestSerialize(TwilioTest):
+
+    def elementtree(self, verb):
+        xml = ET.tostring(verb.xml()).decode('utf-8')
+        return '<?xml version="1.0" encoding="UTF-8"?>' + xml
+
+    def testEscaping(self):
+        r = Response()
+        r.say('1 < 2 & "3" > 0', voice='a"b')
+        r.redirect('/next?a=1&b=2')
+        assert_equal(self.strip(r), '<?xml version="1.0" encoding="UTF-8"?><Response><Say voice="a&quot;b">1 &lt; 2 &amp; "3" &gt; 0</Say><Redirect>/next?a=1&amp;b=2</Redirect></Response>')
+
+    def testMatchesElementTree(self):
+        r = Response(foo=u('a\tb\nc\r\xe9'))
+        r.say(u('\u2603 caf\xe9 <&>'), voice="woman", loop=2)
+        with r.gather(action="/menu?a=1&b=2", numDigits=1) as g:
+            g.say("Press 1")
+            g.play("http://example.com/a.mp3")
+            g.pause(length=2)
+        d = r.dial(callerId="+15555555555", record=True, hangupOnStar=False)
+        d.number("+15555555556", sendDigits="ww1")
+        d.client("bob")
+        d.conference("room", beep=False)
+        r.dial("+15555555557, +15555555558")
+        r.message("Hello & goodbye").media("http://example.com/a.png")
+        r.say("")
+        r.hangup()
+        assert_equal(r.toxml(), self.elementtree(r))
+
+
+class TestVerb(TwilioTest):
+
+    def testSlots(self):
+        for cls in twiml.VERBS.values():
+            assert isinstance(cls.nestables, (type(None), frozenset)), cls
+            verb = cls.__new__(cls)
+            twiml.Verb.__init__(verb)
+            self.assertRaises(AttributeError, setattr, verb, "foo", 1)
+
+    def testChoices(self):
+        twiml.Redirect("/next", method="POST")
+        self.assertRaises(TwimlException, twiml.Redirect, "/next",
+                          method="PUT")
+        self.assertRaises(TwimlException, twiml.Conference, "room",
+                          waitMethod="PUT")
+
+    def testSubclassChoices(self):
+        class Custom(twiml.Verb):
+            choices = dict(twiml.Verb.choices, beep=("true", "false"))
+
+        assert_equal(Custom(beep="true").attrs, {"beep": "true"})
+        self.assertRaises(TwimlException, Custom, beep="loud")
+        self.assertRaises(TwimlException, Custom, method="PUT")
+
+    def testSender(self):
+        assert_equal(twiml.Sms("Hi", sender="+15555555555").attrs,
+                     {"from": "+15555555555"})
+
+
+class TestBytes(TwilioTest):
+
+    def response(self):
+        r = Response()
+        r.say(u('Caf\xe9 & <bar>'), voice="alice")
+        with r.gather(action="/menu", numDigits=1) as g:
+            g.say("Press 1")
+            g.pause()
+        r.dial("+15555555555")
+        r.hangup()
+        return r
+
+    def testToBytes(self):
+        r = self.response()
+        assert_equal(r.tobytes(), r.toxml().encode("utf-8"))
+        assert_equal(r.tobytes(xml_declaration=False),
+                     r.toxml(xml_declaration=False).encode("utf-8"))
+
+    def testIterBytes(self):
+        r = self.response()
+        for size in (1, 10, 100, 100000):
+            chunks = list(r.iter_bytes(chunk_size=size))
+            assert_equal(b"".join(chunks), r.tobytes())
+        assert_equal(len(list(r.iter_bytes(chunk_size=100000))), 1)
+        assert_equal(b"".join(r.iter_bytes(xml_declaration=False)),
+                     r.tobytes(xml_declaration=False))
+
+    def testIterBytesEmpty(self):
+        assert_equal(list(Response().iter_bytes()),
+                     [b'<?xml version="1.0" encoding="UTF-8"?><Response />'])
+
+    def testWsgiResponse(self):
+        r = self.response()
+        calls = []
+        body = twiml.wsgi_response(r, lambda *args: calls.append(args))
+        assert_equal(b"".join(body), r.tobytes())
+        assert_equal(calls, [("200 OK", [
+            ("Content-Type", "application/xml; charset=utf-8"),
+            ("Content-Length", str(len(r.tobytes()))),
+        ])])
+
+    def testWsgiResponseStream(self):
+        r = self.response()
+        calls = []
+        body = twiml.wsgi_response(r, lambda *args: calls.append(args),
+                                   stream=True)
+        assert_equal(calls, [("200 OK", [
+            ("Content-Type", "application/xml; charset=utf-8"),
+        ])])
+        assert_equal(b"".join(body), r.tobytes())
+
+    def testAsgiMessages(self):
+        r = self.response()
+        start, body = list(twiml.asgi_messages(r))
+        assert_equal(start["type"], "http.response.start")
+        assert_equal(start["status"], 200)
+        assert_equal(dict(start["headers"])[b"content-length"],
+                     str(len(r.tobytes())).encode("ascii"))
+        assert_equal(body, {"type": "http.response.body",
+                            "body": r.tobytes(), "more_body": False})
+
+    def testAsgiMessagesStream(self):
+        r = self.response()
+        messages = list(twiml.asgi_messages(r, stream=True))
+        assert b"content-length" not in dict(messages[0]["headers"])
+        assert_equal(b"".join(m["body"] for m in messages[1:]), r.tobytes())
+        assert_equal(messages[-1]["more_body"], False)
+
+
+class TestParse(TwilioTest):
+
+    def testRoundTrip(self):
+        r = Response()
+        r.say(u('Caf\xe9 & <bar>'), voice="alice", loop=2)
+        with r.gather(action="/menu?a=1&b=2", numDigits=1) as g:
+            g.say("Press 1")
+            g.pause(length=2)
+        d = r.dial(callerId="+15555555555", record=True)
+        d.number("+15555555556", sendDigits="ww1")
+        d.sip("sip:bob@example.com").uri("sip:alice@example.com")
+        r.message("Hello").media("http://example.com/a.png")
+        r.hangup()
+
+        parsed = twiml.parse(r.tobytes())
+        assert isinstance(parsed, Response)
+        assert isinstance(parsed.verbs[1], twiml.Gather)
+        assert isinstance(parsed.verbs[1].verbs[0], twiml.Say)
+        assert_equal(parsed.toxml(), r.toxml())
+
+    def testParseString(self):
+        r = twiml.parse(u('<Response><Say>Caf\xe9</Say></Response>'))
+        assert_equal(r.verbs[0].body, u('Caf\xe9'))
+
+    def testParseFile(self):
+        from io import BytesIO
+        r = twiml.parse(BytesIO(b'<Response><Hangup /></Response>'))
+        assert isinstance(r.verbs[0], twiml.Hangup)
+
+    def testWhitespace(self):
+        r = twiml.parse(b"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say> Hello </Say>
+    <Pause length="2" />
+</Response>
+""")
+        assert_equal(r.body, None)
+        assert_equal(r.verbs[0].body, " Hello ")
+        assert_equal(r.verbs[1].attrs, {"length": "2"})
+
+    def testModify(self):
+        r = twiml.parse(b'<Response><Dial><Number>+15555555555</Number>'
+                        b'</Dial></Response>')
+        r.verbs[0].verbs[0].body = "+15555555556"
+        r.verbs.insert(0, twiml.Record(maxLength=60))
+        assert_equal(r.toxml(xml_declaration=False),
+                     '<Response><Record maxLength="60" /><Dial>'
+                     '<Number>+15555555556</Number></Dial></Response>')
+
+    def testInvalidNesting(self):
+        self.assertRaises(TwimlException, twiml.parse,
+                          b'<Response><Number>1</Number></Response>')
+        self.assertRaises(TwimlException, twiml.parse,
+                          b'<Response><Gather><Dial /></Gather></Response>')
+
+    def testUnknownElement(self):
+        self.assertRaises(TwimlException, twiml.parse,
+                          b'<Response><Foo /></Response>')
+
+    def testMalformed(self):
+        self.assertRaises(TwimlException, twiml.parse, b'<Response>')
+        self.assertRaises(TwimlException, twiml.parse, b'')
+
+    def testEntityDeclaration(self):
+        self.assertRaises(TwimlException, twiml.parse,
+                          b'<!DOCTYPE r [<!ENTITY a "aaaa">]>'
+                          b'<Response><Say>&a;</Say></Response>')
+
+
+class TestResponseCache(TwilioTest):
+
+    def menu(self, prompt="Press 1", **kwargs):
+        r = Response()
+        with r.gather(action="/menu", numDigits=1, **kwargs) as g:
+            g.say(prompt, voice="alice")
+        return r
+
+    def testCache(self):
+        cache = twiml.ResponseCache(maxsize=2)
+        assert_equal(cache.tobytes(self.menu()), self.menu().tobytes())
+        assert_equal(cache.tobytes(self.menu()), self.menu().tobytes())
+        assert_equal(cache.hits, 1)
+        assert_equal(cache.misses, 1)
+        assert_equal(cache.hit_rate, 0.5)
+        assert_equal(len(cache), 1)
+
+        other = self.menu("Press 2")
+        assert_equal(cache.tobytes(other), other.tobytes())
+        assert_equal(cache.misses, 2)
+
+        cache.clear()
+        assert_equal(len(cache), 0)
+
+    def testXmlDeclaration(self):
+        cache = twiml.ResponseCache(xml_declaration=False)
+        assert_equal(cache.tobytes(self.menu()),
+                     self.menu().tobytes(xml_declaration=False))
+
+    def testStructure(self):
+        assert_equal(self.menu().structure(), self.menu().structure())
+        assert self.menu().structure() != self.menu("Press 2").structure()
+        one = self.menu(timeout=1).structure()
+        assert one != self.menu(timeout=True).structure()
+        assert_equal(self.menu(timeout=5).structure(),
+                     self.menu(timeout="5").structure())
+
+        nested = Response()
+        nested.gather().say("a")
+        flat = Response()
+        flat.gather()
+        flat.say("a")
+        assert nested.structure() != flat.structure()
+
+
+class TestTemplate(TwilioTest):
+
+    def testRender(self):
+        r = Response()
+        r.say(twiml.Slot("greeting"), voice=twiml.Slot("voice"))
+        r.say("Your code is " + twiml.Slot("code") + ".")
+        r.dial(twiml.Slot("number"), callerId="+15555555555")
+        template = twiml.Template(r)
+        assert_equal(template.names, set(["greeting", "voice", "code", "number"]))
+
+        xml = template.render(greeting=u('Caf\xe9 & <bar>'), voice='a"b',
+                              code=1234, number="+15555555556")
+
+        expected = Response()
+        expected.say(u('Caf\xe9 & <bar>'), voice='a"b')
+        expected.say("Your code is 1234.")
+        expected.dial("+15555555556", callerId="+15555555555")
+        assert_equal(xml, expected.toxml().encode('utf-8'))
+
+    def testNoDeclaration(self):
+        r = Response()
+        r.redirect(twiml.Slot("url"))
+        template = twiml.Template(r, xml_declaration=False)
+        assert_equal(template.render(url="/next?a=1&b=2"),
+                     b'<Response><Redirect>/next?a=1&amp;b=2</Redirect></Response>')
+
+    def testMissingValue(self):
+        r = Response()
+        r.say(twiml.Slot("greeting"))
+        self.assertRaises(TwimlException, twiml.Template(r).render)
+
+    def testInvalidName(self):
+        self.assertRaises(TwimlException, twiml.Slot, "not valid")
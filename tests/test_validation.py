@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from nose.tools import assert_equal, assert_true
+from mock import patch
+from nose.tools import assert_equal, assert_false, assert_true
 from six import b, u
 
-from twilio.util import RequestValidator
+from twilio.util import RequestValidator, secure_compare
 
 
 class ValidationTest(unittest.TestCase):
@@ -60,3 +61,46 @@ class ValidationTest(unittest.TestCase):
     def test_validation(self):
         expected = "fF+xx6dTinOaCdZ0aIeNkHr/ZAA="
         assert_true(self.validator.validate(self.uri, self.params, expected))
+
+    def test_validation_bytes(self):
+        expected = b("fF+xx6dTinOaCdZ0aIeNkHr/ZAA=")
+        assert_true(self.validator.validate(self.uri, self.params, expected))
+
+    def test_validation_invalid(self):
+        assert_false(self.validator.validate(self.uri, self.params,
+                                             "fF+xx6dTinOaCdZ0aIeNkHr/ZAB="))
+        assert_false(self.validator.validate(self.uri, {}, ""))
+        assert_false(self.validator.validate(self.uri + "/", self.params,
+                                             "fF+xx6dTinOaCdZ0aIeNkHr/ZAA="))
+        assert_false(self.validator.validate(self.uri, self.params,
+                                             u("fF+xx6dTinOaCdZ0aIeNkHr/ZA\xe9")))
+
+    def test_validation_rotation(self):
+        expected = "fF+xx6dTinOaCdZ0aIeNkHr/ZAA="
+        old = "1c892n40nd03kdnc0112slzkl3091j20"
+        validator = RequestValidator(["new-token", old])
+        assert_true(validator.validate(self.uri, self.params, expected))
+        assert_equal(validator.token, b("new-token"))
+
+        signature = validator.compute_signature(self.uri, self.params)
+        assert_true(signature != expected)
+        assert_true(validator.validate(self.uri, self.params, signature))
+        assert_false(self.validator.validate(self.uri, self.params,
+                                             signature))
+
+    def test_secure_compare(self):
+        assert_true(secure_compare("abc", "abc"))
+        assert_false(secure_compare("abc", "abd"))
+        assert_false(secure_compare("abc", "ab"))
+        assert_true(secure_compare(b("abc"), b("abc")))
+        assert_false(secure_compare(u("ab\xe9"), u("abc")))
+
+    @patch("twilio.jwt.hmac_compare_digest", None)
+    def test_secure_compare_without_hmac(self):
+        # Pythons before 2.7.7 have no hmac.compare_digest
+        assert_true(secure_compare("abc", "abc"))
+        assert_false(secure_compare("abc", "abd"))
+        assert_false(secure_compare("abc", "ab"))
+        assert_true(secure_compare(b("abc"), b("abc")))
+        assert_true(secure_compare(u("ab\xe9"), u("ab\xe9")))
+        assert_false(secure_compare(u("ab\xe9"), u("abc")))
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import unittest
+from io import BytesIO
+
+from nose.tools import assert_equal, assert_true
+from six import u
+
+from twilio.util import RequestValidator
+from twilio.wsgi import ValidationMiddleware, parse_form, request_url
+
+TOKEN = "1c892n40nd03kdnc0112slzkl3091j20"
+
+
+def make_environ(path="/voice", query="", body=b"", **kwargs):
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "HTTP_HOST": "example.com",
+        "CONTENT_TYPE": "application/x-www-form-urlencoded",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.url_scheme": "https",
+        "wsgi.input": BytesIO(body),
+    }
+    environ.update(kwargs)
+    return environ
+
+
+class RequestUrlTest(unittest.TestCase):
+
+    def test_host(self):
+        environ = make_environ("/voice", "a=1&b=2")
+        assert_equal(request_url(environ),
+                     "https://example.com/voice?a=1&b=2")
+
+    def test_server_name(self):
+        environ = make_environ(HTTP_HOST="", SERVER_PORT="443")
+        assert_equal(request_url(environ), "https://localhost/voice")
+        environ = make_environ(HTTP_HOST="")
+        assert_equal(request_url(environ), "https://localhost:8000/voice")
+
+    def test_quoting(self):
+        environ = make_environ("/a b", SCRIPT_NAME="/app")
+        assert_equal(request_url(environ), "https://example.com/app/a%20b")
+
+    def test_quoting_path_characters(self):
+        environ = make_environ("/calls/a:b@c;d=e,f+g~h!$&'()*")
+        assert_equal(request_url(environ),
+                     "https://example.com/calls/a:b@c;d=e,f+g~h!$&'()*")
+
+    def test_raw_uri(self):
+        environ = make_environ("/a b", "x=1", RAW_URI="/a%20b?x=1")
+        assert_equal(request_url(environ), "https://example.com/a%20b?x=1")
+
+    def test_base_url(self):
+        environ = make_environ("/voice", "a=1")
+        assert_equal(request_url(environ, "https://proxy.example.com/app/"),
+                     "https://proxy.example.com/app/voice?a=1")
+
+
+class ParseFormTest(unittest.TestCase):
+
+    def test_parse_form(self):
+        params = parse_form(b"From=%2B15555555555&Body=caf%C3%A9+au+lait&Empty=")
+        assert_equal(params, {
+            "From": "+15555555555",
+            "Body": u("caf\xe9 au lait"),
+            "Empty": "",
+        })
+
+
+class ValidationMiddlewareTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.middleware = ValidationMiddleware(self.app, TOKEN)
+        self.validator = RequestValidator(TOKEN)
+
+    def app(self, environ, start_response):
+        self.calls.append(environ)
+        start_response("200 OK", [("Content-Type", "application/xml")])
+        return [b"<Response />"]
+
+    def request(self, environ, middleware=None):
+        statuses = []
+
+        def start_response(status, headers):
+            statuses.append(status)
+
+        body = (middleware or self.middleware)(environ, start_response)
+        return statuses[0], b"".join(body)
+
+    def sign(self, url, params):
+        return self.validator.compute_signature(url, params, utf=True)
+
+    def test_valid(self):
+        body = b"From=%2B15555555555&Body=caf%C3%A9"
+        params = {"From": "+15555555555", "Body": u("caf\xe9")}
+        environ = make_environ("/voice", "step=1", body)
+        environ["HTTP_X_TWILIO_SIGNATURE"] = self.sign(
+            "https://example.com/voice?step=1", params)
+
+        assert_equal(self.request(environ), ("200 OK", b"<Response />"))
+        assert_equal(len(self.calls), 1)
+        assert_equal(self.calls[0]["twilio.params"], params)
+        assert_equal(self.calls[0]["wsgi.input"].read(), body)
+
+    def test_valid_path_characters(self):
+        # Without REQUEST_URI the URL is rebuilt from PATH_INFO
+        url = "https://example.com/calls/a:b@c;d=e,f+g~h"
+        environ = make_environ("/calls/a:b@c;d=e,f+g~h",
+                               body=b"From=%2B15555555555")
+        environ["HTTP_X_TWILIO_SIGNATURE"] = self.sign(
+            url, {"From": "+15555555555"})
+
+        assert_true("REQUEST_URI" not in environ)
+        assert_equal(self.request(environ)[0], "200 OK")
+
+    def test_get(self):
+        environ = make_environ("/voice", "From=%2B15555555555",
+                               REQUEST_METHOD="GET", CONTENT_TYPE="",
+                               CONTENT_LENGTH="")
+        environ["HTTP_X_TWILIO_SIGNATURE"] = self.sign(
+            "https://example.com/voice?From=%2B15555555555", {})
+
+        assert_equal(self.request(environ)[0], "200 OK")
+        assert_equal(self.calls[0]["twilio.params"], {})
+
+    def test_invalid(self):
+        environ = make_environ("/voice", body=b"From=%2B15555555555")
+        environ["HTTP_X_TWILIO_SIGNATURE"] = self.sign(
+            "https://example.com/voice", {"From": "+15555555556"})
+
+        assert_equal(self.request(environ)[0], "403 Forbidden")
+        assert_equal(self.calls, [])
+
+    def test_missing_signature(self):
+        environ = make_environ("/voice", body=b"From=%2B15555555555")
+        assert_equal(self.request(environ)[0], "403 Forbidden")
+        assert_equal(self.calls, [])
+
+    def test_base_url(self):
+        middleware = ValidationMiddleware(self.app, [TOKEN],
+                                          base_url="https://public.example.com")
+        environ = make_environ("/voice", body=b"From=%2B15555555555")
+        environ["HTTP_X_TWILIO_SIGNATURE"] = self.sign(
+            "https://public.example.com/voice", {"From": "+15555555555"})
+
+        assert_equal(self.request(environ, middleware)[0], "200 OK")
+
+    def test_body_too_large(self):
+        middleware = ValidationMiddleware(self.app, self.validator,
+                                          max_body_size=10)
+        environ = make_environ("/voice", body=b"From=%2B15555555555")
+        status, _ = self.request(environ, middleware)
+        assert_true(status.startswith("413"))
+        assert_equal(self.calls, [])
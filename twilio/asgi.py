@@ -0,0 +1,178 @@
+"""
+ASGI middleware which checks that requests really came from Twilio.
+
+This module needs Python 3.5 or later. It is installed on every version,
+and older ones byte-compile it at install time, so the coroutines are kept
+in :data:`ASYNC_SOURCE` and only compiled when the module is imported.
+"""
+import sys
+
+from six import exec_
+from six.moves.urllib.parse import quote
+
+from .twiml import Verb, asgi_messages
+from .util import RequestValidator
+from .wsgi import (MAX_BODY_SIZE, PARAMS_KEY, PATH_SAFE, is_form,
+                   parse_form)
+
+if sys.version_info < (3, 5):
+    raise ImportError("twilio.asgi needs Python 3.5 or later")
+
+
+def request_url(scope, headers, base_url=None):
+    """
+    Return the URL Twilio requested, from an ASGI HTTP scope.
+
+    :param dict headers: The request headers, as a dict of lowercase bytes
+        names to bytes values
+    :param str base_url: The scheme and host, and optionally a path prefix,
+        to use in place of the ones the server saw. Set this when the
+        application sits behind a proxy which changes them.
+    """
+    raw_path = scope.get("raw_path")
+    if raw_path:
+        path = raw_path.decode("latin-1")
+    else:
+        path = scope.get("root_path", "") + scope["path"]
+        path = quote(path.encode("utf-8"), safe=PATH_SAFE)
+    query = scope.get("query_string")
+    if query:
+        path += "?" + query.decode("latin-1")
+
+    if base_url is not None:
+        return base_url.rstrip("/") + path
+
+    scheme = scope.get("scheme", "http")
+    host = headers.get(b"host", b"").decode("latin-1")
+    if not host and scope.get("server"):
+        host, port = scope["server"]
+        if port is not None and port != {"http": 80, "https": 443}.get(scheme):
+            host = "%s:%s" % (host, port)
+    return "%s://%s%s" % (scheme, host, path)
+
+
+class ValidationMiddleware(object):
+    """
+    ASGI middleware which rejects any HTTP request without a valid
+    ``X-Twilio-Signature`` with a 403, before the application sees it.
+
+    A form body is received once, and the fields are passed to the
+    application as a dict in ``scope["twilio.params"]``. The application
+    can still receive the body itself.
+
+    The application may return a :class:`~twilio.twiml.Verb`, usually a
+    :class:`~twilio.twiml.Response`, instead of sending a response, in which
+    case the middleware sends it as XML.
+
+    Usage:
+
+    .. code-block:: python
+
+        from twilio import twiml
+        from twilio.asgi import ValidationMiddleware
+
+        async def voice(scope, receive, send):
+            r = twiml.Response()
+            r.say("Hello %s" % scope["twilio.params"]["From"])
+            return r
+
+        app = ValidationMiddleware(voice, AUTH_TOKEN)
+
+    :param app: The ASGI application to wrap
+    :param token: Your auth token, a list of auth tokens, or a
+        :class:`~twilio.util.RequestValidator`
+    :param str base_url: The scheme and host Twilio sends requests to, for
+        applications behind a proxy. See :func:`request_url`.
+    :param int max_body_size: The largest request body, in bytes, to accept
+    """
+
+    def __init__(self, app, token, base_url=None,
+                 max_body_size=MAX_BODY_SIZE):
+        self.app = app
+        if isinstance(token, RequestValidator):
+            self.validator = token
+        else:
+            self.validator = RequestValidator(token)
+        self.base_url = base_url
+        self.max_body_size = max_body_size
+
+    # __call__ and reject are compiled from ASYNC_SOURCE below
+
+
+# The coroutines of ValidationMiddleware, and replay(), which Pythons before
+# 3.5 can't compile
+ASYNC_SOURCE = '''
+async def middleware_call(self, scope, receive, send):
+    if scope["type"] != "http":
+        return await self.app(scope, receive, send)
+
+    headers = dict(scope.get("headers") or ())
+    params = {}
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    if is_form(content_type):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                await self.reject(send, 413)
+                return
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+
+        body = b"".join(chunks)
+        params = parse_form(body)
+        receive = replay(body, receive)
+
+    url = request_url(scope, headers, self.base_url)
+    signature = headers.get(b"x-twilio-signature")
+    if not self.validator.validate(url, params, signature):
+        await self.reject(send, 403)
+        return
+
+    scope = dict(scope)
+    scope[PARAMS_KEY] = params
+    result = await self.app(scope, receive, send)
+    if isinstance(result, Verb):
+        for message in asgi_messages(result):
+            await send(message)
+
+
+async def middleware_reject(self, send, status):
+    body = b"Forbidden" if status == 403 else b"Request Entity Too Large"
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"text/plain"),
+            (b"content-length", str(len(body)).encode("ascii")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def replay(body, receive):
+    """Return a receive callable which hands out body as a single message,
+    then defers to receive"""
+    pending = [body]
+
+    async def receive_body():
+        if pending:
+            return {"type": "http.request", "body": pending.pop(),
+                    "more_body": False}
+        return await receive()
+
+    return receive_body
+'''
+
+namespace = dict(globals())
+exec_(compile(ASYNC_SOURCE, "<twilio.asgi>", "exec"), namespace)
+ValidationMiddleware.__call__ = namespace["middleware_call"]
+ValidationMiddleware.reject = namespace["middleware_reject"]
+replay = namespace["replay"]
+del namespace
@@ -0,0 +1,155 @@
+"""
+Re-verify the signatures of archived webhook requests in bulk.
+"""
+from __future__ import division
+
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+
+from .util import RequestValidator
+
+CHUNK_SIZE = 1000
+
+# The validators of each worker process, built once by init_worker since
+# prepared HMACs can't be sent between processes
+worker_validators = None
+
+
+def build_validators(tokens):
+    if isinstance(tokens, dict):
+        return dict((account_sid, RequestValidator(token))
+                    for account_sid, token in tokens.items())
+    return RequestValidator(tokens)
+
+
+def init_worker(tokens):
+    global worker_validators
+    worker_validators = build_validators(tokens)
+
+
+def check_chunk(chunk, validators=None):
+    """Return the positions of the records in chunk which fail
+    validation"""
+    if validators is None:
+        validators = worker_validators
+
+    failures = []
+    for i, (url, params, signature) in enumerate(chunk):
+        if isinstance(validators, dict):
+            validator = validators.get(params.get("AccountSid"))
+            if validator is None:
+                failures.append(i)
+                continue
+        else:
+            validator = validators
+        if not validator.validate(url, params, signature):
+            failures.append(i)
+    return failures
+
+
+class SignatureAudit(object):
+    """
+    Check the signatures of many archived webhook requests, spread across a
+    pool of processes.
+
+    Usage:
+
+    .. code-block:: python
+
+        audit = SignatureAudit({"AC123": TOKEN, "AC456": [NEW, OLD]})
+        for url, params, signature in audit.run(archive):
+            report(url, params)
+        print("%d checked at %.0f/s" % (audit.checked, audit.rate))
+
+    :param tokens: The auth token or tokens to check every request against,
+        or a dict mapping account sids to them, in which case each request
+        is checked against the tokens for its ``AccountSid`` parameter.
+        Requests from other accounts fail.
+    :param int processes: The number of worker processes. Defaults to the
+        number of CPUs. With 1 or fewer the records are checked in this
+        process.
+    :param int chunk_size: The number of records sent to a worker at a time
+
+    .. attribute:: checked
+
+        The number of records checked so far.
+
+    .. attribute:: failed
+
+        The number of records which failed so far.
+
+    .. attribute:: elapsed
+
+        The seconds spent in :meth:`run` so far, including time spent
+        handling the failures it yields.
+    """
+
+    def __init__(self, tokens, processes=None, chunk_size=CHUNK_SIZE):
+        self.tokens = tokens
+        self.processes = cpu_count() if processes is None else processes
+        self.chunk_size = chunk_size
+        self.checked = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        """The number of records checked per second"""
+        return self.checked / self.elapsed if self.elapsed else 0.0
+
+    def chunks(self, records):
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def run(self, records):
+        """
+        Check every record, yielding those which fail in the order they
+        were given.
+
+        :param records: An iterable of (url, params, signature) tuples. It
+            is read a few chunks at a time, so it can be much larger than
+            memory.
+        """
+        if self.processes <= 1:
+            checked = self.check_serial(records)
+        else:
+            checked = self.check_parallel(records)
+
+        started = time.time() - self.elapsed
+        for chunk, failures in checked:
+            self.checked += len(chunk)
+            self.failed += len(failures)
+            self.elapsed = time.time() - started
+            for i in failures:
+                yield chunk[i]
+
+    def check_serial(self, records):
+        validators = build_validators(self.tokens)
+        for chunk in self.chunks(records):
+            yield chunk, check_chunk(chunk, validators)
+
+    def check_parallel(self, records):
+        pool = Pool(self.processes, init_worker, (self.tokens,))
+        try:
+            # Keep only a couple of chunks per process in flight, rather than
+            # letting the pool read the whole input ahead
+            pending = deque()
+            for chunk in self.chunks(records):
+                pending.append((chunk, pool.apply_async(check_chunk,
+                                                        (chunk,))))
+                if len(pending) >= 2 * self.processes:
+                    chunk, result = pending.popleft()
+                    yield chunk, result.get()
+            while pending:
+                chunk, result = pending.popleft()
+                yield chunk, result.get()
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
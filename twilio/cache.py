@@ -0,0 +1,105 @@
+from __future__ import with_statement
+
+import threading
+
+PREV, NEXT, KEY, VALUE = 0, 1, 2, 3
+
+
+class LRUCache(object):
+    """
+    A thread-safe mapping that holds at most maxsize items, discarding the
+    least recently used item to make room for a new one.
+
+    :param int maxsize: The most items to hold
+
+    .. attribute:: hits
+
+        The number of :meth:`get` calls that found an item.
+
+    .. attribute:: misses
+
+        The number of :meth:`get` calls that found nothing.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.links = {}
+        # A circular doubly linked list of [prev, next, key, value] links,
+        # from the least to the most recently used
+        self.root = []
+        self.root[:] = [self.root, self.root, None, None]
+
+    @property
+    def hit_rate(self):
+        """The fraction of :meth:`get` calls that were hits"""
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def get(self, key, default=None):
+        """Return the item for key, marking it most recently used, or
+        default"""
+        with self.lock:
+            link = self.links.get(key)
+            if link is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._move_to_end(link)
+            return link[VALUE]
+
+    def set(self, key, value):
+        """Store value for key, evicting the least recently used item if
+        the cache is full"""
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            link = self.links.get(key)
+            if link is not None:
+                link[VALUE] = value
+                self._move_to_end(link)
+                return
+
+            root = self.root
+            if len(self.links) >= self.maxsize:
+                oldest = root[NEXT]
+                root[NEXT] = oldest[NEXT]
+                oldest[NEXT][PREV] = root
+                del self.links[oldest[KEY]]
+
+            last = root[PREV]
+            link = [last, root, key, value]
+            last[NEXT] = root[PREV] = self.links[key] = link
+
+    def _move_to_end(self, link):
+        link[PREV][NEXT] = link[NEXT]
+        link[NEXT][PREV] = link[PREV]
+        root = self.root
+        last = root[PREV]
+        link[PREV] = last
+        link[NEXT] = root
+        last[NEXT] = root[PREV] = link
+
+    def pop(self, key, default=None):
+        """Remove the item for key and return it, or default"""
+        with self.lock:
+            link = self.links.pop(key, None)
+            if link is None:
+                return default
+            link[PREV][NEXT] = link[NEXT]
+            link[NEXT][PREV] = link[PREV]
+            return link[VALUE]
+
+    def clear(self):
+        """Forget every item"""
+        with self.lock:
+            self.links.clear()
+            self.root[:] = [self.root, self.root, None, None]
+
+    def __contains__(self, key):
+        return key in self.links
+
+    def __len__(self):
+        return len(self.links)
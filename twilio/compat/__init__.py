@@ -1,3 +1,4 @@
+import os
 
 # Those are not supported by the six library and needs to be done manually
 from six import binary_type
@@ -18,3 +19,19 @@ try:
 except ImportError:
     # python 3
     izip = zip
+
+
+def replace_file(src, dst):
+    """Rename src to dst, replacing dst if it exists, as os.replace does on
+    python 3.3+"""
+    replace = getattr(os, "replace", None)
+    if replace is not None:
+        return replace(src, dst)
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # Windows won't rename over an existing file
+        if not os.path.exists(dst):
+            raise
+        os.remove(dst)
+        os.rename(src, dst)
@@ -6,8 +6,11 @@ http://self-issued.info/docs/draft-jones-json-web-token-01.html
 import base64
 import hashlib
 import hmac
+import time
 from six import text_type, b
 
+from ..cache import LRUCache
+
 
 # default text to binary representation conversion
 def binary(txt):
@@ -19,12 +22,42 @@ except ImportError:
     import simplejson as json
 
 
-__all__ = ['encode', 'decode', 'DecodeError']
+__all__ = ['encode', 'decode', 'DecodeError', 'Encoder', 'Verifier']
+
+
+try:
+    from hmac import compare_digest as hmac_compare_digest
+except ImportError:
+    # python < 2.7.7
+    hmac_compare_digest = None
+
+
+def compare_digest(a, b):
+    """Return a == b for two byte or text strings, in time which doesn't
+    depend on where they differ"""
+    if hmac_compare_digest is not None:
+        try:
+            return hmac_compare_digest(a, b)
+        except TypeError:
+            # Mixed types, or text outside ASCII
+            pass
+    if len(a) != len(b):
+        return False
+    result = True
+    for x, y in zip(a, b):
+        result &= x == y
+    return result
 
 
 class DecodeError(Exception):
     pass
 
+digests = {
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512,
+}
+
 signing_methods = {
     'HS256': lambda msg, key: hmac.new(key, msg, hashlib.sha256).digest(),
     'HS384': lambda msg, key: hmac.new(key, msg, hashlib.sha384).digest(),
@@ -55,6 +88,49 @@ def encode(payload, key, algorithm='HS256'):
     return '.'.join(segments)
 
 
+class Encoder(object):
+    """
+    Encode JWTs signed with one key and algorithm.
+
+    The header segment is serialized and the HMAC keyed once, up front, so
+    encoding a token only serializes and signs its payload. JSON is written
+    without whitespace.
+
+    :param key: The secret to sign tokens with
+    :param str algorithm: The signing algorithm. Defaults to HS256.
+    :raises: NotImplementedError if the algorithm isn't supported
+    """
+
+    separators = (',', ':')
+
+    def __init__(self, key, algorithm='HS256'):
+        try:
+            digest = digests[algorithm]
+        except KeyError:
+            raise NotImplementedError("Algorithm not supported")
+        if isinstance(key, text_type):
+            key = binary(key)
+
+        self.algorithm = algorithm
+        header = {"typ": "JWT", "alg": algorithm}
+        self.header = base64url_encode(binary(
+            json.dumps(header, separators=self.separators))) + '.'
+        self.mac = hmac.new(key, digestmod=digest)
+
+    def encode(self, payload):
+        """Return a signed token for payload"""
+        return self.encode_json(json.dumps(payload,
+                                           separators=self.separators))
+
+    def encode_json(self, payload):
+        """Return a signed token for a payload already serialized as
+        JSON"""
+        sign_input = self.header + base64url_encode(binary(payload))
+        mac = self.mac.copy()
+        mac.update(binary(sign_input))
+        return sign_input + '.' + base64url_encode(mac.digest())
+
+
 def decode(jwt, key='', verify=True):
     try:
         signing_input, crypto_segment = jwt.rsplit('.', 1)
@@ -72,8 +148,100 @@ def decode(jwt, key='', verify=True):
     if verify:
         try:
             method = signing_methods[header['alg']]
-            if not signature == method(binary(signing_input), binary(key)):
+            expected = method(binary(signing_input), binary(key))
+            if not compare_digest(signature, expected):
                 raise DecodeError("Signature verification failed")
         except KeyError:
             raise DecodeError("Algorithm not supported")
     return payload
+
+
+class Verifier(object):
+    """
+    Verify and decode JWTs signed with one key, remembering tokens it has
+    already verified.
+
+    A token seen recently is checked only for expiry, so verifying a hot
+    token costs little more than a dict lookup. A new token has its header
+    read only to find the algorithm, and its payload parsed only once the
+    signature is known to be good.
+
+    The payloads returned are shared between calls for the same token, so
+    they should not be modified.
+
+    :param key: The secret tokens are signed with
+    :param int maxsize: The most verified tokens to remember
+    :param int leeway: Seconds of clock skew to allow when checking ``exp``
+
+    .. attribute:: cache
+
+        The :class:`~twilio.cache.LRUCache` of verified tokens, whose
+        ``hits`` and ``misses`` count how often a token was remembered
+    """
+
+    def __init__(self, key, maxsize=1024, leeway=0):
+        if isinstance(key, text_type):
+            key = binary(key)
+        self.macs = dict((algorithm, hmac.new(key, digestmod=digest))
+                         for algorithm, digest in digests.items())
+        self.leeway = leeway
+        self.cache = LRUCache(maxsize)
+        # Most tokens share one of a handful of headers
+        self.headers = LRUCache(64)
+
+    def decode(self, token):
+        """
+        Return the payload of token.
+
+        :raises: a :exc:`DecodeError` if the token is malformed, its
+            signature is wrong or it has expired
+        """
+        cached = self.cache.get(token)
+        if cached is None:
+            cached = self.verify(token)
+            self.cache.set(token, cached)
+
+        payload, expires = cached
+        if expires is not None and time.time() >= expires + self.leeway:
+            self.cache.pop(token)
+            raise DecodeError("Signature has expired")
+        return payload
+
+    def verify(self, token):
+        try:
+            signing_input, crypto_segment = token.rsplit('.', 1)
+            header_segment, payload_segment = signing_input.split('.', 1)
+        except ValueError:
+            raise DecodeError("Not enough segments")
+
+        mac = self.headers.get(header_segment)
+        if mac is None:
+            try:
+                header = json.loads(base64url_decode(
+                    binary(header_segment)).decode('utf-8'))
+                mac = self.macs[header['alg']]
+            except (ValueError, TypeError):
+                raise DecodeError("Invalid segment encoding")
+            except (KeyError, AttributeError):
+                raise DecodeError("Algorithm not supported")
+            self.headers.set(header_segment, mac)
+
+        try:
+            signature = base64url_decode(binary(crypto_segment))
+        except (ValueError, TypeError):
+            raise DecodeError("Invalid segment encoding")
+
+        mac = mac.copy()
+        mac.update(binary(signing_input))
+        if not compare_digest(signature, mac.digest()):
+            raise DecodeError("Signature verification failed")
+
+        try:
+            payload = json.loads(base64url_decode(
+                binary(payload_segment)).decode('utf-8'))
+            expires = payload.get('exp')
+        except (ValueError, TypeError, AttributeError):
+            raise DecodeError("Invalid segment encoding")
+        if expires is not None and not isinstance(expires, (int, float)):
+            raise DecodeError("Invalid exp claim")
+        return payload, expires
@@ -0,0 +1,34 @@
+from multiprocessing.pool import ThreadPool
+
+# The number of requests bulk helpers will have in flight at once unless told
+# otherwise.
+DEFAULT_CONCURRENCY = 8
+
+
+def parallel_map(func, iterable, concurrency=DEFAULT_CONCURRENCY,
+                 ordered=True):
+    """
+    Apply func to every item of iterable using a pool of worker threads,
+    yielding the results in the same order as the input, or as each call
+    finishes if ordered is False.
+
+    Any exception raised by func is re-raised when its result is reached.
+    With a concurrency of 1 or less no threads are started at all.
+
+    :param func: A callable taking a single item
+    :param iterable: The items to process
+    :param int concurrency: The maximum number of calls to run at once
+    :param bool ordered: Whether to yield results in the order of the input
+    """
+    if concurrency <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    pool = ThreadPool(concurrency)
+    imap = pool.imap if ordered else pool.imap_unordered
+    try:
+        for result in imap(func, iterable):
+            yield result
+    finally:
+        pool.terminate()
@@ -16,14 +16,19 @@ class TwilioLookupsClient(TwilioClient):
     :param str token: Your Auth Token from `your dashboard
         <https://www.twilio.com/user/account>`_
     :param float timeout: The socket and read timeout for requests to Twilio
+    :param cache: An optional
+        :class:`~twilio.rest.resources.lookups.cache.LookupCache`, such as
+        a :class:`~twilio.rest.resources.lookups.cache.SqliteLookupCache`,
+        to serve repeated phone number lookups from
     """
 
     def __init__(self, account=None, token=None,
                  base="https://lookups.twilio.com", version="v1",
-                 timeout=UNSET_TIMEOUT):
+                 timeout=UNSET_TIMEOUT, cache=None):
 
         super(TwilioLookupsClient, self).__init__(account, token, base,
                                                   version, timeout)
 
         self.version_uri = "%s/%s" % (base, version)
-        self.phone_numbers = PhoneNumbers(self.version_uri, self.auth, timeout)
+        self.phone_numbers = PhoneNumbers(self.version_uri, self.auth, timeout,
+                                          cache=cache)
@@ -1,6 +1,7 @@
 from .util import (
     transform_params, format_name, parse_date, convert_boolean, convert_case,
-    convert_keys, normalize_dates, UNSET_TIMEOUT
+    convert_keys, normalize_dates, parallel_map, DEFAULT_CONCURRENCY,
+    UNSET_TIMEOUT
 )
 from .base import (
     Response, Resource, InstanceResource, ListResource,
@@ -10,6 +11,7 @@ from .base import (
 from .phone_numbers import (
     AvailablePhoneNumber, AvailablePhoneNumbers, PhoneNumber, PhoneNumbers
 )
+from .downloads import DownloadManager
 from .recordings import Recording, Recordings
 from .transcriptions import Transcription, Transcriptions
 
@@ -50,9 +52,11 @@ from .task_router import (
     Activity,
     Activities,
     Event,
+    EventCheckpoint,
     Events,
     Reservation,
     Reservations,
+    StatisticsCollector,
     Task,
     Tasks,
     TaskQueue,
@@ -63,6 +67,7 @@ from .task_router import (
     Workflows,
     Workspace,
     Workspaces,
+    WorkspaceMirror,
 )
 
 from .tokens import Token, Tokens
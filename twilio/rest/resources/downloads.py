@@ -0,0 +1,417 @@
+"""
+Streaming downloads of recordings and media.
+
+:func:`~twilio.rest.resources.base.make_request` reads and decodes the whole
+response body, which is the right thing for API resources but not for audio
+or images. The helpers here hand the body back in chunks of bytes, reuse
+keep-alive connections between files and write to disk without ever holding
+a whole file in memory.
+"""
+from __future__ import with_statement
+
+import base64
+import os
+import platform
+import re
+import socket
+import ssl
+import threading
+
+from six.moves import http_client
+
+from ...compat import replace_file, urljoin, urlparse
+from ... import __version__
+from ...exceptions import TwilioException
+from ..exceptions import TwilioRestException
+from .base import get_cert_file
+from .connection import Connection
+from .imports import PROXY_TYPE_HTTP
+from .util import parallel_map, UNSET_TIMEOUT
+
+CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+CONTENT_RANGE = re.compile(r'bytes (\d+)-\d+/(\d+)')
+
+
+def ssl_context():
+    """Return an SSL context that verifies against the bundled CA
+    certificates, or None on Pythons without default SSL contexts"""
+    try:
+        return ssl.create_default_context(cafile=get_cert_file())
+    except AttributeError:
+        return None
+
+
+def dnsname_match(pattern, hostname):
+    pattern = pattern.lower()
+    hostname = hostname.lower()
+    if pattern.startswith("*."):
+        label, _, rest = hostname.partition(".")
+        return bool(label) and rest == pattern[2:]
+    return pattern == hostname
+
+
+def match_hostname(cert, hostname):
+    """
+    Raise an :exc:`ssl.SSLError` unless cert, as returned by
+    ``getpeercert()``, was issued for hostname.
+
+    Used on Pythons without :func:`ssl.match_hostname`.
+    """
+    names = [value for key, value in cert.get("subjectAltName", ())
+             if key == "DNS"]
+    if not names:
+        names = [value for rdn in cert.get("subject", ())
+                 for key, value in rdn if key == "commonName"]
+    for name in names:
+        if dnsname_match(name, hostname):
+            return
+    raise ssl.SSLError("Certificate for %r does not match %s" %
+                       (names, hostname))
+
+
+class VerifiedHTTPSConnection(http_client.HTTPSConnection):
+    """
+    An HTTPS connection which verifies the server's certificate against the
+    bundled CA certificates, and its hostname, for Pythons which can't do
+    so through an SSL context.
+    """
+
+    def connect(self):
+        sock = socket.create_connection((self.host, self.port),
+                                        self.timeout)
+        hostname = self.host
+        if getattr(self, "_tunnel_host", None):
+            self.sock = sock
+            self._tunnel()
+            hostname = self._tunnel_host
+
+        try:
+            self.sock = ssl.wrap_socket(sock, cert_reqs=ssl.CERT_REQUIRED,
+                                        ca_certs=get_cert_file())
+            getattr(ssl, "match_hostname", match_hostname)(
+                self.sock.getpeercert(), hostname)
+        except Exception:
+            sock.close()
+            raise
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe pool of keep-alive HTTP connections, grouped by scheme and
+    host.
+
+    :param float timeout: The socket timeout for new connections
+    """
+
+    def __init__(self, timeout=UNSET_TIMEOUT):
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.idle = {}
+
+    def get(self, scheme, netloc):
+        """Return an idle connection to netloc, or None"""
+        with self.lock:
+            connections = self.idle.get((scheme, netloc))
+            if connections:
+                return connections.pop()
+        return None
+
+    def put(self, scheme, netloc, connection):
+        """Return a connection to the pool for reuse"""
+        with self.lock:
+            self.idle.setdefault((scheme, netloc), []).append(connection)
+
+    def connect(self, scheme, netloc):
+        """Open a new connection to netloc"""
+        kwargs = {}
+        if self.timeout is not UNSET_TIMEOUT:
+            kwargs['timeout'] = self.timeout
+
+        host = netloc
+        proxy = Connection.proxy_info()
+        if proxy is not None:
+            if proxy.proxy_type != PROXY_TYPE_HTTP:
+                raise TwilioException("Streaming downloads only support "
+                                      "HTTP proxies")
+            host = "%s:%s" % (proxy.proxy_host, proxy.proxy_port)
+
+        if scheme == 'https':
+            # Credentials are sent on these connections, so the server's
+            # certificate is always verified
+            context = ssl_context()
+            if context is not None:
+                connection = http_client.HTTPSConnection(host,
+                                                         context=context,
+                                                         **kwargs)
+            else:
+                connection = VerifiedHTTPSConnection(host, **kwargs)
+        else:
+            connection = http_client.HTTPConnection(host, **kwargs)
+
+        if proxy is not None:
+            connection.set_tunnel(netloc)
+        return connection
+
+    def close(self):
+        """Close every idle connection"""
+        with self.lock:
+            idle, self.idle = self.idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class StreamingResponse(object):
+    """
+    An HTTP response whose body is read on demand.
+
+    .. attribute:: status_code
+
+        The HTTP status of the response
+
+    .. attribute:: url
+
+        The URL the body came from, after following any redirects
+    """
+
+    def __init__(self, pool, url, connection, response):
+        self.pool = pool
+        self.url = url
+        self.connection = connection
+        self.response = response
+        self.status_code = response.status
+
+    def header(self, name, default=None):
+        """Return the value of the named response header"""
+        return self.response.getheader(name, default)
+
+    def iter_content(self, chunk_size=CHUNK_SIZE):
+        """Yield the body as raw bytes, chunk_size at a time"""
+        try:
+            while True:
+                chunk = self.response.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the connection, returning it to the pool if the body was
+        read in full"""
+        if self.connection is None:
+            return
+        if self.response.isclosed() and not self.response.will_close:
+            parts = urlparse(self.url)
+            self.pool.put(parts.scheme, parts.netloc, self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+
+
+class DownloadManager(object):
+    """
+    Download files from Twilio in parallel, streaming each one to disk.
+
+    Files are written to a ``.part`` file next to the destination and only
+    renamed into place once the number of bytes received matches the
+    length the server promised, so a destination either holds a complete
+    file or does not exist. An interrupted download resumes from its
+    ``.part`` file with a range request.
+
+    Usage:
+
+    .. code-block:: python
+
+        manager = DownloadManager(client.auth, concurrency=8)
+        manager.download_all([
+            (recording.formats["mp3"], "/archive/%s.mp3" % recording.sid)
+            for recording in client.recordings.iter()
+        ])
+
+    :param tuple auth: The (account sid, auth token) pair to authenticate
+        with
+    :param int concurrency: The maximum number of downloads in flight
+    :param int chunk_size: The number of bytes to read at a time
+    :param float timeout: The socket timeout for requests
+    """
+
+    def __init__(self, auth, concurrency=4, chunk_size=CHUNK_SIZE,
+                 timeout=UNSET_TIMEOUT):
+        self.auth = auth
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.pool = ConnectionPool(timeout)
+
+    def stream(self, url, headers=None):
+        """
+        Request url, following redirects, and return a
+        :class:`StreamingResponse` for the body.
+
+        Credentials are only sent to the host of the original URL.
+
+        :raises: a :exc:`~twilio.TwilioRestException` if the response is a
+            400 or 500-level response.
+        """
+        origin = urlparse(url).netloc
+
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlparse(url)
+
+            request_headers = {
+                "User-Agent": "twilio-python/%s (Python %s)" % (
+                    __version__,
+                    platform.python_version(),
+                ),
+                "Accept-Encoding": "identity",
+            }
+            if self.auth is not None and parts.netloc == origin:
+                credentials = ("%s:%s" % self.auth).encode('utf-8')
+                request_headers["Authorization"] = "Basic %s" % (
+                    base64.b64encode(credentials).decode('ascii'))
+            request_headers.update(headers or {})
+
+            path = parts.path or '/'
+            if parts.query:
+                path = "%s?%s" % (path, parts.query)
+
+            connection, response = self._request(parts, path,
+                                                 request_headers)
+            resp = StreamingResponse(self.pool, url, connection, response)
+
+            if resp.status_code in REDIRECT_CODES:
+                location = resp.header('location')
+                response.read()
+                resp.close()
+                url = urljoin(url, location)
+                continue
+
+            if resp.status_code >= 400:
+                content = response.read()
+                resp.close()
+                raise TwilioRestException(resp.status_code, url,
+                                          content.decode('utf-8', 'replace'))
+            return resp
+
+        raise TwilioRestException(resp.status_code, url, "Too many redirects")
+
+    def _request(self, parts, path, headers):
+        connection = self.pool.get(parts.scheme, parts.netloc)
+        if connection is not None:
+            # The server may have closed an idle connection since it was
+            # last used, in which case retry once on a fresh one.
+            try:
+                connection.request('GET', path, headers=headers)
+                return connection, connection.getresponse()
+            except (http_client.HTTPException, socket.error):
+                connection.close()
+
+        connection = self.pool.connect(parts.scheme, parts.netloc)
+        try:
+            connection.request('GET', path, headers=headers)
+            return connection, connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+    def download(self, url, dest, overwrite=False):
+        """
+        Download url to dest.
+
+        :param str url: The URL to download
+        :param dest: A file path, or a writable file-like object. Downloads
+            to a file-like object are not resumable.
+        :param bool overwrite: Download the file even if dest already exists
+
+        :returns: dest
+        :raises: a :exc:`~twilio.TwilioRestException` if the request fails,
+            or the server sent fewer or more bytes than it promised
+        """
+        if hasattr(dest, 'write'):
+            resp = self.stream(url)
+            for chunk in resp.iter_content(self.chunk_size):
+                dest.write(chunk)
+            return dest
+
+        if os.path.exists(dest) and not overwrite:
+            return dest
+
+        partial = dest + '.part'
+        try:
+            offset = os.path.getsize(partial)
+        except OSError:
+            offset = 0
+
+        headers = {}
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+
+        try:
+            resp = self.stream(url, headers)
+        except TwilioRestException as e:
+            if e.status != 416 or not offset:
+                raise
+            # The partial file is no use to the server, so start over
+            os.remove(partial)
+            return self.download(url, dest, overwrite)
+
+        expected = resp.header('content-length')
+        mode = 'wb'
+        if resp.status_code == 206:
+            match = CONTENT_RANGE.match(resp.header('content-range', ''))
+            if match is None or int(match.group(1)) != offset:
+                resp.close()
+                raise TwilioRestException(resp.status_code, resp.url,
+                                          "Unexpected Content-Range")
+            expected = match.group(2)
+            mode = 'ab'
+        else:
+            offset = 0
+
+        with open(partial, mode) as f:
+            try:
+                for chunk in resp.iter_content(self.chunk_size):
+                    f.write(chunk)
+            except http_client.IncompleteRead:
+                # Keep what did arrive so the next attempt can resume
+                pass
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        if expected is not None and size != int(expected):
+            if size > int(expected):
+                os.remove(partial)
+            raise TwilioRestException(resp.status_code, resp.url,
+                                      "Expected %s bytes but received %d" %
+                                      (expected, size))
+
+        replace_file(partial, dest)
+        return dest
+
+    def download_all(self, downloads, overwrite=False):
+        """
+        Download many files, :attr:`concurrency` at a time.
+
+        :param downloads: An iterable of (url, dest) pairs, as for
+            :meth:`download`
+        :param bool overwrite: Download files even if their dest already
+            exists
+
+        :returns: a generator yielding each dest, in order, as its download
+            completes
+        :raises: a :exc:`~twilio.TwilioRestException` if a download fails.
+            Downloads still in flight are abandoned, but can be resumed.
+        """
+        def download(item):
+            url, dest = item
+            return self.download(url, dest, overwrite)
+
+        for dest in parallel_map(download, downloads, self.concurrency):
+            yield dest
+
+    def close(self):
+        """Close every pooled connection"""
+        self.pool.close()
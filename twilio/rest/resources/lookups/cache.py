@@ -0,0 +1,173 @@
+from __future__ import with_statement
+
+import os
+import sqlite3
+import threading
+import time
+
+from ....cache import LRUCache
+from ..imports import json
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAXSIZE = 10000
+
+
+class LookupCache(object):
+    """
+    An in-memory cache of lookup results, keyed by number and lookup options.
+
+    Carrier details change over time, so results expire after a day by
+    default, and only the ``maxsize`` most recently used are kept.
+
+    :param int ttl: How long, in seconds, a result stays fresh. Results are
+        kept until they are evicted if this is None.
+    :param int maxsize: The most results to hold in memory
+
+    .. attribute:: hits
+
+        The number of :meth:`get` calls that found a fresh result.
+
+    .. attribute:: misses
+
+        The number of :meth:`get` calls that found nothing, or only an
+        expired result.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, maxsize=DEFAULT_MAXSIZE):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.results = LRUCache(maxsize)
+
+    @property
+    def hit_rate(self):
+        """The fraction of :meth:`get` calls that were hits"""
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def get(self, key):
+        """Return the fresh cached result for key, or None"""
+        value = self.load(key, time.time())
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store a result for key"""
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        self.store(key, value, expires)
+
+    def load(self, key, now):
+        result = self.results.get(key)
+        if result is None:
+            return None
+        expires, value = result
+        if expires is not None and expires <= now:
+            self.results.pop(key)
+            return None
+        return value
+
+    def store(self, key, value, expires):
+        self.results.set(key, (expires, value))
+
+    def clear(self):
+        """Forget every cached result"""
+        self.results.clear()
+
+    def __len__(self):
+        return len(self.results)
+
+
+class SqliteLookupCache(LookupCache):
+    """
+    A persistent cache of lookup results stored in an SQLite database.
+
+    Any number of processes can share one database file, so results
+    survive restarts and deploys and are only paid for once.
+
+    Usage:
+
+    .. code-block:: python
+
+        cache = SqliteLookupCache("/var/cache/twilio/lookups.db",
+                                  ttl=30 * 24 * 60 * 60)
+        client = TwilioLookupsClient(cache=cache)
+
+    :param str path: The database file, created if it does not exist
+    :param int ttl: How long, in seconds, a result stays fresh. Defaults to
+        one week.
+    :param float timeout: How long to wait for another process to release a
+        lock on the database.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 60 * 60, timeout=5.0):
+        super(SqliteLookupCache, self).__init__(ttl)
+        self.path = path
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.pid = None
+        self.connection = None
+
+    def connect(self):
+        # A connection can't be carried across a fork, so each process opens
+        # its own.
+        if self.pid != os.getpid():
+            self.connection = sqlite3.connect(self.path, self.timeout,
+                                              check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS lookups "
+                "(key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+            self.connection.commit()
+            self.pid = os.getpid()
+        return self.connection
+
+    def load(self, key, now):
+        with self.lock:
+            row = self.connect().execute(
+                "SELECT value FROM lookups WHERE key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (key, now),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def store(self, key, value, expires):
+        with self.lock:
+            connection = self.connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires),
+            )
+            connection.commit()
+
+    def clear(self):
+        """Forget every cached result"""
+        with self.lock:
+            connection = self.connect()
+            connection.execute("DELETE FROM lookups")
+            connection.commit()
+
+    def purge(self):
+        """Remove expired results from the database"""
+        with self.lock:
+            connection = self.connect()
+            connection.execute("DELETE FROM lookups WHERE expires <= ?",
+                               (time.time(),))
+            connection.commit()
+
+    def __len__(self):
+        with self.lock:
+            row = self.connect().execute(
+                "SELECT COUNT(*) FROM lookups").fetchone()
+        return row[0]
+
+    def close(self):
+        """Close this process's connection to the database"""
+        with self.lock:
+            if self.connection is not None and self.pid == os.getpid():
+                self.connection.close()
+            self.connection = None
+            self.pid = None
@@ -1,10 +1,29 @@
+import re
+
+from twilio.compat import urlencode
+from twilio.rest.exceptions import TwilioRestException
 from twilio.rest.resources import (
     NextGenInstanceResource,
     NextGenListResource,
     transform_params,
+    parallel_map,
+    DEFAULT_CONCURRENCY,
+    UNSET_TIMEOUT,
 )
 
 
+# Punctuation people put in phone numbers that the Lookups API doesn't need.
+NUMBER_PUNCTUATION = re.compile(r'[\s\-\.\(\)/]')
+
+
+def normalize_number(number):
+    """
+    Strip whitespace and formatting characters from a phone number, e.g.
+    " (510) 867-5309 " becomes "5108675309". A leading "+" is kept.
+    """
+    return NUMBER_PUNCTUATION.sub('', number)
+
+
 class PhoneNumber(NextGenInstanceResource):
     """
     Represents information about a phone number.
@@ -44,6 +63,10 @@ class PhoneNumbers(NextGenListResource):
     name = "PhoneNumbers"
     instance = PhoneNumber
 
+    def __init__(self, base_uri, auth, timeout=UNSET_TIMEOUT, cache=None):
+        super(PhoneNumbers, self).__init__(base_uri, auth, timeout)
+        self.cache = cache
+
     def get(self, number, include_carrier_info=False, country_code=None):
         """Look up a phone number.
 
@@ -53,8 +76,103 @@ class PhoneNumbers(NextGenListResource):
         :param str country_code: If the number is provided in a local format
         rather than E.164, specify the two-letter code of the country to parse
         the number for.
-        """
 
+        If this resource was given a ``cache``, the result is served from it
+        when possible.
+
+        :raises: a :exc:`~twilio.TwilioRestException` if Twilio could not
+            find the number, or the request fails
+        """
+        params = self._lookup_params(include_carrier_info, country_code)
+
+        if self.cache is None:
+            return self.load_instance(self._fetch(number, params))
+
+        key = self._cache_key(normalize_number(number), params)
+        item = self.cache.get(key)
+        if item is None:
+            try:
+                item = self._fetch(number, params)
+            except TwilioRestException as e:
+                if e.status == 404:
+                    self.cache.set(key, {})
+                raise
+            self.cache.set(key, item)
+        elif not item:
+            uri = "%s/%s" % (self.uri, number)
+            raise TwilioRestException(404, uri, "Phone number not found")
+        return self.load_instance(dict(item))
+
+    def get_many(self, numbers, include_carrier_info=False, country_code=None,
+                 concurrency=DEFAULT_CONCURRENCY):
+        """Look up many phone numbers at once.
+
+        Numbers are normalized and deduplicated before any requests are
+        made, and the remaining lookups run ``concurrency`` at a time. If
+        this resource was given a ``cache``, results are served from and
+        stored in it, so numbers seen in an earlier batch are not looked up
+        again.
+
+        Usage:
+
+        .. code-block:: python
+
+            numbers = ["+15108675309", "(510) 867-5309", "+14158675309"]
+            for number in client.phone_numbers.get_many(numbers,
+                                                        country_code="US"):
+                if number is not None:
+                    print number.national_format
+
+        :param numbers: An iterable of phone numbers to query.
+        :param bool include_carrier_info: Whether to do a carrier lookup on
+            each phone number. See twilio.com for the latest pricing.
+        :param str country_code: The two-letter code of the country to parse
+            numbers given in a local format for.
+        :param int concurrency: The maximum number of lookups in flight.
+
+        :returns: a generator yielding a :class:`PhoneNumber`, or None if
+            Twilio could not find the number, for each input number in order.
+        :raises: a :exc:`~twilio.TwilioRestException` if a lookup fails for
+            any other reason
+        """
+        params = self._lookup_params(include_carrier_info, country_code)
+        numbers = [normalize_number(n) for n in numbers]
+
+        cache = self.cache
+        results = {}
+        pending = []
+        for number in numbers:
+            if number in results:
+                continue
+            cached = None
+            if cache is not None:
+                cached = cache.get(self._cache_key(number, params))
+            results[number] = cached
+            if cached is None:
+                pending.append(number)
+
+        def fetch(number):
+            try:
+                item = self._fetch(number, params)
+            except TwilioRestException as e:
+                if e.status != 404:
+                    raise
+                # Remember numbers Twilio doesn't know about, too
+                item = {}
+            if cache is not None:
+                cache.set(self._cache_key(number, params), item)
+            return item
+
+        # Lookups complete in the order of first appearance, so each number
+        # missing from results is the next one the pool will hand back.
+        fetched = parallel_map(fetch, pending, concurrency)
+        for number in numbers:
+            item = results[number]
+            if item is None:
+                item = results[number] = next(fetched)
+            yield self.load_instance(dict(item)) if item else None
+
+    def _lookup_params(self, include_carrier_info, country_code):
         params = {}
         if country_code is not None:
             params['country_code'] = country_code
@@ -62,8 +180,13 @@ class PhoneNumbers(NextGenListResource):
         if include_carrier_info:
             params['type'] = 'carrier'
 
-        params = transform_params(params)
+        return transform_params(params)
+
+    def _cache_key(self, number, params):
+        return "%s?%s" % (number, urlencode(sorted(params.items())))
+
+    def _fetch(self, number, params):
+        """Request a single lookup, returning the raw response data"""
         uri = "%s/%s" % (self.uri, number)
         _, item = self.request("GET", uri, params=params)
-
-        return self.load_instance(item)
+        return item
@@ -1,6 +1,26 @@
+import mimetypes
+import os
+
 from . import InstanceResource, ListResource
+from .downloads import CHUNK_SIZE, DownloadManager
 from .util import normalize_dates, parse_date
 
+# mimetypes picks odd extensions for some common types, like ".jpe"
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/png": ".png",
+    "video/mp4": ".mp4",
+    "audio/mpeg": ".mp3",
+}
+
+
+def guess_extension(content_type):
+    """Return a file extension, including the dot, for content_type"""
+    if content_type in EXTENSIONS:
+        return EXTENSIONS[content_type]
+    return mimetypes.guess_extension(content_type or "") or ""
+
 
 class Media(InstanceResource):
     """ Represents media associated with a :class:`Message`.
@@ -42,6 +62,32 @@ class Media(InstanceResource):
         """
         return self.parent.delete_instance(self.name)
 
+    def stream(self, chunk_size=CHUNK_SIZE):
+        """
+        Return a generator yielding the content of this media as raw bytes,
+        chunk_size at a time.
+        """
+        manager = DownloadManager(self.auth, timeout=self.timeout)
+        try:
+            resp = manager.stream(self.uri)
+            for chunk in resp.iter_content(chunk_size):
+                yield chunk
+        finally:
+            manager.close()
+
+    def download(self, dest):
+        """
+        Write the content of this media to dest without holding it all in
+        memory.
+
+        :param dest: A file path, or a writable file-like object
+        """
+        manager = DownloadManager(self.auth, timeout=self.timeout)
+        try:
+            return manager.download(self.uri, dest)
+        finally:
+            manager.close()
+
 
 class MediaList(ListResource):
     name = "Media"
@@ -84,3 +130,49 @@ class MediaList(ListResource):
         :param sid: String identifier for a Media resource
         """
         return self.delete_instance(sid)
+
+    @normalize_dates
+    def download_all(self, dest, concurrency=4, before=None, after=None,
+                     date_created=None, **kwargs):
+        """
+        Download the content of every :class:`Media` in this list into the
+        directory dest, ``concurrency`` at a time. Each file is named after
+        the media's sid, with an extension for its content type.
+
+        Content is streamed to disk, so large attachments never have to fit
+        in memory, and files already in dest are skipped.
+
+        Usage:
+
+        .. code-block:: python
+
+            message = client.messages.get("MM123")
+            for path in message.media_list.download_all("/attachments"):
+                print path
+
+        :param str dest: The directory to save media in
+        :param int concurrency: The maximum number of downloads in flight
+        :param date after: Only download media created after this date.
+        :param date before: Only download media created before this date.
+        :param date date_created: Only download media created on this date.
+
+        :returns: a generator yielding the path of each downloaded file
+        :raises: a :exc:`~twilio.TwilioRestException` if a download fails
+        """
+        kwargs["DateCreated<"] = before
+        kwargs["DateCreated>"] = after
+        kwargs["DateCreated"] = parse_date(date_created)
+
+        def destination(media):
+            extension = guess_extension(getattr(media, "content_type", None))
+            return os.path.join(dest, media.sid + extension)
+
+        downloads = ((m.uri, destination(m)) for m in self.iter(**kwargs))
+
+        manager = DownloadManager(self.auth, concurrency,
+                                  timeout=self.timeout)
+        try:
+            for path in manager.download_all(downloads):
+                yield path
+        finally:
+            manager.close()
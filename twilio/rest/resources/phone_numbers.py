@@ -1,8 +1,8 @@
 import re
 
 from twilio.exceptions import TwilioException
-from .util import change_dict_key, transform_params
-from .util import UNSET_TIMEOUT
+from .util import change_dict_key, transform_params, parallel_map
+from .util import DEFAULT_CONCURRENCY, UNSET_TIMEOUT
 from . import InstanceResource, ListResource
 
 
@@ -333,6 +333,83 @@ class PhoneNumbers(ListResource):
         """
         Update this phone number instance
         """
+        return self.update_instance(sid, self._update_params(kwargs))
+
+    def bulk_update(self, filters=None, predicate=None,
+                    concurrency=DEFAULT_CONCURRENCY, progress=None,
+                    **kwargs):
+        """
+        Update every phone number matching a selector, e.g. to move all
+        webhooks to a new host.
+
+        Numbers whose properties already match the requested values are
+        skipped; the rest are updated ``concurrency`` at a time. A number
+        which fails to update doesn't stop the others: its error is
+        collected and returned along with the numbers that were updated.
+
+        Usage:
+
+        .. code-block:: python
+
+            def on_old_host(number):
+                return number.voice_url.startswith("http://old.example.com")
+
+            updated, failed = client.phone_numbers.bulk_update(
+                predicate=on_old_host,
+                voice_url="http://new.example.com/voice",
+                sms_url="http://new.example.com/sms",
+            )
+            for sid, error in failed:
+                print "%s: %s" % (sid, error)
+
+        :param dict filters: List filters, such as ``friendly_name`` or
+            ``phone_number``, selecting the numbers to consider.
+        :param predicate: A callable taking a :class:`PhoneNumber` and
+            returning True if it should be considered.
+        :param int concurrency: The maximum number of updates in flight.
+        :param progress: A callable invoked as ``progress(number, done,
+            total)`` as each update succeeds, in the order they finish, where
+            ``done`` is the number of updates finished so far, successful or
+            not, and ``total`` is the number of phone numbers that need
+            changing.
+
+        Any other keyword arguments are the new values, as for
+        :meth:`update`.
+
+        :returns: A tuple of the list of updated :class:`PhoneNumber`
+            instances and a list of (sid, exception) pairs for the numbers
+            which failed to update
+        """
+        changes = self._update_params(kwargs)
+
+        stale = []
+        for number in self.iter(**(filters or {})):
+            if predicate is not None and not predicate(number):
+                continue
+            for key, value in changes.items():
+                if getattr(number, key, None) != value:
+                    stale.append(number.sid)
+                    break
+
+        def update(sid):
+            try:
+                return sid, self.update_instance(sid, changes), None
+            except Exception as e:
+                return sid, None, e
+
+        updated = []
+        failed = []
+        results = parallel_map(update, stale, concurrency, ordered=False)
+        for done, (sid, number, error) in enumerate(results, 1):
+            if error is not None:
+                failed.append((sid, error))
+                continue
+            updated.append(number)
+            if progress is not None:
+                progress(number, done, len(stale))
+        return updated, failed
+
+    def _update_params(self, kwargs):
         kwargs_copy = dict(kwargs)
         change_dict_key(kwargs_copy, from_key="status_callback_url",
                         to_key="status_callback")
@@ -342,4 +419,4 @@ class PhoneNumbers(ListResource):
                 if sid_type not in kwargs_copy:
                     kwargs_copy[sid_type] = kwargs_copy["application_sid"]
             del kwargs_copy["application_sid"]
-        return self.update_instance(sid, kwargs_copy)
+        return kwargs_copy
@@ -1,5 +1,8 @@
+import os
+
 from .util import normalize_dates
 
+from .downloads import DownloadManager
 from .transcriptions import Transcriptions
 from .base import InstanceResource, ListResource
 
@@ -21,6 +24,19 @@ class Recording(InstanceResource):
         """
         return self.delete_instance()
 
+    def download(self, dest, format="wav"):
+        """
+        Stream the audio for this recording to dest.
+
+        :param dest: A file path, or a writable file-like object
+        :param str format: Either "wav" or "mp3"
+        """
+        manager = DownloadManager(self.auth, timeout=self.timeout)
+        try:
+            return manager.download(self.formats[format], dest)
+        finally:
+            manager.close()
+
 
 class Recordings(ListResource):
 
@@ -46,3 +62,53 @@ class Recordings(ListResource):
         Delete the given recording
         """
         return self.delete_instance(sid)
+
+    @normalize_dates
+    def download_all(self, directory, format="wav", concurrency=4,
+                     before=None, after=None, **kwargs):
+        """
+        Download the audio for every matching recording into directory,
+        ``concurrency`` files at a time, as ``<sid>.<format>``.
+
+        Files are streamed to disk, so memory use does not depend on
+        recording length. Recordings already in directory are skipped and
+        interrupted downloads are resumed, so an archive job can simply be
+        run again after a failure.
+
+        Usage:
+
+        .. code-block:: python
+
+            from datetime import date
+
+            for path in client.recordings.download_all(
+                    "/archive/2015-04", format="mp3",
+                    after=date(2015, 3, 31), before=date(2015, 5, 1)):
+                print path
+
+        :param str directory: The directory to save recordings in
+        :param str format: Either "wav" or "mp3"
+        :param int concurrency: The maximum number of downloads in flight
+        :param date after: Only download recordings created after this date
+        :param date before: Only download recordings created before this date
+        :param call_sid: Only download recordings from this :class:`Call`
+
+        :returns: a generator yielding the path of each downloaded file
+        :raises: a :exc:`~twilio.TwilioRestException` if a download fails
+        """
+        kwargs["DateCreated<"] = before
+        kwargs["DateCreated>"] = after
+
+        downloads = (
+            (recording.formats[format],
+             os.path.join(directory, "%s.%s" % (recording.sid, format)))
+            for recording in self.iter(**kwargs)
+        )
+
+        manager = DownloadManager(self.auth, concurrency,
+                                  timeout=self.timeout)
+        try:
+            for path in manager.download_all(downloads):
+                yield path
+        finally:
+            manager.close()
@@ -1,4 +1,5 @@
 from .. import InstanceResource, ListResource
+from ..util import parallel_map, DEFAULT_CONCURRENCY
 
 
 class Credential(InstanceResource):
@@ -68,6 +69,32 @@ class Credentials(ListResource):
         """
         return self.delete_instance(sid)
 
+    def sync(self, credentials, concurrency=DEFAULT_CONCURRENCY):
+        """Make this SipCredentialList hold exactly the given usernames.
+
+        Usernames missing from the list are created and usernames not in
+        ``credentials`` are removed, ``concurrency`` requests at a time.
+        Existing usernames are left alone, so their passwords are not
+        changed.
+
+        :param dict credentials: A mapping of username to password
+        :param int concurrency: The maximum number of requests in flight
+
+        :returns: A tuple of the created :class:`Credential` instances and
+            the sids of the removed credentials
+        """
+        current = dict((c.username, c.sid) for c in self.iter())
+        missing = [u for u in credentials if u not in current]
+        extra = [sid for u, sid in current.items() if u not in credentials]
+
+        def create(username):
+            return self.create(username, credentials[username])
+
+        # Create before deleting so a renamed user never loses access
+        created = list(parallel_map(create, missing, concurrency))
+        list(parallel_map(self.delete, extra, concurrency))
+        return created, extra
+
 
 class SipCredentialList(InstanceResource):
     """ A list of username/password credentials used to control access to
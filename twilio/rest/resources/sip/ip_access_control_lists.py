@@ -1,4 +1,7 @@
+from six import string_types
+
 from .. import InstanceResource, ListResource
+from ..util import parallel_map, DEFAULT_CONCURRENCY
 
 
 class IpAddress(InstanceResource):
@@ -70,6 +73,38 @@ class IpAddresses(ListResource):
         """
         return self.delete_instance(sid)
 
+    def sync(self, ip_addresses, concurrency=DEFAULT_CONCURRENCY):
+        """Make this SipIpAccessControlList hold exactly the given addresses.
+
+        Addresses missing from the list are created and addresses not in
+        ``ip_addresses`` are removed, ``concurrency`` requests at a time.
+
+        :param ip_addresses: An iterable of dotted-decimal IPv4 addresses,
+            or a mapping of address to friendly name. Addresses without a
+            friendly name use the address itself.
+        :param int concurrency: The maximum number of requests in flight
+
+        :returns: A tuple of the created :class:`IpAddress` instances and the
+            sids of the removed addresses
+        """
+        if isinstance(ip_addresses, string_types):
+            ip_addresses = [ip_addresses]
+        if not isinstance(ip_addresses, dict):
+            ip_addresses = dict((ip, ip) for ip in ip_addresses)
+
+        current = dict((a.ip_address, a.sid) for a in self.iter())
+        missing = [ip for ip in ip_addresses if ip not in current]
+        extra = [sid for ip, sid in current.items() if ip not in ip_addresses]
+
+        def create(ip_address):
+            return self.create(ip_addresses[ip_address], ip_address)
+
+        # Create before deleting so an allowlist is never briefly narrower
+        # than both the old and the new set
+        created = list(parallel_map(create, missing, concurrency))
+        list(parallel_map(self.delete, extra, concurrency))
+        return created, extra
+
 
 class SipIpAccessControlList(InstanceResource):
     """ A list of IP addresses for controlling access to a SIP Domain.
@@ -5,14 +5,24 @@ from .activities import (
 
 from .events import (
     Event,
+    EventCheckpoint,
     Events
 )
 
+from .mirror import (
+    WorkspaceMirror
+)
+
 from .reservations import (
     Reservation,
     Reservations
 )
 
+from .statistics import (
+    StatisticsCollector,
+    TimeSeries
+)
+
 from .task_queues import (
     TaskQueue,
     TaskQueues
@@ -1,7 +1,20 @@
+from __future__ import with_statement
+
+import datetime
+import time
+
+import pytz
+from six import string_types
+
+from twilio.compat import replace_file
 from twilio.rest.resources.base import (
     NextGenInstanceResource,
     NextGenListResource,
 )
+from twilio.rest.resources.imports import json
+from twilio.rest.resources.util import parse_iso_date
+
+EVENT_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
 
 class Event(NextGenInstanceResource):
@@ -44,6 +57,104 @@ class Event(NextGenInstanceResource):
     pass
 
 
+class EventCheckpoint(object):
+    """
+    The position of an :meth:`Events.tail` stream: the date of the newest
+    event seen, and the sids of the events seen shortly before it.
+
+    Give a checkpoint a path to have :meth:`Events.tail` save it there after
+    every poll, so a stream can be resumed where it left off after a
+    restart.
+
+    :param datetime since: The date of the newest event seen. A naive
+        datetime is taken to be in UTC.
+    :param seen: The sids of recent events which have been seen
+    :param str path: The file to save the checkpoint to
+
+    .. attribute:: since
+
+        The date of the newest event seen, or None for a stream which starts
+        when :meth:`Events.tail` is called, reaching back ``overlap``
+        seconds like every other poll.
+    """
+
+    def __init__(self, since=None, seen=None, path=None):
+        if since is not None:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=pytz.utc)
+            else:
+                since = since.astimezone(pytz.utc)
+        self.since = since
+        self.seen = dict(seen or {})
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+        """Return the checkpoint saved at path, or a new checkpoint which
+        will be saved there if there is no such file"""
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except IOError:
+            return cls(path=path)
+
+        since = state.get("since")
+        if since is not None:
+            since = parse_iso_date(since)
+        seen = dict((sid, parse_iso_date(date))
+                    for sid, date in state.get("seen", {}).items())
+        return cls(since, seen, path)
+
+    def save(self):
+        """Write the checkpoint to its path, replacing the file atomically"""
+        if self.path is None:
+            return
+        state = {
+            "since": format_event_date(self.since),
+            "seen": dict((sid, format_event_date(date))
+                         for sid, date in self.seen.items()),
+        }
+        partial = self.path + ".tmp"
+        with open(partial, "w") as f:
+            json.dump(state, f)
+        replace_file(partial, self.path)
+
+    def add(self, event):
+        """Record that event has been seen"""
+        date = event_date(event)
+        self.seen[event.sid] = date
+        if self.since is None or date > self.since:
+            self.since = date
+
+    def prune(self, overlap):
+        """Forget the sids of events more than overlap seconds older than
+        :attr:`since`"""
+        cutoff = self.since - datetime.timedelta(seconds=overlap)
+        for sid, date in list(self.seen.items()):
+            if date < cutoff:
+                del self.seen[sid]
+
+
+def event_date(event):
+    """Return the date of event as a UTC datetime
+
+    :raises ValueError: if the event's date isn't an ISO 8601 UTC date
+    """
+    date = event.event_date
+    if isinstance(date, string_types):
+        date = parse_iso_date(date)
+    if not isinstance(date, datetime.datetime):
+        raise ValueError("Event %s has an unrecognized event_date: %r"
+                         % (event.sid, event.event_date))
+    return date
+
+
+def format_event_date(date):
+    if date is None:
+        return None
+    return date.strftime(EVENT_DATE_FORMAT)
+
+
 class Events(NextGenListResource):
     name = "Events"
     instance = Event
@@ -75,3 +186,69 @@ class Events(NextGenListResource):
         :returns: -- the list of resources
         """
         return super(Events, self).get_instances(params)
+
+    def tail(self, since=None, overlap=30, min_interval=1, max_interval=30,
+             sleep=time.sleep, **kwargs):
+        """
+        Poll for new events forever, yielding each :class:`Event` once, in
+        the order they happened.
+
+        Each poll asks for the events since the newest one seen, going back
+        ``overlap`` seconds to catch events which arrive late. Events which
+        were already yielded are skipped. The wait between polls halves
+        while events are arriving and doubles while none are, between
+        ``min_interval`` and ``max_interval`` seconds.
+
+        An event is only recorded in the checkpoint once the code consuming
+        the stream asks for the next one, so after a restart an event may
+        be yielded again but is never missed.
+
+        Usage:
+
+        .. code-block:: python
+
+            checkpoint = EventCheckpoint.load("/var/lib/app/events.json")
+            for event in client.events(workspace_sid).tail(checkpoint):
+                handle(event)
+
+        :param since: An :class:`EventCheckpoint` to resume from and keep up
+            to date, a datetime to start from (naive datetimes are taken
+            to be in UTC), or None to start at the time of the call. As
+            every poll reaches back ``overlap`` seconds, the first also
+            yields the events of the ``overlap`` seconds before the call.
+        :param int overlap: How far, in seconds, each poll reaches back
+            before the newest event seen
+        :param float min_interval: The shortest wait between polls
+        :param float max_interval: The longest wait between polls
+
+        Other keyword arguments filter the events, as for :meth:`list`.
+        """
+        if isinstance(since, EventCheckpoint):
+            checkpoint = since
+        else:
+            checkpoint = EventCheckpoint(since)
+        if checkpoint.since is None:
+            checkpoint.since = datetime.datetime.now(pytz.utc).replace(
+                microsecond=0)
+
+        interval = min_interval
+        while True:
+            start = checkpoint.since - datetime.timedelta(seconds=overlap)
+            events = [
+                event for event in self.iter(
+                    start_date=format_event_date(start), **kwargs)
+                if event.sid not in checkpoint.seen
+            ]
+            events.sort(key=event_date)
+
+            for event in events:
+                yield event
+                checkpoint.add(event)
+            checkpoint.prune(overlap)
+            checkpoint.save()
+
+            if events:
+                interval = max(min_interval, interval / 2.0)
+            else:
+                interval = min(max_interval, interval * 2.0)
+            sleep(interval)
@@ -0,0 +1,363 @@
+"""
+A local, indexed copy of the Workers and Tasks of a Workspace.
+"""
+from __future__ import with_statement
+
+import datetime
+import threading
+
+import pytz
+from six import string_types
+
+from twilio.rest.exceptions import TwilioRestException
+from twilio.rest.resources.imports import json
+from twilio.rest.resources.util import parallel_map
+
+from .events import EventCheckpoint
+
+WORKER_FIELDS = ("activity_sid", "activity_name", "available")
+TASK_FIELDS = ("task_queue_sid", "workflow_sid", "assignment_status")
+DELETED_EVENTS = ("worker.deleted", "task.deleted")
+
+
+def parse_attributes(attributes):
+    """Return the attributes JSON of a Worker or Task as a dict, or an
+    empty dict if it isn't a JSON object"""
+    if isinstance(attributes, dict):
+        return attributes
+    if not isinstance(attributes, string_types):
+        return {}
+    try:
+        attributes = json.loads(attributes)
+    except ValueError:
+        return {}
+    return attributes if isinstance(attributes, dict) else {}
+
+
+def attribute_matches(attributes, key, value):
+    """Return True if the attribute key equals value, or is a list which
+    contains it"""
+    actual = attributes.get(key)
+    if isinstance(actual, list):
+        return value in actual
+    return actual == value
+
+
+class Index(object):
+    """
+    A collection of instance resources with in-memory indexes on some of
+    their fields and attribute keys.
+
+    An attribute which holds a list is indexed by each of its items, so a
+    Worker with ``{"languages": ["en", "es"]}`` is found by either language.
+
+    :param fields: The instance fields to index
+    :param attribute_keys: The keys of the attributes JSON to index
+    """
+
+    def __init__(self, fields, attribute_keys=()):
+        self.fields = tuple(fields)
+        self.attribute_keys = tuple(attribute_keys)
+        self.items = {}
+        self.attributes = {}
+        # sid -> the index keys the item is filed under, for removal
+        self.entries = {}
+        # (kind, name, value) -> the sids with that value
+        self.index = {}
+
+    def index_keys(self, instance, attributes):
+        keys = []
+        for name in self.fields:
+            keys.append(("field", name, getattr(instance, name, None)))
+        for name in self.attribute_keys:
+            value = attributes.get(name)
+            values = value if isinstance(value, list) else [value]
+            for value in values:
+                keys.append(("attribute", name, value))
+
+        hashable = []
+        for key in keys:
+            try:
+                hash(key)
+            except TypeError:
+                continue
+            hashable.append(key)
+        return hashable
+
+    def add(self, instance):
+        """Add instance, replacing any item with the same sid"""
+        sid = instance.sid
+        self.remove(sid)
+
+        attributes = parse_attributes(getattr(instance, "attributes", None))
+        keys = self.index_keys(instance, attributes)
+        self.items[sid] = instance
+        self.attributes[sid] = attributes
+        self.entries[sid] = keys
+        for key in keys:
+            self.index.setdefault(key, set()).add(sid)
+
+    def remove(self, sid):
+        """Remove the item with sid, if there is one"""
+        if sid not in self.items:
+            return
+        for key in self.entries.pop(sid):
+            sids = self.index[key]
+            sids.discard(sid)
+            if not sids:
+                del self.index[key]
+        del self.items[sid]
+        del self.attributes[sid]
+
+    def find(self, attributes=None, **fields):
+        """Return the items with every given field value and attribute
+        value, using the indexes where there are some"""
+        criteria = [("field", name, value) for name, value in fields.items()]
+        criteria += [("attribute", name, value)
+                     for name, value in (attributes or {}).items()]
+
+        indexed = []
+        unindexed = []
+        for kind, name, value in criteria:
+            names = self.fields if kind == "field" else self.attribute_keys
+            try:
+                hash(value)
+            except TypeError:
+                # Unhashable values are never indexed
+                names = ()
+            if name in names:
+                indexed.append(self.index.get((kind, name, value), set()))
+            else:
+                unindexed.append((kind, name, value))
+
+        if indexed:
+            indexed.sort(key=len)
+            sids = indexed[0].intersection(*indexed[1:])
+        else:
+            sids = self.items
+
+        found = []
+        for sid in sids:
+            instance = self.items[sid]
+            for kind, name, value in unindexed:
+                if kind == "field":
+                    if getattr(instance, name, None) != value:
+                        break
+                elif not attribute_matches(self.attributes[sid], name, value):
+                    break
+            else:
+                found.append(instance)
+        return found
+
+    def count(self, attributes=None, **fields):
+        """Return the number of items :meth:`find` would return"""
+        return len(self.find(attributes, **fields))
+
+    def get(self, sid):
+        return self.items.get(sid)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class WorkspaceMirror(object):
+    """
+    An in-memory copy of the Workers and Tasks of a Workspace, indexed so
+    that questions like "which available workers speak Spanish" are
+    answered without any requests.
+
+    :meth:`sync` loads every Worker and Task. :meth:`follow` then keeps the
+    copy up to date from the Workspace's :class:`Events`: each event
+    causes the Workers and Tasks it mentions to be fetched again.
+
+    Workers are indexed on ``activity_sid``, ``activity_name`` and
+    ``available``; Tasks on ``task_queue_sid``, ``workflow_sid`` and
+    ``assignment_status``. Both are also indexed on the attribute keys
+    given. Queries on other fields or attributes still work, by checking
+    each candidate.
+
+    Usage:
+
+    .. code-block:: python
+
+        mirror = WorkspaceMirror(client.workers(WORKSPACE_SID),
+                                 client.tasks(WORKSPACE_SID),
+                                 client.events(WORKSPACE_SID),
+                                 worker_attributes=["languages"])
+        mirror.sync()
+        mirror.start()
+
+        for worker in mirror.find_workers(available=True,
+                                          attributes={"languages": "es"}):
+            print(worker.friendly_name)
+
+    :param workers: The :class:`Workers` of the Workspace
+    :param tasks: The :class:`Tasks` of the Workspace
+    :param events: The :class:`Events` of the Workspace
+    :param worker_attributes: The worker attribute keys to index
+    :param task_attributes: The task attribute keys to index
+    :param int concurrency: The most requests to have in flight at once
+        while fetching Workers and Tasks again
+    """
+
+    def __init__(self, workers, tasks, events, worker_attributes=(),
+                 task_attributes=(), concurrency=4):
+        self.worker_list = workers
+        self.task_list = tasks
+        self.event_list = events
+        self.worker_attributes = worker_attributes
+        self.task_attributes = task_attributes
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self.workers = Index(WORKER_FIELDS, worker_attributes)
+        self.tasks = Index(TASK_FIELDS, task_attributes)
+        self.checkpoint = None
+        self.last_error = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def sync(self):
+        """Load every Worker and Task, replacing the current copy"""
+        # Events from the start of the sync onwards are applied afterwards,
+        # so changes made while it runs aren't lost
+        checkpoint = EventCheckpoint(
+            datetime.datetime.now(pytz.utc).replace(microsecond=0))
+
+        workers = Index(WORKER_FIELDS, self.worker_attributes)
+        tasks = Index(TASK_FIELDS, self.task_attributes)
+
+        def load(item):
+            index, resource = item
+            for instance in resource.iter():
+                index.add(instance)
+
+        list(parallel_map(load, [(workers, self.worker_list),
+                                 (tasks, self.task_list)], 2))
+        with self.lock:
+            self.workers = workers
+            self.tasks = tasks
+            self.checkpoint = checkpoint
+
+    def refresh(self, worker_sids=(), task_sids=()):
+        """Fetch the given Workers and Tasks again, removing those which no
+        longer exist"""
+        items = [(self.worker_list, "workers", sid) for sid in worker_sids]
+        items += [(self.task_list, "tasks", sid) for sid in task_sids]
+
+        def fetch(item):
+            resource, name, sid = item
+            try:
+                return name, sid, resource.get(sid)
+            except TwilioRestException as e:
+                if e.status != 404:
+                    raise
+                return name, sid, None
+
+        results = list(parallel_map(fetch, items, self.concurrency))
+        with self.lock:
+            for name, sid, instance in results:
+                index = getattr(self, name)
+                if instance is None:
+                    index.remove(sid)
+                else:
+                    index.add(instance)
+
+    def apply(self, event):
+        """Bring the copy up to date with event"""
+        data = event.event_data if isinstance(event.event_data, dict) else {}
+        worker_sids = set()
+        task_sids = set()
+        if event.resource_type == "worker":
+            worker_sids.add(event.resource_sid)
+        elif event.resource_type == "task":
+            task_sids.add(event.resource_sid)
+        if data.get("worker_sid"):
+            worker_sids.add(data["worker_sid"])
+        if data.get("task_sid"):
+            task_sids.add(data["task_sid"])
+
+        if event.event_type in DELETED_EVENTS:
+            with self.lock:
+                if event.resource_type == "worker":
+                    self.workers.remove(event.resource_sid)
+                else:
+                    self.tasks.remove(event.resource_sid)
+            worker_sids.discard(event.resource_sid)
+            task_sids.discard(event.resource_sid)
+
+        self.refresh(worker_sids, task_sids)
+
+    def follow(self, **kwargs):
+        """
+        Apply each new event as it arrives, yielding it afterwards. Calls
+        :meth:`sync` first if it hasn't been.
+
+        Keyword arguments are passed to :meth:`Events.tail`.
+        """
+        if self.checkpoint is None:
+            self.sync()
+        for event in self.event_list.tail(self.checkpoint, **kwargs):
+            self.apply(event)
+            yield event
+
+    def start(self, **kwargs):
+        """Follow events on a background thread until :meth:`stop` is
+        called, or a request fails, in which case the error is kept in
+        :attr:`last_error`"""
+        self.stopped.clear()
+
+        def sleep(seconds):
+            self.stopped.wait(seconds)
+            if self.stopped.is_set():
+                raise StopFollowing()
+
+        def run():
+            try:
+                for _ in self.follow(sleep=sleep, **kwargs):
+                    if self.stopped.is_set():
+                        break
+            except StopFollowing:
+                pass
+            except Exception as e:
+                self.last_error = e
+
+        self.thread = threading.Thread(target=run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop following events, waiting for the event being applied"""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def worker(self, sid):
+        """Return the Worker with sid, or None"""
+        return self.workers.get(sid)
+
+    def task(self, sid):
+        """Return the Task with sid, or None"""
+        return self.tasks.get(sid)
+
+    def find_workers(self, attributes=None, **fields):
+        """
+        Return the Workers with every given field value, and every given
+        attribute value, for example
+        ``find_workers(available=True, attributes={"language": "es"})``
+        """
+        with self.lock:
+            return self.workers.find(attributes, **fields)
+
+    def find_tasks(self, attributes=None, **fields):
+        """
+        Return the Tasks with every given field value, and every given
+        attribute value, for example
+        ``find_tasks(task_queue_sid="WQ123", assignment_status="pending")``
+        """
+        with self.lock:
+            return self.tasks.find(attributes, **fields)
+
+
+class StopFollowing(Exception):
+    """Raised inside :meth:`Events.tail` to end a background follow"""
@@ -1,4 +1,14 @@
+from __future__ import with_statement
+
+import threading
+import time
+
+from six import integer_types
+
 from .. import NextGenInstanceResource, NextGenListResource, transform_params
+from ..util import parallel_map
+
+NUMBER_TYPES = integer_types + (float,)
 
 
 class StatisticsInstance(NextGenInstanceResource):
@@ -34,3 +44,282 @@ class Statistics(NextGenListResource):
         instance = self.instance(self)
         instance.load(data)
         return instance
+
+
+class TimeSeries(object):
+    """
+    A fixed-size ring buffer of (time, value) samples, oldest first. Once
+    full, each new sample replaces the oldest one.
+
+    :param int size: The most samples to hold
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.times = [None] * size
+        self.values = [None] * size
+        self.count = 0
+        # The slot the next sample is written to
+        self.index = 0
+
+    def append(self, time, value):
+        self.times[self.index] = time
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def latest(self):
+        """Return the newest (time, value) sample, or None"""
+        if not self.count:
+            return None
+        i = self.index - 1
+        return self.times[i], self.values[i]
+
+    def samples(self, since=None):
+        """Return the (time, value) samples, oldest first, optionally only
+        those taken at or after since"""
+        start = self.index - self.count
+        samples = []
+        for i in range(start, self.index):
+            if since is None or self.times[i] >= since:
+                samples.append((self.times[i], self.values[i]))
+        return samples
+
+    def aggregate(self, since=None):
+        """Return the count, min, max and mean of the values taken at or
+        after since, as a dict, or None if there are none"""
+        values = [value for _, value in self.samples(since)]
+        if not values:
+            return None
+        return {
+            "count": len(values),
+            "min": min(values),
+            "max": max(values),
+            "mean": float(sum(values)) / len(values),
+        }
+
+    def __len__(self):
+        return self.count
+
+
+def flatten_statistics(data, prefix, out):
+    """
+    Add every number in a statistics response to out, keyed by its dotted
+    path under prefix.
+
+    Lists of objects, like ``activity_statistics``, are keyed by each
+    object's sid, so ``realtime.activity_statistics.WA123.workers`` holds
+    the number of workers in one activity.
+    """
+    for key, value in data.items():
+        name = "%s.%s" % (prefix, key)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, NUMBER_TYPES):
+            out[name] = value
+        elif isinstance(value, dict):
+            flatten_statistics(value, name, out)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, dict):
+                    item_name = "%s.%s" % (name, item.get("sid", i))
+                    flatten_statistics(item, item_name, out)
+
+
+class StatisticsCollector(object):
+    """
+    Poll the statistics of a Workspace's workers and task queues on a
+    schedule, keeping a :class:`TimeSeries` of every metric in memory.
+
+    Each poll requests every statistics endpoint at once, on up to
+    ``concurrency`` threads. Metrics are named by their path in the
+    response: ``workers.`` followed by the path in the workers statistics,
+    and ``task_queues.<sid>.`` followed by the path in the statistics of
+    each task queue, for example
+    ``task_queues.WQ123.realtime.total_tasks``.
+
+    Without ``queue_sids`` the statistics of every task queue are read
+    from the task queues statistics list, a page of queues per request.
+    With them, each queue's own statistics are requested.
+
+    An endpoint which fails is left out of that poll, and the error kept
+    in :attr:`last_error`, rather than stopping the other endpoints or the
+    schedule.
+
+    Usage:
+
+    .. code-block:: python
+
+        collector = StatisticsCollector(client.workers(WORKSPACE_SID),
+                                        client.task_queues(WORKSPACE_SID),
+                                        interval=5)
+        collector.start()
+        ...
+        waiting = collector.latest("task_queues.WQ123.realtime.total_tasks")
+        busy = collector.aggregate("workers.realtime.total_workers", 300)
+
+    :param workers: The :class:`Workers` of the Workspace
+    :param task_queues: The :class:`TaskQueues` of the Workspace
+    :param queue_sids: The sids of the task queues to poll one by one
+    :param float interval: The seconds between the start of each poll
+    :param int size: The number of samples to keep for each metric
+    :param int concurrency: The most requests to have in flight at once
+    :param kwargs: Parameters for every statistics request, like
+        ``minutes`` to set the window of the cumulative statistics
+
+    .. attribute:: polls
+
+        The number of polls so far.
+
+    .. attribute:: errors
+
+        The number of requests which failed so far.
+
+    .. attribute:: last_error
+
+        The exception raised by the last request to fail, or None.
+    """
+
+    def __init__(self, workers, task_queues, queue_sids=None, interval=5,
+                 size=720, concurrency=8, **kwargs):
+        self.workers = workers
+        self.task_queues = task_queues
+        self.queue_sids = queue_sids
+        self.interval = interval
+        self.size = size
+        self.concurrency = concurrency
+        self.params = transform_params(kwargs)
+        self.series = {}
+        self.polls = 0
+        self.errors = 0
+        self.last_error = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def endpoints(self):
+        """Return the (metric prefix, :class:`Statistics`, is list) of every
+        endpoint to poll"""
+        endpoints = [("workers", self.workers.statistics, False)]
+        if self.queue_sids is None:
+            endpoints.append(("task_queues", self.task_queues.statistics,
+                              True))
+        else:
+            for sid in self.queue_sids:
+                uri = "%s/%s" % (self.task_queues.uri, sid)
+                statistics = Statistics(uri, self.task_queues.auth,
+                                        self.task_queues.timeout)
+                endpoints.append(("task_queues.%s" % sid, statistics, False))
+        return endpoints
+
+    def fetch(self, endpoint):
+        """Request one endpoint, returning its metrics as a dict, or the
+        exception it raised"""
+        prefix, statistics, is_list = endpoint
+        metrics = {}
+        try:
+            if not is_list:
+                _, data = statistics.request("GET", statistics.uri,
+                                             params=self.params)
+                flatten_statistics(data, prefix, metrics)
+                return metrics
+
+            uri, params = statistics.uri, self.params
+            while uri:
+                _, data = statistics.request("GET", uri, params=params)
+                for item in data.get("task_queues_statistics", []):
+                    flatten_statistics(item, "%s.%s" % (
+                        prefix, item["task_queue_sid"]), metrics)
+                # The next page URL already carries the parameters
+                uri, params = data.get("meta", {}).get("next_page_url"), {}
+            return metrics
+        except Exception as e:
+            return e
+
+    def poll(self, now=None):
+        """Request every endpoint once and record the results, all with the
+        same time"""
+        if now is None:
+            now = time.time()
+        results = list(parallel_map(self.fetch, self.endpoints(),
+                                    self.concurrency))
+        with self.lock:
+            for metrics in results:
+                if isinstance(metrics, Exception):
+                    self.errors += 1
+                    self.last_error = metrics
+                    continue
+                for name, value in metrics.items():
+                    series = self.series.get(name)
+                    if series is None:
+                        series = self.series[name] = TimeSeries(self.size)
+                    series.append(now, value)
+            self.polls += 1
+
+    def run(self):
+        """Poll every :attr:`interval` seconds until :meth:`stop` is
+        called"""
+        next_poll = time.time()
+        while not self.stopped.is_set():
+            self.poll()
+            next_poll = max(next_poll + self.interval, time.time())
+            self.stopped.wait(next_poll - time.time())
+
+    def start(self):
+        """Start polling on a background thread"""
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop polling, waiting for a poll in progress to finish"""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def metrics(self):
+        """Return the names of every metric seen so far, sorted"""
+        with self.lock:
+            return sorted(self.series)
+
+    def latest(self, metric, default=None):
+        """Return the newest value of metric, or default"""
+        with self.lock:
+            series = self.series.get(metric)
+            sample = series.latest() if series is not None else None
+        return default if sample is None else sample[1]
+
+    def samples(self, metric, window=None):
+        """Return the (time, value) samples of metric, oldest first,
+        optionally only those from the last window seconds"""
+        with self.lock:
+            series = self.series.get(metric)
+            if series is None:
+                return []
+            return series.samples(self.since(series, window))
+
+    def aggregate(self, metric, window=None):
+        """Return the count, min, max and mean of metric, as a dict,
+        optionally over only the last window seconds, or None if there are
+        no samples"""
+        with self.lock:
+            series = self.series.get(metric)
+            if series is None:
+                return None
+            return series.aggregate(self.since(series, window))
+
+    def snapshot(self):
+        """Return the newest value of every metric, as a dict"""
+        with self.lock:
+            return dict((name, series.latest()[1])
+                        for name, series in self.series.items())
+
+    def since(self, series, window):
+        # Windows end at the newest sample rather than now, so a stalled
+        # collector still reports its last window
+        if window is None or not len(series):
+            return None
+        return series.latest()[0] - window
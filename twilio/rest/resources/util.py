@@ -4,6 +4,8 @@ from email.utils import parsedate
 from six import iteritems
 import pytz
 
+from ...parallel import DEFAULT_CONCURRENCY, parallel_map
+
 
 def transform_params(parameters):
     """
@@ -117,7 +119,9 @@ def convert_keys(d):
 def normalize_dates(myfunc):
     def inner_func(*args, **kwargs):
         for k, v in iteritems(kwargs):
-            res = [True for s in ["after", "before", "on"] if s in k]
+            # Match whole words, so that e.g. "concurrency" is left alone
+            res = [True for s in ["after", "before", "on"]
+                   if s in k.split("_")]
             if len(res):
                 kwargs[k] = parse_date(v)
         return myfunc(*args, **kwargs)
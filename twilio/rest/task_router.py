@@ -12,6 +12,58 @@ from twilio.rest.resources import (
 )
 
 
+class TaskRouterWorkspace(object):
+    """
+    The list resources of one TaskRouter Workspace, built once and shared,
+    as returned by :meth:`TwilioTaskRouterClient.workspace`.
+
+    .. attribute:: activities
+
+        The :class:`Activities` of the Workspace
+
+    .. attribute:: events
+
+        The :class:`Events` of the Workspace
+
+    .. attribute:: task_queues
+
+        The :class:`TaskQueues` of the Workspace
+
+    .. attribute:: tasks
+
+        The :class:`Tasks` of the Workspace
+
+    .. attribute:: workers
+
+        The :class:`Workers` of the Workspace
+
+    .. attribute:: workflows
+
+        The :class:`Workflows` of the Workspace
+    """
+
+    def __init__(self, workspace_uri, workspace_sid, auth, timeout):
+        self.sid = workspace_sid
+        self.base_uri = "{0}/{1}".format(workspace_uri, workspace_sid)
+        self.auth = auth
+        self.timeout = timeout
+
+        self.activities = Activities(self.base_uri, auth, timeout)
+        self.events = Events(self.base_uri, auth, timeout)
+        self.task_queues = TaskQueues(self.base_uri, auth, timeout)
+        self.tasks = Tasks(self.base_uri, auth, timeout)
+        self.workers = Workers(self.base_uri, auth, timeout)
+        self.workflows = Workflows(self.base_uri, auth, timeout)
+
+    def reservations(self, task_sid):
+        """
+        Return a :class:`Reservations` instance for the :class:`Reservation`
+        with the given task_sid
+        """
+        base_uri = "{0}/Tasks/{1}".format(self.base_uri, task_sid)
+        return Reservations(base_uri, self.auth, self.timeout)
+
+
 class TwilioTaskRouterClient(TwilioClient):
     """
     A client for accessing the Twilio TaskRouter API
@@ -35,60 +87,75 @@ class TwilioTaskRouterClient(TwilioClient):
         self.workspace_uri = "{0}/Workspaces".format(self.base_uri)
 
         self.workspaces = Workspaces(self.base_uri, self.auth, timeout)
+        self.workspace_resources = {}
+
+    def workspace(self, workspace_sid):
+        """
+        Return the :class:`TaskRouterWorkspace` holding the list resources
+        of the Workspace with the given workspace_sid.
+
+        The resources are built on the first call for each Workspace and
+        reused after that, so it's cheap to call for every request:
+
+        .. code-block:: python
+
+            workspace = client.workspace(WORKSPACE_SID)
+            workspace.tasks.update(task_sid, assignment_status="completed")
+            workspace.workers.update(worker_sid, activity_sid=IDLE_SID)
+        """
+        workspace = self.workspace_resources.get(workspace_sid)
+        if workspace is None:
+            workspace = TaskRouterWorkspace(self.workspace_uri, workspace_sid,
+                                            self.auth, self.timeout)
+            # A racing thread may build a second one, which is harmless
+            self.workspace_resources[workspace_sid] = workspace
+        return workspace
 
     def activities(self, workspace_sid):
         """
         Return a :class:`Activities` instance for the :class:`Activity`
         with the given workspace_sid
         """
-        base_uri = "{0}/{1}".format(self.workspace_uri, workspace_sid)
-        return Activities(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).activities
 
     def events(self, workspace_sid):
         """
         Return a :class:`Events` instance for the :class:`Event` with the given
         workspace_sid
         """
-        base_uri = "{0}/{1}".format(self.workspace_uri, workspace_sid)
-        return Events(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).events
 
     def reservations(self, workspace_sid, task_sid):
         """
         Return a :class:`Reservations` instance for the :class:`Reservation`
         with the given workspace_sid ans task_sid
         """
-        base_uri = "{0}/{1}/Tasks/{2}".format(self.workspace_uri,
-                                              workspace_sid, task_sid)
-        return Reservations(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).reservations(task_sid)
 
     def task_queues(self, workspace_sid):
         """
         Return a :class:`TaskQueues` instance for the :class:`TaskQueue` with
         the given workspace_sid
         """
-        base_uri = "{0}/{1}".format(self.workspace_uri, workspace_sid)
-        return TaskQueues(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).task_queues
 
     def tasks(self, workspace_sid):
         """
         Return a :class:`Tasks` instance for the :class:`Task` with the given
         workspace_sid
         """
-        base_uri = "{0}/{1}".format(self.workspace_uri, workspace_sid)
-        return Tasks(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).tasks
 
     def workers(self, workspace_sid):
         """
         Return a :class:`Workers` instance for the :class:`Worker` with the
         given workspace_sid
         """
-        base_uri = "{0}/{1}".format(self.workspace_uri, workspace_sid)
-        return Workers(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).workers
 
     def workflows(self, workspace_sid):
         """
         Return a :class:`Workflows` instance for the :class:`Workflow` with the
         given workspace_sid
         """
-        base_uri = "{0}/{1}".format(self.workspace_uri, workspace_sid)
-        return Workflows(base_uri, self.auth, self.timeout)
+        return self.workspace(workspace_sid).workflows
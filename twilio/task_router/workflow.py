@@ -0,0 +1,485 @@
+"""
+Evaluate a TaskRouter Workflow configuration locally, to see where tasks
+would be routed without creating any.
+"""
+from __future__ import division
+
+import re
+import time
+from collections import namedtuple
+from functools import reduce
+
+from six import string_types
+
+from ..exceptions import TwilioException
+from ..rest.resources.imports import json
+from ..rest.resources.task_router.mirror import parse_attributes
+
+TASK, WORKER = 0, 1
+
+# A value for attributes which are not set, which compares false to
+# everything
+MISSING = object()
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)(?![\w.])
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<op>==|!=|>=|<=|>|<|\(|\)|\[|\]|,)
+      | (?P<name>[A-Za-z_][\w.\-]*)
+    )""", re.VERBOSE)
+
+KEYWORDS = ("and", "or", "not", "in", "has", "contains")
+CONSTANTS = {"true": True, "false": False, "null": None}
+
+
+def equal(a, b):
+    return a == b
+
+
+def not_equal(a, b):
+    return a != b
+
+
+def greater(a, b):
+    return a > b
+
+
+def greater_equal(a, b):
+    return a >= b
+
+
+def less(a, b):
+    return a < b
+
+
+def less_equal(a, b):
+    return a <= b
+
+
+def is_in(a, b):
+    return isinstance(b, list) and a in b
+
+
+def not_in(a, b):
+    return isinstance(b, list) and a not in b
+
+
+def has(a, b):
+    return isinstance(a, list) and b in a
+
+
+def contains(a, b):
+    if isinstance(a, string_types):
+        return isinstance(b, string_types) and b in a
+    return has(a, b)
+
+
+OPERATORS = {
+    "==": equal,
+    "!=": not_equal,
+    ">": greater,
+    ">=": greater_equal,
+    "<": less,
+    "<=": less_equal,
+    "in": is_in,
+    "not in": not_in,
+    "has": has,
+    "contains": contains,
+}
+
+
+def both(a, b):
+    return lambda context: a(context) and b(context)
+
+
+def either(a, b):
+    return lambda context: a(context) or b(context)
+
+
+def tokenize(expression):
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = TOKEN.match(expression, pos)
+        if match is None:
+            raise TwilioException("Invalid expression %r at %d" %
+                                  (expression, pos))
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value) if "." in value else int(value)
+        elif kind == "string":
+            value = value[1:-1]
+        elif kind == "name" and value.lower() in KEYWORDS:
+            kind, value = "op", value.lower()
+        elif kind == "name" and value.lower() in CONSTANTS:
+            kind, value = "constant", CONSTANTS[value.lower()]
+        tokens.append((kind, value))
+    return tokens
+
+
+class Expression(object):
+    """
+    A TaskRouter expression, compiled into a function of a (task
+    attributes, worker attributes) pair.
+
+    Expressions support ``==``, ``!=``, ``>``, ``>=``, ``<``, ``<=``,
+    ``IN``, ``NOT IN``, ``HAS`` and ``CONTAINS`` between attributes,
+    strings, numbers and lists, combined with ``AND``, ``OR``, ``NOT`` and
+    parentheses. A comparison with an attribute which isn't set is false.
+
+    :param str expression: The expression
+    :param int scope: Whose attributes names without a ``task.`` or
+        ``worker.`` prefix refer to, :data:`TASK` or :data:`WORKER`
+
+    .. attribute:: scopes
+
+        The set of scopes the expression reads attributes from. An
+        expression without :data:`TASK` gives the same result for a worker
+        whatever the task.
+    """
+
+    def __init__(self, expression, scope=TASK):
+        self.expression = expression
+        self.scope = scope
+        self.scopes = set()
+        self.tokens = tokenize(expression)
+        self.pos = 0
+        if not self.tokens:
+            raise TwilioException("Empty expression")
+        self.match = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise TwilioException("Unexpected %r in expression %r" % (
+                self.tokens[self.pos][1], expression))
+        del self.tokens
+
+    def __call__(self, context):
+        return self.match(context)
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None, None
+
+    def take(self, value=None):
+        if self.pos >= len(self.tokens):
+            raise TwilioException("Unexpected end of expression %r" %
+                                  self.expression)
+        token = self.tokens[self.pos]
+        if value is not None and token != ("op", value):
+            raise TwilioException("Expected %r in expression %r" %
+                                  (value, self.expression))
+        self.pos += 1
+        return token
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek() == ("op", "or"):
+            self.take()
+            terms.append(self.parse_and())
+        return reduce(either, terms)
+
+    def parse_and(self):
+        terms = [self.parse_not()]
+        while self.peek() == ("op", "and"):
+            self.take()
+            terms.append(self.parse_not())
+        return reduce(both, terms)
+
+    def parse_not(self):
+        if self.peek() == ("op", "not"):
+            self.take()
+            term = self.parse_not()
+            return lambda context: not term(context)
+        if self.peek() == ("op", "("):
+            self.take()
+            term = self.parse_or()
+            self.take(")")
+            return term
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        left, left_constant = self.parse_operand()
+
+        kind, value = self.peek()
+        if kind == "op" and value == "not":
+            self.take()
+            self.take("in")
+            value = "not in"
+        elif kind == "op" and value in OPERATORS:
+            self.take()
+        else:
+            # A bare operand, like "true", is a test of its truth
+            if left_constant:
+                result = bool(left(None))
+                return lambda context: result
+            return lambda context: left(context) not in (MISSING, None,
+                                                         False)
+
+        compare = OPERATORS[value]
+        right, right_constant = self.parse_operand()
+        if left_constant and right_constant:
+            result = self.safely(compare, left(None), right(None))
+            return lambda context: result
+        if compare is equal and right_constant:
+            # The common case, which needs no guard as MISSING equals
+            # nothing
+            constant = right(None)
+            return lambda context: left(context) == constant
+
+        safely = self.safely
+        return lambda context: safely(compare, left(context), right(context))
+
+    @staticmethod
+    def safely(compare, a, b):
+        if a is MISSING or b is MISSING:
+            return False
+        try:
+            return compare(a, b)
+        except TypeError:
+            # Python 3 refuses to order different types
+            return False
+
+    def parse_operand(self):
+        """Return a function of the context giving the operand's value, and
+        whether that value is a constant"""
+        kind, value = self.take()
+        if kind in ("number", "string", "constant"):
+            return (lambda context: value), True
+        if kind == "name":
+            return self.attribute(value), False
+        if (kind, value) == ("op", "["):
+            items = []
+            while self.peek() != ("op", "]"):
+                item, constant = self.parse_operand()
+                if not constant:
+                    raise TwilioException("Lists may only hold constants in "
+                                          "expression %r" % self.expression)
+                items.append(item(None))
+                if self.peek() == ("op", ","):
+                    self.take()
+            self.take("]")
+            return (lambda context: items), True
+        raise TwilioException("Unexpected %r in expression %r" %
+                              (value, self.expression))
+
+    def attribute(self, name):
+        scope = self.scope
+        path = name.split(".")
+        if path[0] in ("task", "worker") and len(path) > 1:
+            scope = TASK if path[0] == "task" else WORKER
+            path = path[1:]
+        self.scopes.add(scope)
+
+        if len(path) == 1:
+            key = path[0]
+            return lambda context: context[scope].get(key, MISSING)
+
+        def get(context):
+            value = context[scope]
+            for key in path:
+                if not isinstance(value, dict):
+                    return MISSING
+                value = value.get(key, MISSING)
+            return value
+        return get
+
+
+WorkerSnapshot = namedtuple("WorkerSnapshot", "sid attributes available")
+
+Target = namedtuple("Target", "queue priority expression workers")
+
+Filter = namedtuple("Filter", "name expression targets")
+
+# Where a task would be routed: the friendly name of the filter it matched,
+# or None for the default filter, the sid of the TaskQueue, the priority set
+# by the target, if any, and the sids of the available workers who could be
+# reserved for it
+Route = namedtuple("Route", "filter queue priority workers")
+
+
+def snapshot_worker(worker):
+    """Return a :class:`WorkerSnapshot` of a Worker instance resource or
+    dict"""
+    if isinstance(worker, dict):
+        return WorkerSnapshot(worker["sid"],
+                              parse_attributes(worker.get("attributes")),
+                              worker.get("available", True))
+    return WorkerSnapshot(worker.sid, parse_attributes(worker.attributes),
+                          worker.available)
+
+
+class WorkflowEvaluator(object):
+    """
+    Route tasks through a Workflow configuration locally, against a
+    snapshot of Workers and TaskQueues.
+
+    The configuration is compiled once: every expression becomes a Python
+    function, the workers in each TaskQueue are found up front, and so are
+    the workers for each target whose expression doesn't depend on the
+    task. Routing a task then only evaluates the filter expressions, and
+    any target expressions which refer to ``task.`` attributes.
+
+    Each task goes to the first filter it matches, or the default filter.
+    Of that filter's targets, it goes to the first with an available
+    worker, or, if none has one, the first, where it would wait.
+
+    Usage:
+
+    .. code-block:: python
+
+        evaluator = WorkflowEvaluator(CONFIGURATION,
+                                      client.workers(WORKSPACE_SID).iter(),
+                                      client.task_queues(WORKSPACE_SID).iter())
+        outcomes = evaluator.simulate(synthetic_tasks())
+        for (filter_name, queue), count in outcomes.items():
+            print("%s -> %s: %d" % (filter_name, queue, count))
+        print("%d unassigned at %.0f tasks/s" % (evaluator.unassigned,
+                                                  evaluator.rate))
+
+    :param configuration: The Workflow configuration, as JSON or a dict
+    :param workers: The :class:`Worker` resources, or dicts with ``sid``,
+        ``attributes`` and ``available`` keys
+    :param task_queues: The :class:`TaskQueue` resources, or a dict of
+        TaskQueue sids to their ``target_workers`` expressions
+    :raises: a :exc:`~twilio.TwilioException` if the configuration or one
+        of its expressions is invalid, or it refers to an unknown TaskQueue
+
+    .. attribute:: outcomes
+
+        The number of tasks routed to each (filter name, TaskQueue sid)
+        pair so far.
+
+    .. attribute:: evaluated
+
+        The number of tasks routed so far.
+
+    .. attribute:: unassigned
+
+        The number of tasks routed so far with no available worker.
+
+    .. attribute:: elapsed
+
+        The seconds spent in :meth:`run` so far.
+    """
+
+    def __init__(self, configuration, workers, task_queues):
+        if isinstance(configuration, string_types):
+            try:
+                configuration = json.loads(configuration)
+            except ValueError:
+                raise TwilioException("Workflow configuration is not JSON")
+
+        self.workers = [snapshot_worker(worker) for worker in workers]
+        if not isinstance(task_queues, dict):
+            task_queues = dict((queue.sid, queue.target_workers)
+                               for queue in task_queues)
+        self.queue_workers = {}
+        for sid, target_workers in task_queues.items():
+            self.queue_workers[sid] = self.select(
+                Expression(target_workers or "1 == 1", WORKER))
+
+        routing = configuration.get("task_routing", {})
+        self.filters = []
+        for config in routing.get("filters", []):
+            name = config.get("filter_friendly_name",
+                              config.get("friendly_name"))
+            expression = Expression(config.get("expression", "1 == 1"),
+                                    TASK)
+            targets = [self.target(target)
+                       for target in config.get("targets", [])]
+            self.filters.append(Filter(name, expression, targets))
+
+        default = routing.get("default_filter")
+        self.default_targets = [self.target(default)] if default else []
+
+        self.outcomes = {}
+        self.evaluated = 0
+        self.unassigned = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        """The number of tasks routed per second"""
+        return self.evaluated / self.elapsed if self.elapsed else 0.0
+
+    def select(self, expression, workers=None):
+        """Return the available workers, of workers or the snapshot, that
+        expression matches regardless of the task"""
+        if workers is None:
+            workers = [worker for worker in self.workers if worker.available]
+        return [worker for worker in workers
+                if expression(({}, worker.attributes))]
+
+    def target(self, config):
+        queue = config.get("queue", config.get("task_queue_sid"))
+        if queue not in self.queue_workers:
+            raise TwilioException("Unknown TaskQueue %s" % queue)
+
+        workers = self.queue_workers[queue]
+        expression = config.get("expression")
+        if expression:
+            expression = Expression(expression, WORKER)
+            if TASK not in expression.scopes:
+                workers = self.select(expression, workers)
+                expression = None
+        else:
+            expression = None
+        return Target(queue, config.get("priority"), expression, workers)
+
+    def route(self, attributes):
+        """Return the :class:`Route` a task with attributes would take, or
+        None if it matches no filter and there is no default filter"""
+        context = (attributes, None)
+        name = None
+        targets = self.default_targets
+        for candidate in self.filters:
+            if candidate.expression(context):
+                name = candidate.name
+                targets = candidate.targets
+                break
+
+        first = None
+        for target in targets:
+            workers = target.workers
+            if target.expression is not None:
+                match = target.expression
+                workers = [worker for worker in workers
+                           if match((attributes, worker.attributes))]
+            route = Route(name, target.queue, target.priority,
+                          [worker.sid for worker in workers])
+            if route.workers:
+                return route
+            if first is None:
+                first = route
+        return first
+
+    def run(self, tasks):
+        """
+        Route every task, yielding a :class:`Route`, or None, for each in
+        turn and counting the outcomes.
+
+        :param tasks: An iterable of task attribute dicts
+        """
+        started = time.time() - self.elapsed
+        for attributes in tasks:
+            route = self.route(attributes)
+            if route is None:
+                key = (None, None)
+            else:
+                key = (route.filter, route.queue)
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+            if route is None or not route.workers:
+                self.unassigned += 1
+            self.evaluated += 1
+            self.elapsed = time.time() - started
+            yield route
+
+    def simulate(self, tasks):
+        """Route every task, returning :attr:`outcomes`"""
+        for _ in self.run(tasks):
+            pass
+        return self.outcomes
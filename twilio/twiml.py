@@ -2,37 +2,93 @@
 Make sure to check out the TwiML overview and tutorial at
 https://www.twilio.com/docs/api/twiml
 """
+import re
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
 
+from six import string_types, text_type
+
+from .cache import LRUCache
 from .exceptions import TwimlException
 
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+CONTENT_TYPE = "application/xml; charset=utf-8"
+CHUNK_SIZE = 16 * 1024
+HTTP_METHODS = ("GET", "POST")
+
+
+def escape_text(text):
+    """Escape text for use as the content of an element"""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attr(value):
+    """Escape an attribute value for use between double quotes"""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if "\"" in value:
+        value = value.replace("\"", "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def format_attr(value):
+    """Return the string form of an attribute value"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, string_types):
+        return value
+    return str(value)
+
 
 class Verb(object):
     """Twilio basic verb object.
     """
+    __slots__ = ("name", "body", "verbs", "attrs")
+
     GET = "GET"
     POST = "POST"
     nestables = None
 
+    #: The values allowed for attributes which take one of a fixed set
+    choices = {
+        "method": HTTP_METHODS,
+        "waitMethod": HTTP_METHODS,
+    }
+
     def __init__(self, **kwargs):
         self.name = self.__class__.__name__
         self.body = None
         self.verbs = []
-        self.attrs = {}
+        self.attrs = attrs = {}
 
-        if kwargs.get("waitMethod", "GET") not in ["GET", "POST"]:
-            raise TwimlException("Invalid waitMethod parameter, "
-                                 "must be 'GET' or 'POST'")
-
-        if kwargs.get("method", "GET") not in ["GET", "POST"]:
-            raise TwimlException("Invalid method parameter, "
-                                 "must be 'GET' or 'POST'")
+        if not kwargs:
+            return
 
+        choices = self.choices
         for k, v in kwargs.items():
-            if k == "sender":
-                k = "from"
+            if k in choices and v not in choices[k]:
+                raise TwimlException("Invalid %s parameter, must be %s" % (
+                    k, " or ".join("'%s'" % c for c in choices[k])))
             if v is not None:
-                self.attrs[k] = v
+                if k == "sender":
+                    k = "from"
+                attrs[k] = v
 
     def __str__(self):
         return self.toxml()
@@ -50,14 +106,133 @@ class Verb(object):
         :param bool xml_declaration: Include the XML declaration. Defaults to
                                      True
         """
-        xml = ET.tostring(self.xml()).decode('utf-8')
+        out = [XML_DECLARATION] if xml_declaration else []
+        self.serialize(out)
 
-        if xml_declaration:
-            return '<?xml version="1.0" encoding="UTF-8"?>' + xml
-        else:
-            return xml
+        # Markup is ASCII, so only text and attribute values can hold
+        # anything that needs a character reference
+        xml = "".join(out)
+        return xml.encode("ascii", "xmlcharrefreplace").decode("ascii")
+
+    def tobytes(self, xml_declaration=True):
+        """
+        Return the contents of this verb as UTF-8 encoded XML
+
+        :param bool xml_declaration: Include the XML declaration. Defaults to
+                                     True
+        """
+        out = [XML_DECLARATION] if xml_declaration else []
+        self.serialize(out)
+        return "".join(out).encode("ascii", "xmlcharrefreplace")
+
+    def iter_bytes(self, chunk_size=CHUNK_SIZE, xml_declaration=True):
+        """
+        Yield the contents of this verb as UTF-8 encoded XML, in chunks of
+        roughly chunk_size bytes.
+
+        The document is serialized as it is consumed, so a large response
+        never has to be held in memory as one string.
+
+        :param int chunk_size: The size at which a chunk is yielded
+        :param bool xml_declaration: Include the XML declaration. Defaults to
+                                     True
+        """
+        out = [XML_DECLARATION] if xml_declaration else []
+        size = len(out[0]) if out else 0
+
+        stack = [(iter([self]), None)]
+        while stack:
+            verbs, end = stack[-1]
+            verb = next(verbs, None)
+            if verb is None:
+                stack.pop()
+                if end is None:
+                    continue
+                fragment = end
+            else:
+                fragment = verb.start_tag()
+                if verb.body or verb.verbs:
+                    stack.append((iter(verb.verbs), "</%s>" % verb.name))
+
+            out.append(fragment)
+            size += len(fragment)
+            if size >= chunk_size:
+                yield "".join(out).encode("ascii", "xmlcharrefreplace")
+                out = []
+                size = 0
+
+        if out:
+            yield "".join(out).encode("ascii", "xmlcharrefreplace")
+
+    def start_tag(self):
+        """
+        Return the start tag and text of this verb, or the whole element if
+        it has no content.
+        """
+        tag = "<" + self.name
+
+        attrs = self.attrs
+        if attrs:
+            for key in sorted(attrs):
+                value = escape_attr(format_attr(attrs[key]))
+                tag += ' %s="%s"' % (key, value)
+
+        if self.body or self.verbs:
+            if self.body:
+                return tag + ">" + escape_text(self.body)
+            return tag + ">"
+        return tag + " />"
+
+    def structure(self):
+        """
+        Return a hashable summary of this verb and everything nested in it.
+
+        Verbs with equal structures serialize to the same XML.
+        """
+        out = []
+        self.describe(out)
+        return tuple(out)
+
+    def describe(self, out):
+        """
+        Append the name, body and attributes of this verb, followed by the
+        number of verbs nested in it and their descriptions, to the list
+        out.
+        """
+        out.append(self.name)
+        out.append(self.body)
+
+        attrs = self.attrs
+        if attrs:
+            for key in sorted(attrs):
+                value = attrs[key]
+                out.append(key)
+                if value.__class__ is not str:
+                    # Attribute values are compared as they are written, so
+                    # True and 1 differ.
+                    value = format_attr(value)
+                out.append(value)
+
+        out.append(len(self.verbs))
+        for verb in self.verbs:
+            verb.describe(out)
+
+    def serialize(self, out):
+        """
+        Append the XML for this verb and everything nested in it to the
+        list out, as strings.
+
+        The output is the same as serializing :meth:`xml` with ElementTree,
+        except that characters outside ASCII are left as they are.
+        """
+        out.append(self.start_tag())
+        if self.body or self.verbs:
+            for verb in self.verbs:
+                verb.serialize(out)
+            out.append("</%s>" % self.name)
 
     def xml(self):
+        """Return the contents of this verb as an ElementTree Element"""
         el = ET.Element(self.name)
 
         keys = self.attrs.keys()
@@ -88,7 +263,8 @@ class Verb(object):
 
 class Response(Verb):
     """Twilio response object."""
-    nestables = [
+    __slots__ = ()
+    nestables = frozenset([
         'Say',
         'Play',
         'Gather',
@@ -102,7 +278,7 @@ class Response(Verb):
         'Enqueue',
         'Leave',
         'Message',
-    ]
+    ])
 
     def __init__(self, **kwargs):
         """Version: Twilio API version e.g. 2008-08-01 """
@@ -221,6 +397,7 @@ class Say(Verb):
                  Specifying '0' will cause the the :class:`Say` verb to loop
                  until the call is hung up. Defaults to 1.
     """
+    __slots__ = ()
     MAN = 'man'
     WOMAN = 'woman'
 
@@ -253,6 +430,8 @@ class Play(Verb):
                  Specifying '0' will cause the the :class:`Play` verb to loop
                  until the call is hung up. Defaults to 1.
     """
+    __slots__ = ()
+
     def __init__(self, url=None, digits=None, **kwargs):
         if url is None and digits is None:
             raise TwimlException(
@@ -272,6 +451,7 @@ class Pause(Verb):
     :param length: specifies how many seconds Twilio will wait silently before
                    continuing on.
     """
+    __slots__ = ()
 
 
 class Redirect(Verb):
@@ -282,6 +462,7 @@ class Redirect(Verb):
 
     :param method: specifies the HTTP method to use when retrieving the url
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -293,6 +474,7 @@ class Redirect(Verb):
 class Hangup(Verb):
     """Hangup the call
     """
+    __slots__ = ()
 
 
 class Reject(Verb):
@@ -300,6 +482,7 @@ class Reject(Verb):
 
     :param reason: not sure
     """
+    __slots__ = ()
 
 
 class Gather(Verb):
@@ -311,9 +494,10 @@ class Gather(Verb):
     :param timeout: wait for this many seconds before returning
     :param finishOnKey: key that triggers the end of caller input
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
-    nestables = ['Say', 'Play', 'Pause']
+    nestables = frozenset(['Say', 'Play', 'Pause'])
 
     def __init__(self, **kwargs):
         super(Gather, self).__init__(**kwargs)
@@ -343,6 +527,8 @@ class Number(Verb):
     :param number: phone number to dial
     :param sendDigits: key to press after connecting to the number
     """
+    __slots__ = ()
+
     def __init__(self, number, **kwargs):
         super(Number, self).__init__(**kwargs)
         self.body = number
@@ -353,6 +539,8 @@ class Client(Verb):
 
     :param name: Client name to connect to
     """
+    __slots__ = ()
+
     def __init__(self, name, **kwargs):
         super(Client, self).__init__(**kwargs)
         self.body = name
@@ -367,6 +555,7 @@ class Sms(Verb):
     :param method: submit to 'action' url using GET or POST
     :param statusCallback: url to hit when the message is actually sent
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -384,11 +573,12 @@ class Message(Verb):
     :param method: submit to 'action' url using GET or POST
     :param statusCallback: url to hit when the message is actually sent
     """
+    __slots__ = ()
 
     GET = 'GET'
     POST = 'POST'
 
-    nestables = ['Media', 'Body']
+    nestables = frozenset(['Media', 'Body'])
 
     def __init__(self, msg=None, **kwargs):
         super(Message, self).__init__(**kwargs)
@@ -404,6 +594,7 @@ class Body(Verb):
 
     :param msg: the text to use in the body.
     """
+    __slots__ = ()
 
     GET = 'GET'
     POST = 'POST'
@@ -418,6 +609,7 @@ class Media(Verb):
 
     :param url: The URL of the media to include.
     """
+    __slots__ = ()
 
     GET = 'GET'
     POST = 'POST'
@@ -438,6 +630,7 @@ class Conference(Verb):
     :param waitUrl: TwiML url that executes before conference starts
     :param waitMethod: HTTP method for waitUrl GET/POST
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -459,9 +652,10 @@ class Dial(Verb):
     :param callerId: The caller ID that will appear to the called party
     :param bool record: Record both legs of a call within this <Dial>
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
-    nestables = ['Number', 'Conference', 'Client', 'Queue', 'Sip']
+    nestables = frozenset(['Number', 'Conference', 'Client', 'Queue', 'Sip'])
 
     def __init__(self, number=None, **kwargs):
         super(Dial, self).__init__(**kwargs)
@@ -501,6 +695,7 @@ class Queue(Verb):
                 and before the call is connected
     :param method: HTTP method for url GET/POST
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -521,6 +716,7 @@ class Enqueue(Verb):
                      while the call is on the queue
     :param waitUrlMethod: HTTP method for waitUrl GET/POST
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -532,6 +728,7 @@ class Enqueue(Verb):
 class Leave(Verb):
     """Signals the call to leave its queue
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -544,6 +741,7 @@ class Record(Verb):
     :param maxLength: maximum number of seconds to record
     :param timeout: seconds of silence before considering the recording done
     """
+    __slots__ = ()
     GET = 'GET'
     POST = 'POST'
 
@@ -556,7 +754,8 @@ class Sip(Verb):
     :param username: Username for SIP authentication
     :param password: Password for SIP authentication
     """
-    nestables = ['Headers', 'Uri']
+    __slots__ = ()
+    nestables = frozenset(['Headers', 'Uri'])
 
     def __init__(self, sip_address=None, **kwargs):
         super(Sip, self).__init__(**kwargs)
@@ -569,6 +768,323 @@ class Sip(Verb):
 
 class Uri(Verb):
     """A uniform resource indentifier"""
+    __slots__ = ()
+
     def __init__(self, uri, **kwargs):
         super(Uri, self).__init__(**kwargs)
         self.body = uri
+
+
+SLOT_NAME = re.compile(r'^\w+$')
+SLOT_PATTERN = re.compile('\x00(\\w+)\x00')
+
+
+class Slot(text_type):
+    """A named placeholder for a value that is filled in when a
+    :class:`Template` is rendered.
+
+    A Slot can be used anywhere a verb takes text or an attribute value,
+    alone or as part of a longer string.
+
+    :param str name: The keyword argument that supplies this slot's value
+        to :meth:`Template.render`
+    """
+
+    def __new__(cls, name):
+        if not SLOT_NAME.match(name):
+            raise TwimlException("Invalid slot name %r" % name)
+        slot = super(Slot, cls).__new__(cls, "\x00%s\x00" % name)
+        slot.slot_name = name
+        return slot
+
+
+class Template(object):
+    """A TwiML response compiled into pre-serialized fragments.
+
+    Build a response once, using :class:`Slot` objects for the values which
+    change between requests, then render it as often as needed. Rendering
+    only escapes the slot values and joins byte strings, so no verbs are
+    built or validated per request.
+
+    Usage:
+
+    .. code-block:: python
+
+        r = twiml.Response()
+        r.say(Slot("greeting"), voice="alice")
+        r.dial(Slot("number"), callerId="+15558675309")
+        template = twiml.Template(r)
+
+        template.render(greeting="Connecting you now", number="+15551234567")
+
+    The output matches :meth:`Verb.toxml` for the same values, except that
+    an element whose only content is a slot rendered as an empty string is
+    written ``<Say></Say>`` rather than ``<Say />``.
+
+    :param verb: The :class:`Verb`, usually a :class:`Response`, to compile
+    :param bool xml_declaration: Include the XML declaration. Defaults to
+                                 True
+    """
+
+    def __init__(self, verb, xml_declaration=True):
+        out = [XML_DECLARATION] if xml_declaration else []
+        verb.serialize(out)
+        parts = SLOT_PATTERN.split("".join(out))
+
+        self.fragments = []
+        self.slots = []
+        in_tag = False
+        for i, part in enumerate(parts):
+            if i % 2:
+                self.slots.append((part, in_tag))
+                continue
+
+            self.fragments.append(
+                part.encode("ascii", "xmlcharrefreplace"))
+            # Markup is escaped inside text and attribute values, so the
+            # last bracket says whether the next slot is inside a tag.
+            opened, closed = part.rfind("<"), part.rfind(">")
+            if opened != closed:
+                in_tag = opened > closed
+
+    @property
+    def names(self):
+        """The set of slot names this template needs values for"""
+        return set(name for name, _ in self.slots)
+
+    def render(self, **values):
+        """
+        Return the TwiML for this template as UTF-8 encoded bytes, with each
+        slot replaced by the keyword argument of the same name.
+
+        :raises: a :exc:`TwimlException` if a slot has no value
+        """
+        fragments = self.fragments
+        chunks = [fragments[0]]
+        for i, (name, in_tag) in enumerate(self.slots):
+            try:
+                value = format_attr(values[name])
+            except KeyError:
+                raise TwimlException("No value for slot %r" % name)
+
+            if in_tag:
+                value = escape_attr(value)
+            else:
+                value = escape_text(value)
+
+            chunks.append(value.encode("ascii", "xmlcharrefreplace"))
+            chunks.append(fragments[i + 1])
+        return b"".join(chunks)
+
+
+class ResponseCache(object):
+    """A cache of serialized TwiML, keyed by the structure of the verbs it
+    came from.
+
+    Handlers which often return the same response, such as a menu prompt,
+    can look up the bytes for a freshly built response instead of
+    serializing it again.
+
+    Usage:
+
+    .. code-block:: python
+
+        cache = twiml.ResponseCache(maxsize=256)
+
+        def menu(request):
+            r = twiml.Response()
+            with r.gather(action="/menu", numDigits=1) as g:
+                g.say("Press 1 for sales, or 2 for support")
+            return cache.tobytes(r)
+
+    :param int maxsize: The most responses to keep
+    :param bool xml_declaration: Include the XML declaration. Defaults to
+                                 True
+    """
+
+    def __init__(self, maxsize=1024, xml_declaration=True):
+        self.lru = LRUCache(maxsize)
+        self.xml_declaration = xml_declaration
+
+    @property
+    def hits(self):
+        """The number of responses found in the cache"""
+        return self.lru.hits
+
+    @property
+    def misses(self):
+        """The number of responses that had to be serialized"""
+        return self.lru.misses
+
+    @property
+    def hit_rate(self):
+        """The fraction of responses found in the cache"""
+        return self.lru.hit_rate
+
+    def tobytes(self, verb):
+        """Return the UTF-8 encoded XML for verb, as :meth:`Verb.tobytes`
+        would"""
+        key = verb.structure()
+        body = self.lru.get(key)
+        if body is None:
+            body = verb.tobytes(self.xml_declaration)
+            self.lru.set(key, body)
+        return body
+
+    def clear(self):
+        """Forget every cached response"""
+        self.lru.clear()
+
+    def __len__(self):
+        return len(self.lru)
+
+
+def wsgi_response(verb, start_response, stream=False, status="200 OK"):
+    """
+    Start a WSGI response for verb and return its body iterable.
+
+    Usage:
+
+    .. code-block:: python
+
+        def application(environ, start_response):
+            r = twiml.Response()
+            r.say("Hello")
+            return twiml.wsgi_response(r, start_response)
+
+    :param verb: The :class:`Verb`, usually a :class:`Response`, to send
+    :param start_response: The WSGI start_response callable
+    :param bool stream: Serialize the body as the server sends it, rather
+        than up front. Streamed responses have no Content-Length.
+    :param str status: The HTTP status line
+    """
+    headers = [("Content-Type", CONTENT_TYPE)]
+    if stream:
+        start_response(status, headers)
+        return verb.iter_bytes()
+
+    body = verb.tobytes()
+    headers.append(("Content-Length", str(len(body))))
+    start_response(status, headers)
+    return [body]
+
+
+def asgi_messages(verb, stream=False, status=200):
+    """
+    Yield the ASGI ``http.response.start`` and ``http.response.body``
+    messages for verb.
+
+    Usage:
+
+    .. code-block:: python
+
+        async def app(scope, receive, send):
+            r = twiml.Response()
+            r.say("Hello")
+            for message in twiml.asgi_messages(r):
+                await send(message)
+
+    :param verb: The :class:`Verb`, usually a :class:`Response`, to send
+    :param bool stream: Send the body in chunks as it is serialized, rather
+        than as one message. Streamed responses have no Content-Length.
+    :param int status: The HTTP status code
+    """
+    headers = [(b"content-type", CONTENT_TYPE.encode("ascii"))]
+    if not stream:
+        body = verb.tobytes()
+        headers.append((b"content-length", str(len(body)).encode("ascii")))
+        yield {"type": "http.response.start", "status": status,
+               "headers": headers}
+        yield {"type": "http.response.body", "body": body,
+               "more_body": False}
+        return
+
+    yield {"type": "http.response.start", "status": status,
+           "headers": headers}
+    for chunk in verb.iter_bytes():
+        yield {"type": "http.response.body", "body": chunk,
+               "more_body": True}
+    yield {"type": "http.response.body", "body": b"", "more_body": False}
+
+
+VERBS = dict((cls.__name__, cls) for cls in Verb.__subclasses__())
+
+
+def parse(source):
+    """
+    Parse a TwiML document into a tree of :class:`Verb` objects.
+
+    Elements are mapped straight onto the verb classes in this module and
+    each child is checked against its parent's nestables, so the result can
+    be modified and serialized like a response built by hand.
+
+    Usage:
+
+    .. code-block:: python
+
+        r = twiml.parse(upstream.content)
+        r.verbs.insert(0, twiml.Record(maxLength=3600))
+        body = r.tobytes()
+
+    Text made up only of whitespace, such as indentation, is ignored.
+
+    :param source: The document, as bytes, a string or a file-like object
+    :returns: the root :class:`Verb`, usually a :class:`Response`
+    :raises: a :exc:`TwimlException` if the document is not well-formed, or
+        contains an unknown element or one nested where it is not allowed
+    """
+    stack = []
+    text = []
+    root = []
+
+    def start_element(name, attrs):
+        try:
+            cls = VERBS[name]
+        except KeyError:
+            raise TwimlException("Unknown TwiML element %s" % name)
+
+        verb = cls.__new__(cls)
+        verb.name = name
+        verb.body = None
+        verb.verbs = []
+        verb.attrs = attrs
+
+        if stack:
+            parent = stack[-1]
+            if text:
+                set_body(parent)
+            parent.append(verb)
+        else:
+            root.append(verb)
+        stack.append(verb)
+
+    def end_element(name):
+        verb = stack.pop()
+        if text:
+            set_body(verb)
+
+    def set_body(verb):
+        body = "".join(text)
+        del text[:]
+        if body.strip():
+            verb.body = body if verb.body is None else verb.body + body
+
+    def entity_decl(*args):
+        raise TwimlException("Entity declarations are not allowed in TwiML")
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = text.append
+    parser.EntityDeclHandler = entity_decl
+
+    try:
+        if hasattr(source, "read"):
+            parser.ParseFile(source)
+        else:
+            parser.Parse(source, True)
+    except expat.ExpatError as e:
+        raise TwimlException("Invalid TwiML: %s" % e)
+
+    return root[0]
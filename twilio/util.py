@@ -4,14 +4,40 @@ import time
 from hashlib import sha1
 
 from . import jwt
-from .compat import izip, urlencode
-from six import iteritems, PY3
+from .cache import LRUCache
+from .compat import urlencode
+from six import binary_type, iteritems, PY3
 
 
 class RequestValidator(object):
+    """
+    Validate the signatures on requests from Twilio.
+
+    :param token: Your auth token, or a list of auth tokens. A request
+        signed with any of them is valid, so a new token can be accepted
+        before the old one is retired. Signatures are computed with the
+        first.
+    """
 
     def __init__(self, token):
-        self.token = token.encode("utf-8")
+        if isinstance(token, (list, tuple)):
+            tokens = token
+        else:
+            tokens = [token]
+        self.tokens = [t.encode("utf-8") for t in tokens]
+        self.token = self.tokens[0]
+        # Keyed once here, then copied for each request
+        self.macs = [hmac.new(t, digestmod=sha1) for t in self.tokens]
+
+    @staticmethod
+    def signing_payload(uri, params):
+        """Return the UTF-8 encoded string Twilio signs for a request"""
+        parts = [uri]
+        if params:
+            for k, v in sorted(params.items()):
+                parts.append(k)
+                parts.append(v)
+        return "".join(parts).encode("utf-8")
 
     def compute_signature(self, uri, params, utf=PY3):
         """Compute the signature for a given request
@@ -22,13 +48,8 @@ class RequestValidator(object):
 
         :returns: The computed signature
         """
-        s = uri
-        if len(params) > 0:
-            for k, v in sorted(params.items()):
-                s += k + v
-
-        # compute signature and compare signatures
-        mac = hmac.new(self.token, s.encode("utf-8"), sha1)
+        mac = self.macs[0].copy()
+        mac.update(self.signing_payload(uri, params))
         computed = base64.b64encode(mac.digest())
         if utf:
             computed = computed.decode('utf-8')
@@ -44,7 +65,20 @@ class RequestValidator(object):
 
         :returns: True if the request passes validation, False if not
         """
-        return secure_compare(self.compute_signature(uri, params), signature)
+        if not signature:
+            return False
+        if not isinstance(signature, binary_type):
+            signature = signature.encode("utf-8")
+
+        payload = self.signing_payload(uri, params)
+        valid = False
+        for mac in self.macs:
+            mac = mac.copy()
+            mac.update(payload)
+            # Check every token, so timing doesn't reveal which one matched
+            valid |= secure_compare(base64.b64encode(mac.digest()),
+                                    signature)
+        return valid
 
 
 def secure_compare(string1, string2):
@@ -56,12 +90,7 @@ def secure_compare(string1, string2):
     :returns: True if the strings are equal, False if not
     :rtype: :obj:`bool`
     """
-    if len(string1) != len(string2):
-        return False
-    result = True
-    for c1, c2 in izip(string1, string2):
-        result &= c1 == c2
-    return result
+    return jwt.compare_digest(string1, string2)
 
 
 class TwilioCapability(object):
@@ -164,3 +193,79 @@ class ScopeURI(object):
         else:
             param_string = ''
         return "scope:%s:%s%s" % (self.service, self.privilege, param_string)
+
+
+class CapabilityTokenCache(object):
+    """
+    Hand out the same capability token for the same permissions until it is
+    due for refresh, instead of signing a new one for every request.
+
+    A token is reused until ``refresh`` of its lifetime has passed, then a
+    new one is generated, so a token handed out is always valid for at
+    least ``(1 - refresh) * expires`` seconds.
+
+    Usage:
+
+    .. code-block:: python
+
+        tokens = CapabilityTokenCache(expires=3600, refresh=0.5)
+
+        def token_for(client_name):
+            capability = TwilioCapability(ACCOUNT_SID, AUTH_TOKEN)
+            capability.allow_client_incoming(client_name)
+            return tokens.generate(capability)
+
+    :param int expires: The lifetime, in seconds, of each token
+    :param float refresh: The fraction of its lifetime after which a token
+        is replaced
+    :param int maxsize: The most tokens to keep
+
+    .. attribute:: mints
+
+        The number of tokens generated.
+
+    .. attribute:: reuses
+
+        The number of times a cached token was handed out.
+    """
+
+    def __init__(self, expires=3600, refresh=0.5, maxsize=1024):
+        self.expires = expires
+        self.refresh = refresh
+        self.tokens = LRUCache(maxsize)
+        self.mints = 0
+        self.reuses = 0
+
+    def key(self, capability):
+        """Return a hashable summary of the permissions in capability"""
+        scopes = []
+        for name, scope in sorted(iteritems(capability.capabilities)):
+            # generate() copies the client name into the outgoing scope, so
+            # leave it out to match before and after
+            params = tuple(sorted(
+                (k, v) for k, v in iteritems(scope.params or {})
+                if not (name == "outgoing" and k == "clientName")))
+            scopes.append((name, scope.service, scope.privilege, params))
+        return (capability.account_sid, capability.auth_token,
+                capability.client_name, tuple(scopes))
+
+    def generate(self, capability):
+        """Return a token for capability, generating one only if there is
+        no cached token or it is due for refresh"""
+        key = self.key(capability)
+        now = time.time()
+        cached = self.tokens.get(key)
+        if cached is not None:
+            token, refresh_at = cached
+            if now < refresh_at:
+                self.reuses += 1
+                return token
+
+        token = capability.generate(self.expires)
+        self.tokens.set(key, (token, now + self.expires * self.refresh))
+        self.mints += 1
+        return token
+
+    def clear(self):
+        """Forget every cached token"""
+        self.tokens.clear()
@@ -0,0 +1,134 @@
+"""
+WSGI middleware which checks that requests really came from Twilio.
+"""
+from io import BytesIO
+
+from six import PY3
+from six.moves.urllib.parse import parse_qsl, quote
+
+from .util import RequestValidator
+
+PARAMS_KEY = "twilio.params"
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+MAX_BODY_SIZE = 1024 * 1024
+# The characters RFC 3986 allows unescaped in a path, which Twilio signs as
+# they appear in the webhook URL
+PATH_SAFE = "/:@!$&'()*+,;=~"
+
+
+def parse_form(body):
+    """Return the fields of an x-www-form-urlencoded body, given as bytes,
+    as a dict of strings"""
+    if PY3:
+        return dict(parse_qsl(body.decode("utf-8"), keep_blank_values=True))
+
+    params = {}
+    for key, value in parse_qsl(body, keep_blank_values=True):
+        params[key.decode("utf-8")] = value.decode("utf-8")
+    return params
+
+
+def is_form(content_type):
+    """Return True if content_type is the x-www-form-urlencoded type"""
+    return content_type.split(";", 1)[0].strip().lower() == FORM_CONTENT_TYPE
+
+
+def request_url(environ, base_url=None):
+    """
+    Return the URL Twilio requested, from a WSGI environ.
+
+    :param str base_url: The scheme and host, and optionally a path prefix,
+        to use in place of the ones the server saw. Set this when the
+        application sits behind a proxy which changes them.
+    """
+    # Servers which keep the path as it was sent save us from guessing how
+    # it was escaped
+    path = environ.get("REQUEST_URI") or environ.get("RAW_URI")
+    if not path:
+        path = environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", "")
+        if PY3:
+            # PEP 3333 hands over the raw bytes decoded as latin-1
+            path = path.encode("latin-1")
+        path = quote(path, safe=PATH_SAFE)
+        if environ.get("QUERY_STRING"):
+            path += "?" + environ["QUERY_STRING"]
+
+    if base_url is not None:
+        return base_url.rstrip("/") + path
+
+    scheme = environ.get("wsgi.url_scheme", "http")
+    host = environ.get("HTTP_HOST")
+    if not host:
+        host = environ["SERVER_NAME"]
+        port = environ.get("SERVER_PORT")
+        if port and port != {"http": "80", "https": "443"}.get(scheme):
+            host += ":" + port
+    return "%s://%s%s" % (scheme, host, path)
+
+
+class ValidationMiddleware(object):
+    """
+    WSGI middleware which rejects any request without a valid
+    ``X-Twilio-Signature`` with a 403, before the application sees it.
+
+    The form body of a POST is read and parsed once, and the fields are
+    passed to the application as a dict in ``environ["twilio.params"]``.
+    ``wsgi.input`` is replaced with a copy of the body, so applications
+    which read it themselves still work.
+
+    Usage:
+
+    .. code-block:: python
+
+        from twilio.wsgi import ValidationMiddleware
+
+        application = ValidationMiddleware(application, AUTH_TOKEN)
+
+    :param app: The WSGI application to wrap
+    :param token: Your auth token, a list of auth tokens, or a
+        :class:`~twilio.util.RequestValidator`
+    :param str base_url: The scheme and host Twilio sends requests to, for
+        applications behind a proxy. See :func:`request_url`.
+    :param int max_body_size: The largest request body, in bytes, to accept
+    """
+
+    def __init__(self, app, token, base_url=None,
+                 max_body_size=MAX_BODY_SIZE):
+        self.app = app
+        if isinstance(token, RequestValidator):
+            self.validator = token
+        else:
+            self.validator = RequestValidator(token)
+        self.base_url = base_url
+        self.max_body_size = max_body_size
+
+    def __call__(self, environ, start_response):
+        params = {}
+        if is_form(environ.get("CONTENT_TYPE", "")):
+            try:
+                length = int(environ.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                length = 0
+            if length > self.max_body_size:
+                return self.reject(start_response, "413 Request Entity Too "
+                                   "Large")
+
+            body = environ["wsgi.input"].read(length) if length > 0 else b""
+            environ["wsgi.input"] = BytesIO(body)
+            params = parse_form(body)
+
+        url = request_url(environ, self.base_url)
+        signature = environ.get("HTTP_X_TWILIO_SIGNATURE")
+        if not self.validator.validate(url, params, signature):
+            return self.reject(start_response, "403 Forbidden")
+
+        environ[PARAMS_KEY] = params
+        return self.app(environ, start_response)
+
+    def reject(self, start_response, status):
+        body = status.encode("ascii")
+        start_response(status, [
+            ("Content-Type", "text/plain"),
+            ("Content-Length", str(len(body))),
+        ])
+        return [body]